@@ -20,6 +20,11 @@ from pathlib import Path
 import importlib.util
 import traceback
 import ast
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Tools run as separate processes, so they can run in the background alongside the others
+_SUBPROCESS_TOOLS = frozenset({"flake8", "bandit"})
 
 
 class IssueSeverity(Enum):
@@ -59,6 +64,7 @@ class AnalysisIssue:
     fixable: bool = False
     fix_type: str = ""  # Simple, complex, llm-assisted, etc.
     code_snippet: str = ""
+    match_data: Dict[str, str] = field(default_factory=dict)  # Values parsed from the message, e.g. var_name
 
 
 @dataclass
@@ -137,25 +143,41 @@ class PythonAnalyzer:
                 error="No analysis tools available"
             )
         
-        # Run each tool and collect issues
-        all_issues = []
+        # Start the subprocess-based tools in background threads, then run the in-process
+        # tools (pylint, mypy, ast) here while those wait on their processes
+        background = [t for t in tools_to_run if t in _SUBPROCESS_TOOLS] if len(tools_to_run) > 1 else []
+        tool_issues = {}
         
-        for tool in tools_to_run:
-            try:
-                self.logger.debug(f"Running {tool} on {file_path}")
-                tool_fn = self.tools[tool]
-                issues = tool_fn(file_path)
-                all_issues.extend(issues)
-                self.logger.debug(f"{tool} found {len(issues)} issues")
-            except Exception as e:
-                self.logger.error(f"Error running {tool}: {str(e)}")
-                self.logger.debug(traceback.format_exc())
+        with ThreadPoolExecutor(max_workers=max(len(background), 1)) as executor:
+            futures = {tool: executor.submit(self._run_tool, tool, file_path) for tool in background}
+            
+            for tool in tools_to_run:
+                if tool not in futures:
+                    tool_issues[tool] = self._run_tool(tool, file_path)
+            
+            for tool, future in futures.items():
+                tool_issues[tool] = future.result()
+        
+        # Collect issues in tool order, as if the tools had run one after another
+        all_issues = [issue for tool in tools_to_run for issue in tool_issues[tool]]
         
         return AnalysisResult(
             file_path=file_path,
             issues=all_issues
         )
     
+    def _run_tool(self, tool: str, file_path: str) -> List[AnalysisIssue]:
+        """Run one analysis tool on a file, logging and swallowing its errors."""
+        try:
+            self.logger.debug(f"Running {tool} on {file_path}")
+            issues = self.tools[tool](file_path)
+            self.logger.debug(f"{tool} found {len(issues)} issues")
+            return issues
+        except Exception as e:
+            self.logger.error(f"Error running {tool}: {str(e)}")
+            self.logger.debug(traceback.format_exc())
+            return []
+    
     def analyze_directory(self, directory_path: str, pattern: str = "*.py") -> Dict[str, AnalysisResult]:
         """Analyze all Python files in a directory."""
         results = {}
@@ -72,6 +72,9 @@ class Issue:
     # Code context
     code_snippet: Optional[str] = None
     
+    # Structured values parsed from the message by the linter adapter (e.g. var_name)
+    match_data: Dict[str, str] = field(default_factory=dict)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert the issue to a dictionary for serialization."""
         return {
@@ -88,7 +91,8 @@ class Issue:
             "rule_id": self.rule_id,
             "fixable": self.fixable,
             "fix_type": self.fix_type,
-            "code_snippet": self.code_snippet
+            "code_snippet": self.code_snippet,
+            "match_data": self.match_data
         }
     
     @classmethod
@@ -126,7 +130,8 @@ class Issue:
             rule_id=data.get('rule_id', ''),
             fixable=data.get('fixable', False),
             fix_type=data.get('fix_type', ''),
-            code_snippet=data.get('code_snippet')
+            code_snippet=data.get('code_snippet'),
+            match_data=data.get('match_data') or {}
         )
 
 
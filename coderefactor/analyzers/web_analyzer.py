@@ -7,6 +7,7 @@ Part of the CodeRefactor project.
 """
 
 import os
+import re
 import sys
 import json
 import subprocess
@@ -22,6 +23,10 @@ from dataclasses import dataclass, field
 # Import the shared issue model from python_analyzer
 from python_analyzer import AnalysisIssue, AnalysisResult, IssueSeverity, IssueCategory
 
+# ESLint rules whose message starts with the quoted identifier, e.g. "'foo' is not defined."
+_ESLINT_VAR_RULES = frozenset(['no-unused-vars', 'no-undef'])
+_ESLINT_VAR_NAME_RE = re.compile(r"^'([a-zA-Z0-9_$]+)'")
+
 
 class WebTechAnalyzer:
     """Analyzer for HTML, CSS, and JavaScript/TypeScript files using popular linters."""
@@ -317,6 +322,13 @@ class WebTechAnalyzer:
                                 elif "error" in rule_id:
                                     category = IssueCategory.ERROR
                             
+                            # Parse the identifier once so fixers don't have to
+                            match_data = {}
+                            if rule_id in _ESLINT_VAR_RULES:
+                                name_match = _ESLINT_VAR_NAME_RE.match(msg.get("message", ""))
+                                if name_match:
+                                    match_data["var_name"] = name_match.group(1)
+                            
                             issues.append(AnalysisIssue(
                                 id=str(uuid.uuid4()),
                                 file_path=file_path,
@@ -332,7 +344,8 @@ class WebTechAnalyzer:
                                 rule_id=rule_id,
                                 fixable=msg.get("fix") is not None,
                                 fix_type="automated" if msg.get("fix") else "manual",
-                                code_snippet=self._extract_code_snippet(file_path, msg.get("line", 1))
+                                code_snippet=self._extract_code_snippet(file_path, msg.get("line", 1)),
+                                match_data=match_data
                             ))
         except Exception as e:
             self.logger.error(f"Error running ESLint: {str(e)}")
@@ -582,7 +595,8 @@ class WebTechAnalyzer:
                     rule_id="css-color-format",
                     fixable=True,
                     fix_type="automated",
-                    code_snippet=self._extract_code_snippet(file_path, line)
+                    code_snippet=self._extract_code_snippet(file_path, line),
+                    match_data={"color": color}
                 ))
         
         # Check for invalid rgb/rgba values
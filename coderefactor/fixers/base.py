@@ -7,6 +7,7 @@ Provides common functionality and interfaces for language-specific fixers.
 """
 
 import os
+import sys
 import logging
 import difflib
 import tempfile
@@ -14,6 +15,7 @@ from enum import Enum, auto
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Union, Tuple
 from dataclasses import dataclass, field
+from itertools import accumulate
 import uuid
 
 # Try to import rich for better diff display
@@ -26,6 +28,10 @@ except ImportError:
     HAS_RICH = False
 
 
+# Slotted dataclasses need Python 3.10+; older versions fall back to instance dicts
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class FixType(Enum):
     """Types of fixes that can be applied."""
     SIMPLE = auto()     # Simple replacements, formatting, style fixes
@@ -34,7 +40,7 @@ class FixType(Enum):
     MANUAL = auto()     # Fixes that require manual intervention
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class FixChange:
     """Represents a single change to be applied to code."""
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
@@ -49,6 +55,39 @@ class FixChange:
     confidence: float = 1.0  # 0.0 to 1.0, how confident we are in this fix
 
 
+def _change_span(change: 'FixChange', lines: List[str], line_starts: List[int]) -> Optional[Tuple[int, int]]:
+    """
+    Locate the text a change replaces.
+    
+    Columns are 1-based and end_column is exclusive. Multi-line changes, and single-line changes
+    whose columns fall outside the line, replace their lines completely.
+    
+    Args:
+        change: The change to locate.
+        lines: The lines of the code, with line endings.
+        line_starts: The offset at which each line starts.
+    
+    Returns:
+        The (start, end) offsets of the replaced text, or None if the lines don't exist.
+    """
+    start_line_idx = change.start_line - 1  # 0-based index
+    end_line_idx = change.end_line - 1
+    
+    # Check if line indices are valid
+    if start_line_idx < 0 or end_line_idx < start_line_idx or end_line_idx >= len(lines):
+        return None
+    
+    # For single line changes, consider column positions
+    if start_line_idx == end_line_idx:
+        line = lines[start_line_idx]
+        if 0 < change.start_column <= change.end_column <= len(line) + 1:
+            # Replace only the specified part of the line
+            line_start = line_starts[start_line_idx]
+            return line_start + change.start_column - 1, line_start + change.end_column - 1
+    
+    return line_starts[start_line_idx], line_starts[end_line_idx] + len(lines[end_line_idx])
+
+
 @dataclass
 class FixResult:
     """Result of applying fixes to a code file."""
@@ -157,9 +196,6 @@ class BaseFixer:
         Returns:
             The modified code with all changes applied.
         """
-        # Make a copy of the code
-        modified_code = code
-        
         # Sort changes from last to first to avoid offset issues
         sorted_changes = sorted(
             changes,
@@ -167,39 +203,37 @@ class BaseFixer:
             reverse=True
         )
         
+        # Splice from the end towards the start: text[:cursor] is still unedited, and the
+        # replacements and untouched gaps after it are collected in reverse, then joined once
+        text = code
+        lines = text.splitlines(True)  # Keep line endings
+        line_starts = list(accumulate(map(len, lines), initial=0))
+        pieces: List[str] = []
+        cursor = len(text)
+        
         for change in sorted_changes:
-            # Get the line-based view of the code
-            lines = modified_code.splitlines(True)  # Keep line endings
+            span = _change_span(change, lines, line_starts)
             
-            # Extract the text to replace
-            start_line_idx = change.start_line - 1  # 0-based index
-            end_line_idx = change.end_line - 1
+            if pieces and (span is None or span[1] > cursor):
+                # The change reaches into text that was already edited, so locate it in the edited code
+                text = text[:cursor] + ''.join(reversed(pieces))
+                lines = text.splitlines(True)
+                line_starts = list(accumulate(map(len, lines), initial=0))
+                pieces = []
+                cursor = len(text)
+                span = _change_span(change, lines, line_starts)
             
-            # Check if line indices are valid
-            if start_line_idx < 0 or start_line_idx >= len(lines) or end_line_idx >= len(lines):
+            if span is None:
                 self.logger.warning(f"Invalid line indices in change: {change.id}")
                 continue
             
-            # Get the start and end positions within the text
-            prefix = ''.join(lines[:start_line_idx])
-            suffix = ''.join(lines[end_line_idx + 1:])
-            
-            # Extract the text to replace
-            text_to_replace = ''.join(lines[start_line_idx:end_line_idx + 1])
-            
-            # For single line changes, consider column positions
-            if start_line_idx == end_line_idx:
-                line = lines[start_line_idx]
-                if change.start_column <= len(line) and change.end_column <= len(line):
-                    # Replace only the specified part of the line
-                    text_to_replace = line[change.start_column - 1:change.end_column]
-                    prefix = prefix + line[:change.start_column - 1]
-                    suffix = line[change.end_column:] + suffix
-            
             # Apply the replacement
-            modified_code = prefix + change.replacement_text + suffix
+            start, end = span
+            pieces.append(text[end:cursor])
+            pieces.append(change.replacement_text)
+            cursor = start
         
-        return modified_code
+        return text[:cursor] + ''.join(reversed(pieces))
     
     def generate_diff(self, original: str, modified: str, context_lines: int = 3) -> str:
         """
@@ -8,14 +8,22 @@ Implements automatic fixes for HTML, CSS, JavaScript, and TypeScript code issues
 
 import os
 import re
+import sys
 import json
 import logging
 import asyncio
+import hashlib
 import tempfile
 import subprocess
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union, Tuple, Set
+from typing import List, Dict, Any, Optional, Union, Tuple, Set, FrozenSet, Pattern, Sequence
 import difflib
+import bisect
+from array import array
+from itertools import accumulate, count
 
 # Import the base fixer
 from fixers.base import BaseFixer, FixResult, FixChange, FixType
@@ -27,6 +35,438 @@ try:
 except ImportError:
     HAS_LLM = False
 
+# Use RE2 for whole-document scans if available (linear time, no backtracking)
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+_doc_re = re2 if HAS_RE2 else re
+
+# Python 3.11+ supports possessive quantifiers, which keep the quoted-value patterns from backtracking
+_POS = '+' if sys.version_info >= (3, 11) else ''
+
+# Precompiled patterns shared by the fixers
+_UPPER_ATTR_RE = re.compile(r'(\s+)([A-Z][a-zA-Z0-9]*)(\s*=\s*[\'"][^\'"]*[\'"]|\s*=\s*[^\s>]+|\s+)')
+_TAG_TOKEN_RE = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)[^>]*?(/?)>')
+_EMPTY_RULE_RE = re.compile(r'([^{]*\{)\s*\}')
+_HEX_COLOR_RE = re.compile(r'#([0-9a-fA-F]{3,6})\b')
+_LONG_HEX_COLOR_RE = re.compile(r'#[0-9a-f]{6}\b')
+_UPPER_HEX_COLOR_RE = re.compile(r'#(?=[0-9a-f]*[A-F])([0-9a-fA-F]{3,6})\b')
+_DOUBLE_QUOTED_ATTR_RE = re.compile(fr'=\s*{_POS}"[^"]*{_POS}"')
+_SINGLE_QUOTED_ATTR_RE = re.compile(fr"=\s*{_POS}'[^']*{_POS}'")
+_SINGLE_QUOTED_ATTR_VALUE_RE = re.compile(fr"(\w+{_POS}\s*{_POS}=\s*{_POS})('[^']*{_POS}')(\s)")
+_DOUBLE_QUOTED_ATTR_VALUE_RE = re.compile(fr'(\w+{_POS}\s*{_POS}=\s*{_POS})("[^"]*{_POS}")(\s)')
+_DOUBLE_QUOTED_STRING_RE = re.compile(fr'"([^"]*{_POS})"')
+_SINGLE_QUOTED_STRING_RE = re.compile(fr"'([^']*{_POS})'")
+_KEYWORD_PAREN_RE = re.compile(r'\b(if|for|while|switch|catch)(\()')
+_JS_OPERATOR_RE = re.compile(r'([a-zA-Z0-9_])([\+\-\*\/\%\=\<\>\!\&\|])([a-zA-Z0-9_])')
+_VALUELESS_ATTR_RE = re.compile(r'(<[a-zA-Z][a-zA-Z0-9]*\s+[^>]*?)(\b[a-zA-Z][a-zA-Z0-9]*\b)(\s|>)')
+_NAME_ATTR_RE = re.compile(fr'name=[\'"]([^\'"]*{_POS})[\'"]')
+_TRAILING_WS_RE = re.compile(r'[^\S\r\n]+(?=\r\n|\r|\n|\Z)')
+_IMG_TAG_RE = re.compile(r'<img\s+([^>]*?)(/?)>')
+_ACCESSIBILITY_TAG_RE = re.compile(
+    r'(?P<img><img[^\S\r\n]+(?P<img_attrs>[^>\r\n]*?)/?>)'
+    r'|(?P<input><input[^\S\r\n]+(?P<input_attrs>[^>\r\n]*?)/?>)'
+)
+_ALT_ATTR_RE = re.compile(r'(?:^|\s)alt\s*=', re.IGNORECASE)
+_ID_ATTR_RE = re.compile(r'(?:^|\s)id\s*=', re.IGNORECASE)
+_TEXT_INPUT_TYPE_RE = re.compile(r'type=[\'"](?:text|password|email|number|tel|url)[\'"]')
+_LEADING_TAG_RE = re.compile(r'<(/)?([a-zA-Z][a-zA-Z0-9]*)?')
+_EMPTY_BLOCK_RE = re.compile(r'([^{]*\{\s*\})')
+_CSS_PROPERTY_NAME_RE = re.compile(r'([a-zA-Z-]+)\s*:')
+# Whole-document patterns; [^\S\r\n] is whitespace that stays on the same line
+_CSS_UNTERMINATED_RULE_RE = re.compile(r'([a-zA-Z-]+[^\S\r\n]*:[^\S\r\n]*[^;{}\r\n]+)([^\S\r\n]*})')
+_CSS_UPPER_PROPERTY_RE = re.compile(r'([a-zA-Z-]*[A-Z][a-zA-Z-]*)[^\S\r\n]*:')
+_MEDIA_TYPE_RE = re.compile(r'(@media[^\S\r\n]+)([a-zA-Z-]+)([^\S\r\n]*{)')
+_CSS_FORMAT_RE = re.compile(r'(?P<run>\s*[{}][\s{};]*|;[\s{};]*)|\n{3,}')
+_JS_FUNCTION_RE = re.compile(r'function\s+')
+_DIGITS_RE = re.compile(r'\d+')
+_JS_DECLARATION_OR_USE_RE = re.compile(
+    r'\b(?:(?:var|let|const|function|class)[^\S\r\n]+(?P<decl>[a-zA-Z_$][a-zA-Z0-9_$]*)'
+    r'|(?P<use>[a-zA-Z_$][a-zA-Z0-9_$]*)\b(?![^\S\r\n]*[:,\.]|[\(:]))'
+)
+_JS_COMMENT_LINE_RE = re.compile(r'^[^\S\r\n]*(?://|/\*)', re.MULTILINE)
+_JS_MEMBER_ACCESS_RE = re.compile(r'(\b[a-zA-Z_$][a-zA-Z0-9_$]*)(\.)[a-zA-Z_$][a-zA-Z0-9_$]*\b')
+_JS_NULL_CHECK_RE = re.compile(
+    r'if[^\S\r\n]*\([^\S\r\n]*([a-zA-Z_$][a-zA-Z0-9_$]*)[^\S\r\n]*[!=]='
+    r'|(?<![a-zA-Z0-9_$])([a-zA-Z_$][a-zA-Z0-9_$]*)[^\S\r\n]*(?:\?\.|&&)'
+)
+
+# Content sniffing patterns used when the file extension doesn't give the language away
+_HTML_CONTENT_RE = re.compile(r'<\s*html|<\s*body|<\s*div|<\s*p|<\s*span|<\s*h[1-6]|<!DOCTYPE\s+html', re.IGNORECASE)
+_CSS_CONTENT_RE = re.compile(r'(\{[^}]*:[^}]*;[^}]*\})|(@media|@keyframes|@import|@charset|@font-face)')
+_TS_CONTENT_RE = re.compile(r'(:\s*[A-Za-z]+\s*[,=\)])|(<[A-Za-z]+>)|interface\s+[A-Za-z]+|type\s+[A-Za-z]+\s*=')
+_JS_CONTENT_RE = re.compile(r'(function|const|let|var|import|export|class|=>|async|await)\s')
+
+# Line endings and openings (declarations, flow control, comments) that never take a semicolon
+_NO_SEMICOLON_SUFFIXES = (';', '{', '}', ':')
+_NO_SEMICOLON_PREFIXES = ('function ', 'class ', 'if ', 'else ', 'for ', 'while ', 'switch ', 'case ',
+                          '//', '/*')
+
+# Properties that often need vendor prefixes, with their patterns
+_VENDOR_PREFIXES = {
+    'transform': ['-webkit-transform', '-moz-transform', '-ms-transform'],
+    'transition': ['-webkit-transition', '-moz-transition', '-ms-transition'],
+    'animation': ['-webkit-animation', '-moz-animation'],
+    'box-shadow': ['-webkit-box-shadow', '-moz-box-shadow'],
+    'border-radius': ['-webkit-border-radius', '-moz-border-radius'],
+    'user-select': ['-webkit-user-select', '-moz-user-select', '-ms-user-select']
+}
+_VENDOR_PROPERTY_RES = {prop: re.compile(fr'(?<![\w-]){prop}\s*:') for prop in _VENDOR_PREFIXES}
+_VENDOR_VALUE_RES = {prop: re.compile(fr'{prop}\s*:\s*([^;]+);?') for prop in _VENDOR_PREFIXES}
+_VENDOR_PREFIXED_PROPERTY_RE = re.compile(r'(?<![\w-])(-(?:webkit|moz|ms)-[a-z-]+)\s*:')
+
+# Text each style fix needs before it can produce a change, per language (RE2-compatible patterns)
+_JS_STYLE_TRIGGERS = (
+    ('quotes', r'[\'"]'),
+    ('spacing', r'\b(?:if|for|while|switch|catch)\(|[a-zA-Z0-9_][-+*/%=<>!&|][a-zA-Z0-9_]'),
+)
+_STYLE_TRIGGERS = {
+    'html': (('attribute_quotes', r'=\s*[\'"]'),),
+    'css': (
+        ('vendor_prefixes', '|'.join(re.escape(prop) for prop in _VENDOR_PREFIXES)),
+        ('color_formats', r'#[0-9a-fA-F]{3}'),
+    ),
+    'javascript': _JS_STYLE_TRIGGERS,
+    'typescript': _JS_STYLE_TRIGGERS,
+}
+_STYLE_TRIGGER_RES = {
+    language: [(name, re.compile(pattern)) for name, pattern in triggers]
+    for language, triggers in _STYLE_TRIGGERS.items()
+}
+
+# Patterns for pulling values out of linter messages that carry no match_data
+_MSG_TAG_RE = re.compile(r'tag\s+<([a-zA-Z0-9]+)>')
+_MSG_ANY_TAG_RE = re.compile(r'<([a-zA-Z0-9]+)>')
+_MSG_HEX_COLOR_RE = re.compile(r'#([A-Fa-f0-9]+)')
+_MSG_CSS_UNIT_RE = re.compile(r'(\d+)([a-zA-Z%]+)')
+_MSG_QUOTED_NAME_RE = re.compile(r'[\'"]([a-zA-Z0-9_$]+)[\'"]')
+_MSG_DEFINED_NAME_RE = re.compile(r'([a-zA-Z0-9_$]+)\s+is defined')
+_MSG_UNDEFINED_NAME_RE = re.compile(r'([a-zA-Z0-9_$]+)\s+is not defined')
+_ATTR_KV_RE = re.compile(
+    fr'([a-zA-Z][a-zA-Z0-9_:-]*{_POS})\s*{_POS}=\s*{_POS}(?:"([^"]*{_POS})"|\'([^\']*{_POS})\'|([^\s>]+{_POS}))'
+)
+
+# Whole-document patterns; these must stay within the RE2 syntax (no backreferences or lookaround)
+_DOCTYPE_RE = _doc_re.compile(r'(?i)<!DOCTYPE\s+html>')
+_HTML_OPEN_RE = _doc_re.compile(r'(?i)<html')
+_HEAD_OPEN_RE = _doc_re.compile(r'(?i)<head')
+_BODY_OPEN_RE = _doc_re.compile(r'(?i)<body')
+_EMPTY_VOID_PAIR_RE = _doc_re.compile(
+    r'(?i)<(area|base|br|col|embed|hr|img|input|link|meta|param|source|track|wbr)[^>\r\n]*>'
+    r'[^\S\r\n]*</(area|base|br|col|embed|hr|img|input|link|meta|param|source|track|wbr)>',
+)
+_BLOCK_IN_P_RE = _doc_re.compile(
+    r'<p\b[^>\r\n]*>[^<\r\n]*<(div|h1|h2|h3|h4|h5|h6|section|article|aside|nav|header|footer)\b'
+)
+
+# HTML elements that never take a closing tag
+_VOID_ELEMENTS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param',
+    'source', 'track', 'wbr'
+])
+
+# HTML5 attributes that are valid without a value
+_BOOLEAN_ATTRIBUTES = frozenset([
+    'checked', 'selected', 'disabled', 'readonly', 'required', 'multiple', 'hidden', 'autofocus',
+    'novalidate', 'formnovalidate'
+])
+
+# JavaScript globals that are always defined
+_JS_GLOBALS = frozenset([
+    'window', 'document', 'console', 'setTimeout', 'setInterval', 'clearTimeout', 'clearInterval',
+    'alert', 'confirm', 'prompt', 'location', 'navigator', 'history', 'Math', 'JSON', 'Date',
+    'Array', 'Object', 'String', 'Number', 'Boolean', 'RegExp', 'Error', 'Map', 'Set', 'Promise',
+    'Symbol', 'this', 'undefined', 'null', 'NaN', 'Infinity', 'isNaN', 'isFinite', 'eval',
+    'encodeURI', 'decodeURI', 'encodeURIComponent', 'decodeURIComponent'
+])
+
+# JavaScript keywords and operators that look like identifiers
+_JS_KEYWORDS = frozenset([
+    'if', 'else', 'for', 'while', 'switch', 'case', 'break', 'continue', 'return',
+    'function', 'var', 'let', 'const', 'class', 'new', 'this', 'typeof', 'instanceof',
+    'in', 'of', 'true', 'false', 'null', 'undefined', 'try', 'catch', 'finally'
+])
+
+# Globals that are never null, so member access on them needs no null check
+_NON_NULL_GLOBALS = frozenset(['window', 'document', 'console', 'Math', 'JSON', 'Object', 'Array', 'String'])
+_NO_NAMES = frozenset()
+
+# Translation table turning '-' and '_' word separators in names into spaces
+_WORD_SEPARATORS = str.maketrans('-_', '  ')
+
+# Replacement strings that are built over and over again
+_COMMON_TAGS = (
+    'html', 'head', 'body', 'div', 'span', 'p', 'a', 'ul', 'ol', 'li', 'table', 'tr', 'td', 'th',
+    'form', 'label', 'button', 'select', 'option', 'textarea', 'section', 'article', 'nav',
+    'header', 'footer', 'main', 'aside', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'strong', 'em',
+    'script', 'style', 'title'
+)
+_CLOSE_TAG = {tag: f"</{tag}>" for tag in _COMMON_TAGS}
+_HTML5_DOCTYPE = "<!DOCTYPE html>\n"
+
+
+def _close_tag(tag_name: str) -> str:
+    """Get the closing tag for an element, reusing the cached string for common tags."""
+    return _CLOSE_TAG.get(tag_name) or f"</{tag_name}>"
+
+
+def _message_value(message: str, *patterns: Pattern) -> Optional[str]:
+    """Get the first group of the first pattern that matches a linter message."""
+    for pattern in patterns:
+        match = pattern.search(message)
+        if match:
+            return match.group(1)
+    return None
+
+
+# Per-file line data is cached so the many fixers run over one file split and index it only once
+
+@lru_cache(maxsize=8)
+def _split_lines(code: str) -> Tuple[str, ...]:
+    """Get the lines of the code without line endings, as str.splitlines returns them."""
+    return tuple(code.splitlines())
+
+
+@lru_cache(maxsize=8)
+def _line_starts(code: str) -> Sequence[int]:
+    """
+    Get the offset at which each line starts, using the same line breaks as str.splitlines.
+    
+    The offsets are kept in a machine-integer array rather than a tuple of int objects,
+    which makes the cached tables several times smaller for large files.
+    
+    Args:
+        code: The code to index.
+    
+    Returns:
+        Array of start offsets, one per line.
+    """
+    lines = code.splitlines(True)
+    if not lines:
+        return array('q')
+    return array('q', accumulate(map(len, lines[:-1]), initial=0))
+
+
+def _insertion(description: str, line: int, column: int, text: str) -> FixChange:
+    """Create a simple change that inserts text at a 1-based line and column."""
+    return FixChange(
+        description=description,
+        start_line=line,
+        start_column=column,
+        end_line=line,
+        end_column=column,
+        original_text="",
+        replacement_text=text,
+        fix_type=FixType.SIMPLE
+    )
+
+
+def _leading_ws(line: str) -> str:
+    """Get the leading whitespace of a line."""
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _line_count(code: str) -> int:
+    """Get the number of lines in the code without splitting it."""
+    return code.count('\n') + (1 if code and not code.endswith('\n') else 0)
+
+
+def _line_index(line_starts: Sequence[int], offset: int) -> int:
+    """Get the 0-based index of the line containing a document offset."""
+    return bisect.bisect_right(line_starts, offset) - 1
+
+
+def _line_end(code: str, line_starts: Sequence[int], index: int) -> int:
+    """Get the offset just past the content of a 0-based line, before its line break."""
+    start = line_starts[index]
+    stop = line_starts[index + 1] if index + 1 < len(line_starts) else len(code)
+    return start + len(code[start:stop].splitlines()[0])
+
+
+@lru_cache(maxsize=8)
+def _js_comment_lines(code: str) -> FrozenSet[int]:
+    """Get the 0-based indexes of the lines that start with a JS/TS comment."""
+    line_starts = _line_starts(code)
+    return frozenset(_line_index(line_starts, m.start()) for m in _JS_COMMENT_LINE_RE.finditer(code))
+
+
+def _last_offsets(code: str, char: str, count: int) -> List[int]:
+    """Get the offsets of the last `count` occurrences of a character, last one first."""
+    offsets = []
+    pos = len(code)
+    while len(offsets) < count:
+        pos = code.rfind(char, 0, pos)
+        if pos < 0:
+            break
+        offsets.append(pos)
+    return offsets
+
+
+@lru_cache(maxsize=8)
+def _scan_tag_stack(code: str) -> Dict[int, List[Tuple[int, str]]]:
+    """
+    Tokenize HTML once and record which tags are still open at the start of each line.
+    
+    Args:
+        code: The HTML code.
+    
+    Returns:
+        Mapping of 1-based line number to the stack of (line, tag) pairs open before that line.
+    """
+    stacks: Dict[int, List[Tuple[int, str]]] = {}
+    stack: List[Tuple[int, str]] = []
+    tokens = _TAG_TOKEN_RE.finditer(code)
+    token = next(tokens, None)
+    
+    # Each line ends where the next one starts, or at the end of the code
+    line_starts = _line_starts(code)
+    line_ends = line_starts[1:]
+    if line_starts:
+        line_ends.append(len(code))
+    
+    for line_no, offset in enumerate(line_ends, 1):
+        stacks[line_no] = list(stack)
+        
+        while token is not None and token.start() < offset:
+            closing, tag, self_closing = token.groups()
+            tag = tag.lower()
+            
+            if closing:
+                # Close the innermost matching opener; unmatched inner tags stay open
+                for k in range(len(stack) - 1, -1, -1):
+                    if stack[k][1] == tag:
+                        del stack[k]
+                        break
+            elif not self_closing and tag not in _VOID_ELEMENTS:
+                stack.append((line_no, tag))
+            
+            token = next(tokens, None)
+    
+    return stacks
+
+
+@lru_cache(maxsize=None)
+def _style_trigger_set(language: str) -> Optional[Any]:
+    """Compile a language's style triggers into one RE2 set, or None when RE2 is unavailable."""
+    if not HAS_RE2:
+        return None
+    
+    try:
+        trigger_set = re2.Set.SearchSet()
+        for _, pattern in _STYLE_TRIGGERS.get(language, ()):
+            trigger_set.Add(pattern)
+        trigger_set.Compile()
+        return trigger_set
+    except Exception:
+        return None
+
+
+def _present_style_triggers(code: str, language: str) -> Set[str]:
+    """
+    Get the style fixes whose trigger text occurs in the code.
+    
+    With RE2 installed all triggers are matched in a single scan; otherwise each
+    pattern is searched separately and stops at its first hit.
+    
+    Args:
+        code: The code to scan.
+        language: The code language.
+    
+    Returns:
+        Set of trigger names present in the code.
+    """
+    triggers = _STYLE_TRIGGER_RES.get(language, [])
+    trigger_set = _style_trigger_set(language)
+    
+    if trigger_set is not None:
+        return {triggers[index][0] for index in trigger_set.Match(code)}
+    
+    return {name for name, pattern in triggers if pattern.search(code)}
+
+
+@lru_cache(maxsize=64)
+def _attr_assignment_re(attr: str) -> Pattern:
+    """Get the compiled pattern for an attribute that is already assigned a value."""
+    return re.compile(fr'{re.escape(attr)}\s*=\s*[\'"a-zA-Z0-9_]')
+
+
+# Text placed before the first and after the last brace/semicolon of a CSS token run
+_CSS_RUN_OPEN = {'{': ' {', '}': '\n}', ';': ';'}
+_CSS_RUN_CLOSE = {'{': '\n  ', '}': '\n\n', ';': '\n  '}
+
+
+def _css_join(prev: str, token: str) -> str:
+    """Get the separator placed between two adjacent CSS structural tokens."""
+    if prev == '}':
+        return '\n\n'
+    if token == '}':
+        return '\n'
+    if prev == token == '{':
+        return '\n   '
+    return '\n  '
+
+
+def _css_format_run(match) -> str:
+    """Format a run of braces/semicolons and surrounding whitespace, or collapse excess newlines."""
+    if match.lastgroup != 'run':
+        return '\n\n'
+    
+    tokens = [char for char in match.group() if char in '{};']
+    return (
+        _CSS_RUN_OPEN[tokens[0]]
+        + ''.join(_css_join(prev, token) + token for prev, token in zip(tokens, tokens[1:]))
+        + _CSS_RUN_CLOSE[tokens[-1]]
+    )
+
+
+@lru_cache(maxsize=256)
+def _px(value: str) -> str:
+    """Get a pixel length string for a numeric value."""
+    return f"{value}px"
+
+
+# Per-process state for parallel issue fixing, set once by the pool initializer
+_worker_fixer = None
+_worker_code = ""
+_worker_language = ""
+_worker_loop = None
+
+
+def _init_issue_worker(fixer: "WebFixer", code: str, language: str) -> None:
+    """Store the fixer and the code in the worker process so they are only sent once."""
+    global _worker_fixer, _worker_code, _worker_language, _worker_loop
+    _worker_fixer = fixer
+    _worker_code = code
+    _worker_language = language
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _fix_issue_batch(issues: List[Dict[str, Any]]) -> List[List[FixChange]]:
+    """Compute rule-based fixes for a batch of issues inside a worker process."""
+    return [
+        _worker_loop.run_until_complete(
+            _worker_fixer._get_rule_based_suggestions(_worker_code, issue, _worker_language)
+        )
+        for issue in issues
+    ]
+
+
+def _init_file_worker(fixer: "WebFixer") -> None:
+    """Store the fixer in the worker process for fixing whole files."""
+    global _worker_fixer, _worker_loop
+    # Files are already spread over processes, so don't start a nested pool per file
+    fixer.max_workers = 1
+    _worker_fixer = fixer
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _fix_file_in_worker(file_path: str, issues: Optional[List[Dict[str, Any]]]) -> FixResult:
+    """Fix a single file inside a worker process."""
+    return _worker_loop.run_until_complete(_worker_fixer.fix_file(file_path, issues))
+
 
 class WebFixer(BaseFixer):
     """
@@ -49,11 +489,15 @@ class WebFixer(BaseFixer):
                 - fix_bugs: Whether to fix bug issues (default: True)
                 - use_llm: Whether to use LLM for complex fixes (default: True if available)
                 - llm_config: Configuration for LLM integration
+                - llm_cache_size: Number of LLM suggestions kept for identical requests (default: 512)
+                - max_workers: Number of processes used to fix independent issues in
+                  parallel (default: 1, i.e. fix issues sequentially)
         """
         super().__init__(config)
         
         # Extract config options
         self.autoformat = self.config.get('autoformat', True)
+        self.max_workers = self.config.get('max_workers', 1)
         self.html_formatter = self.config.get('html_formatter', 'prettier')
         self.css_formatter = self.config.get('css_formatter', 'prettier')
         self.js_formatter = self.config.get('js_formatter', 'prettier')
@@ -70,6 +514,8 @@ class WebFixer(BaseFixer):
         
         # Initialize LLM if configured
         self.llm = None
+        self._llm_cache: "OrderedDict[Tuple[str, bytes, bytes], RefactorSuggestion]" = OrderedDict()
+        self.llm_cache_size = self.config.get('llm_cache_size', 512)
         if self.use_llm and HAS_LLM:
             llm_config = self.config.get('llm_config', {})
             try:
@@ -89,6 +535,13 @@ class WebFixer(BaseFixer):
             except Exception as e:
                 self.logger.error(f"Failed to initialize LLM integration: {str(e)}")
     
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the LLM client and its response cache when the fixer is sent to worker processes."""
+        state = self.__dict__.copy()
+        state['llm'] = None
+        state['_llm_cache'] = OrderedDict()
+        return state
+    
     def _check_prettier(self) -> bool:
         """Check if prettier is installed."""
         try:
@@ -253,6 +706,40 @@ class WebFixer(BaseFixer):
         
         return result
     
+    async def fix_files(self, file_paths: List[str],
+                        issues: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> List[FixResult]:
+        """
+        Fix several files, spreading them over worker processes when max_workers > 1.
+        
+        Files are fixed independently of each other. The LLM client can't be sent to
+        worker processes, so files are fixed sequentially while LLM integration is active.
+        
+        Args:
+            file_paths: Paths of the files to fix.
+            issues: Optional mapping of file path to the issues to fix in that file.
+                    Files without an entry have all fixable issues addressed.
+        
+        Returns:
+            List of FixResult objects, in the order of file_paths.
+        """
+        issues = issues or {}
+        
+        if self.max_workers > 1 and len(file_paths) > 1 and not self.llm:
+            workers = min(self.max_workers, len(file_paths))
+            
+            try:
+                loop = asyncio.get_running_loop()
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_file_worker,
+                                         initargs=(self,)) as executor:
+                    return list(await asyncio.gather(*[
+                        loop.run_in_executor(executor, _fix_file_in_worker, path, issues.get(path))
+                        for path in file_paths
+                    ]))
+            except Exception as e:
+                self.logger.warning(f"Parallel file fixing failed, falling back to sequential: {str(e)}")
+        
+        return [await self.fix_file(path, issues.get(path)) for path in file_paths]
+    
     async def get_fix_suggestions(self, code: str, issue: Dict[str, Any], 
                                 file_path: Optional[str] = None) -> List[FixChange]:
         """
@@ -278,30 +765,45 @@ class WebFixer(BaseFixer):
         if not language:
             return suggestions
         
+        suggestions.extend(await self._get_rule_based_suggestions(code, issue, language))
+        
+        # If no specific fixer found, try LLM
+        if not suggestions and self.llm:
+            changes = await self._get_llm_suggestions(code, issue, language, file_path)
+            suggestions.extend(changes)
+        
+        return suggestions
+    
+    async def _get_rule_based_suggestions(self, code: str, issue: Dict[str, Any],
+                                          language: str) -> List[FixChange]:
+        """
+        Get suggestions for fixing a specific issue without LLM assistance.
+        
+        Args:
+            code: The code containing the issue.
+            issue: The issue to fix.
+            language: The code language.
+        
+        Returns:
+            List of FixChange objects with suggestions.
+        """
         rule_id = issue.get('rule_id', '')
         message = issue.get('message', '')
         line = issue.get('line', 0)
         column = issue.get('column', 0)
+        match_data = issue.get('match_data') or {}
         
         # Apply language-specific fixers based on rule_id or message
         if language == "html":
-            changes = await self._fix_html_issue(code, line, column, rule_id, message)
-            suggestions.extend(changes)
-            
+            return await self._fix_html_issue(code, line, column, rule_id, message, match_data)
+        
         elif language == "css":
-            changes = await self._fix_css_issue(code, line, column, rule_id, message)
-            suggestions.extend(changes)
-            
-        elif language in ["javascript", "typescript"]:
-            changes = await self._fix_js_issue(code, line, column, rule_id, message, language)
-            suggestions.extend(changes)
+            return await self._fix_css_issue(code, line, column, rule_id, message, match_data)
         
-        # If no specific fixer found, try LLM
-        if not suggestions and self.llm:
-            changes = await self._get_llm_suggestions(code, issue, language, file_path)
-            suggestions.extend(changes)
+        elif language in ["javascript", "typescript"]:
+            return await self._fix_js_issue(code, line, column, rule_id, message, language, match_data)
         
-        return suggestions
+        return []
     
     def _determine_language(self, code: str, file_path: Optional[str] = None) -> Optional[str]:
         """
@@ -329,19 +831,19 @@ class WebFixer(BaseFixer):
         
         # Try to determine the language based on content
         # Check for HTML tags
-        if re.search(r'<\s*html|<\s*body|<\s*div|<\s*p|<\s*span|<\s*h[1-6]|<!DOCTYPE\s+html', code, re.IGNORECASE):
+        if _HTML_CONTENT_RE.search(code):
             return "html"
         
         # Check for CSS features
-        if re.search(r'(\{[^}]*:[^}]*;[^}]*\})|(@media|@keyframes|@import|@charset|@font-face)', code):
+        if _CSS_CONTENT_RE.search(code):
             return "css"
         
         # Check for TypeScript features
-        if re.search(r'(:\s*[A-Za-z]+\s*[,=\)])|(<[A-Za-z]+>)|interface\s+[A-Za-z]+|type\s+[A-Za-z]+\s*=', code):
+        if _TS_CONTENT_RE.search(code):
             return "typescript"
         
         # Default to JavaScript for all other code
-        if re.search(r'(function|const|let|var|import|export|class|=>|async|await)\s', code):
+        if _JS_CONTENT_RE.search(code):
             return "javascript"
         
         # Could not determine the language
@@ -376,16 +878,92 @@ class WebFixer(BaseFixer):
                     fixable_issues.append(issue)
         
         # Process fixable issues first
-        for issue in fixable_issues:
-            # Get suggestions for fixing this issue
-            suggestions = await self.get_fix_suggestions(code, issue, file_path)
-            changes.extend(suggestions)
+        if self.max_workers > 1 and len(fixable_issues) > 1:
+            changes.extend(await self._fix_issues_in_parallel(code, fixable_issues, language, file_path))
+        else:
+            changes.extend(await self._gather_fix_suggestions(code, fixable_issues, file_path))
         
         # Then process LLM-assisted issues if LLM is available
         if self.llm and llm_issues:
-            for issue in llm_issues:
-                suggestions = await self.get_fix_suggestions(code, issue, file_path)
-                changes.extend(suggestions)
+            changes.extend(await self._gather_fix_suggestions(code, llm_issues, file_path))
+        
+        return changes
+    
+    async def _gather_fix_suggestions(self, code: str, issues: List[Dict[str, Any]],
+                                      file_path: Optional[str] = None) -> List[FixChange]:
+        """
+        Get suggestions for several issues, overlapping their LLM requests when the LLM is active.
+        
+        Args:
+            code: The code containing the issues.
+            issues: List of issues to fix.
+            file_path: Optional path to the file.
+        
+        Returns:
+            List of FixChange objects with suggestions, in issue order.
+        """
+        changes = []
+        
+        if not self.llm:
+            for issue in issues:
+                changes.extend(await self.get_fix_suggestions(code, issue, file_path))
+            return changes
+        
+        results = await asyncio.gather(*[self.get_fix_suggestions(code, issue, file_path) for issue in issues])
+        for suggestions in results:
+            changes.extend(suggestions)
+        
+        return changes
+    
+    async def _fix_issues_in_parallel(self, code: str, issues: List[Dict[str, Any]],
+                                      language: str, file_path: Optional[str] = None) -> List[FixChange]:
+        """
+        Fix independent issues across a pool of worker processes.
+        
+        The code is sent to each worker once through the pool initializer, and issues are
+        dispatched in batches. Issues without a rule-based fix fall back to the LLM here.
+        
+        Args:
+            code: The code to fix.
+            issues: List of fixable issues.
+            language: The code language.
+            file_path: Optional path to the file.
+        
+        Returns:
+            List of FixChange objects with changes to apply, in issue order.
+        """
+        workers = min(self.max_workers, len(issues))
+        batch_size = -(-len(issues) // workers)
+        batches = [issues[i:i + batch_size] for i in range(0, len(issues), batch_size)]
+        
+        try:
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_issue_worker,
+                                     initargs=(self, code, language)) as executor:
+                batch_results = await asyncio.gather(*[
+                    loop.run_in_executor(executor, _fix_issue_batch, batch) for batch in batches
+                ])
+        except Exception as e:
+            self.logger.warning(f"Parallel issue fixing failed, falling back to sequential: {str(e)}")
+            changes = []
+            for issue in issues:
+                changes.extend(await self.get_fix_suggestions(code, issue, file_path))
+            return changes
+        
+        results = [suggestions for batch_suggestions in batch_results for suggestions in batch_suggestions]
+        
+        # Request LLM fixes for the issues without a rule-based fix concurrently
+        if self.llm:
+            unresolved = [i for i, suggestions in enumerate(results) if not suggestions]
+            llm_results = await asyncio.gather(*[
+                self._get_llm_suggestions(code, issues[i], language, file_path) for i in unresolved
+            ])
+            for i, suggestions in zip(unresolved, llm_results):
+                results[i] = suggestions
+        
+        changes = []
+        for suggestions in results:
+            changes.extend(suggestions)
         
         return changes
     
@@ -438,24 +1016,30 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Common style issues for all languages
-        changes.extend(self._fix_trailing_whitespace(code))
-        changes.extend(self._fix_final_newline(code))
-        changes.extend(self._fix_mixed_indentation(code))
+        changes.extend(self._fix_whitespace_bundle(code))
+        
+        # Skip the language-specific fixes whose trigger text never occurs
+        present = _present_style_triggers(code, language)
         
         # Language-specific style issues
         if language == "html":
             # Fix HTML style issues
-            changes.extend(self._fix_inconsistent_html_attributes(code))
+            if 'attribute_quotes' in present:
+                changes.extend(self._fix_inconsistent_html_attributes(code))
             
         elif language == "css":
             # Fix CSS style issues
-            changes.extend(self._fix_css_vendor_prefixes(code))
-            changes.extend(self._fix_css_color_formats(code))
+            if 'vendor_prefixes' in present:
+                changes.extend(self._fix_css_vendor_prefixes(code))
+            if 'color_formats' in present:
+                changes.extend(self._fix_css_color_formats(code))
             
         elif language in ["javascript", "typescript"]:
             # Fix JS/TS style issues
-            changes.extend(self._fix_js_quotes(code))
-            changes.extend(self._fix_js_spacing(code))
+            if 'quotes' in present:
+                changes.extend(self._fix_js_quotes(code))
+            if 'spacing' in present:
+                changes.extend(self._fix_js_spacing(code))
         
         return changes
     
@@ -541,7 +1125,7 @@ class WebFixer(BaseFixer):
                             description=f"Format {language} code with prettier",
                             start_line=1,
                             start_column=1,
-                            end_line=len(code.splitlines()) + 1,
+                            end_line=_line_count(code) + 1,
                             end_column=1,
                             original_text=code,
                             replacement_text=formatted_code,
@@ -569,7 +1153,7 @@ class WebFixer(BaseFixer):
                     description="Format HTML indentation",
                     start_line=1,
                     start_column=1,
-                    end_line=len(code.splitlines()) + 1,
+                    end_line=_line_count(code) + 1,
                     end_column=1,
                     original_text=code,
                     replacement_text=formatted_code,
@@ -586,7 +1170,7 @@ class WebFixer(BaseFixer):
                     description="Format CSS indentation and spacing",
                     start_line=1,
                     start_column=1,
-                    end_line=len(code.splitlines()) + 1,
+                    end_line=_line_count(code) + 1,
                     end_column=1,
                     original_text=code,
                     replacement_text=formatted_code,
@@ -621,7 +1205,7 @@ class WebFixer(BaseFixer):
                         description=f"Format {language} code with ESLint",
                         start_line=1,
                         start_column=1,
-                        end_line=len(code.splitlines()) + 1,
+                        end_line=_line_count(code) + 1,
                         end_column=1,
                         original_text=code,
                         replacement_text=formatted_code,
@@ -660,7 +1244,8 @@ class WebFixer(BaseFixer):
         else:
             return ".txt"
     
-    async def _fix_html_issue(self, code: str, line: int, column: int, rule_id: str, message: str) -> List[FixChange]:
+    async def _fix_html_issue(self, code: str, line: int, column: int, rule_id: str, message: str,
+                              match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix a specific HTML issue.
         
@@ -670,28 +1255,31 @@ class WebFixer(BaseFixer):
             column: Column number of the issue.
             rule_id: The rule ID of the issue.
             message: The error message.
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
+        lowered = message.lower()
         
         # Handle common HTML issues based on rule ID or message
-        if "tag-pair" in rule_id or "unclosed tag" in message.lower():
-            changes.extend(self._fix_unclosed_tags(code, line, column, message))
+        if "tag-pair" in rule_id or "unclosed tag" in lowered:
+            changes.extend(self._fix_unclosed_tags(code, line, column, message, match_data))
         
-        elif "attr-lowercase" in rule_id or "attributes should be lowercase" in message.lower():
+        elif "attr-lowercase" in rule_id or "attributes should be lowercase" in lowered:
             changes.extend(self._fix_uppercase_attributes(code, line, column))
         
-        elif "doctype-first" in rule_id or "doctype should be first" in message.lower():
+        elif "doctype-first" in rule_id or "doctype should be first" in lowered:
             changes.extend(self._fix_missing_doctype(code))
         
-        elif "alt-require" in rule_id or "missing alt attribute" in message.lower():
+        elif "alt-require" in rule_id or "missing alt attribute" in lowered:
             changes.extend(self._fix_missing_alt(code, line, column))
         
         return changes
     
-    async def _fix_css_issue(self, code: str, line: int, column: int, rule_id: str, message: str) -> List[FixChange]:
+    async def _fix_css_issue(self, code: str, line: int, column: int, rule_id: str, message: str,
+                              match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix a specific CSS issue.
         
@@ -701,26 +1289,29 @@ class WebFixer(BaseFixer):
             column: Column number of the issue.
             rule_id: The rule ID of the issue.
             message: The error message.
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
+        lowered = message.lower()
         
         # Handle common CSS issues based on rule ID or message
-        if "color-no-invalid-hex" in rule_id or "invalid hex color" in message.lower():
-            changes.extend(self._fix_invalid_hex_color(code, line, column, message))
+        if "color-no-invalid-hex" in rule_id or "invalid hex color" in lowered:
+            changes.extend(self._fix_invalid_hex_color(code, line, column, message, match_data))
         
-        elif "block-no-empty" in rule_id or "empty block" in message.lower():
+        elif "block-no-empty" in rule_id or "empty block" in lowered:
             changes.extend(self._fix_empty_css_blocks(code, line, column))
         
-        elif "unit-no-unknown" in rule_id or "unknown unit" in message.lower():
-            changes.extend(self._fix_invalid_css_units(code, line, column, message))
+        elif "unit-no-unknown" in rule_id or "unknown unit" in lowered:
+            changes.extend(self._fix_invalid_css_units(code, line, column, message, match_data))
         
         return changes
     
     async def _fix_js_issue(self, code: str, line: int, column: int, rule_id: str, 
-                          message: str, language: str) -> List[FixChange]:
+                          message: str, language: str,
+                          match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix a specific JavaScript/TypeScript issue.
         
@@ -731,25 +1322,28 @@ class WebFixer(BaseFixer):
             rule_id: The rule ID of the issue.
             message: The error message.
             language: "javascript" or "typescript".
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
+        lowered = message.lower()
         
         # Handle common JS/TS issues based on rule ID or message
-        if "no-unused-vars" in rule_id or "is defined but never used" in message.lower():
-            changes.extend(self._fix_unused_js_variable(code, line, column, message, language))
+        if "no-unused-vars" in rule_id or "is defined but never used" in lowered:
+            changes.extend(self._fix_unused_js_variable(code, line, column, message, language, match_data))
         
-        elif "missing-semicolon" in rule_id or "missing semicolon" in message.lower():
+        elif "missing-semicolon" in rule_id or "missing semicolon" in lowered:
             changes.extend(self._fix_missing_js_semicolon(code, line, column, language))
         
-        elif "no-undef" in rule_id or "is not defined" in message.lower():
-            changes.extend(self._fix_undefined_js_variable(code, line, column, message, language))
+        elif "no-undef" in rule_id or "is not defined" in lowered:
+            changes.extend(self._fix_undefined_js_variable(code, line, column, message, language, match_data))
         
         return changes
     
-    def _fix_unclosed_tags(self, code: str, line: int, column: int, message: str) -> List[FixChange]:
+    def _fix_unclosed_tags(self, code: str, line: int, column: int, message: str,
+                           match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix unclosed HTML tags.
         
@@ -758,23 +1352,21 @@ class WebFixer(BaseFixer):
             line: Line number of the issue.
             column: Column number of the issue.
             message: The error message.
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
         
-        # Extract tag name from message
-        tag_match = re.search(r'tag\s+<([a-zA-Z0-9]+)>', message)
-        if not tag_match:
-            # Try another pattern
-            tag_match = re.search(r'<([a-zA-Z0-9]+)>', message)
+        # Get the tag name, preferring the value parsed by the analyzer
+        tag_name = (match_data or {}).get('tag_name') or _message_value(message, _MSG_TAG_RE, _MSG_ANY_TAG_RE)
         
-        if tag_match:
-            tag_name = tag_match.group(1).lower()
+        if tag_name:
+            tag_name = tag_name.lower()
             
             # Get the line content
-            lines = code.splitlines()
+            lines = _split_lines(code)
             if 0 < line <= len(lines):
                 line_content = lines[line - 1]
                 
@@ -791,32 +1383,28 @@ class WebFixer(BaseFixer):
                         end_line=line,
                         end_column=len(line_content) + 1,
                         original_text="",
-                        replacement_text=f"</{tag_name}>",
+                        replacement_text=_close_tag(tag_name),
                         fix_type=FixType.SIMPLE
                     )
                     changes.append(change)
                 else:
-                    # Try to find the opening tag in previous lines
-                    for i in range(line - 2, -1, -1):
-                        prev_line = lines[i]
-                        opening_match = re.search(opening_tag_pattern, prev_line)
-                        if opening_match:
-                            # Add a closing tag at the current line
-                            indentation = re.match(r'^(\s*)', line_content)
-                            indent = indentation.group(1) if indentation else ""
-                            
-                            change = FixChange(
-                                description=f"Add closing tag for <{tag_name}>",
-                                start_line=line,
-                                start_column=len(line_content) + 1,
-                                end_line=line,
-                                end_column=len(line_content) + 1,
-                                original_text="",
-                                replacement_text=f"\n{indent}</{tag_name}>",
-                                fix_type=FixType.SIMPLE
-                            )
-                            changes.append(change)
-                            break
+                    # Check whether the tag was opened on a previous line and is still open
+                    open_tags = _scan_tag_stack(code).get(line, [])
+                    if any(tag == tag_name for _, tag in open_tags):
+                        # Add a closing tag at the current line
+                        indent = _leading_ws(line_content)
+                        
+                        change = FixChange(
+                            description=f"Add closing tag for <{tag_name}>",
+                            start_line=line,
+                            start_column=len(line_content) + 1,
+                            end_line=line,
+                            end_column=len(line_content) + 1,
+                            original_text="",
+                            replacement_text=f"\n{indent}{_close_tag(tag_name)}",
+                            fix_type=FixType.SIMPLE
+                        )
+                        changes.append(change)
         
         return changes
     
@@ -835,29 +1423,28 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Get the line content
-        lines = code.splitlines()
+        lines = _split_lines(code)
         if 0 < line <= len(lines):
             line_content = lines[line - 1]
             
-            # Find attributes with uppercase letters
-            attr_pattern = r'(\s+)([A-Z][a-zA-Z0-9]*)(\s*=\s*[\'"][^\'"]*[\'"]|\s*=\s*[^\s>]+|\s+)'
-            for match in re.finditer(attr_pattern, line_content):
-                # Convert attribute name to lowercase
-                attr_name = match.group(2)
-                lowercase_attr = attr_name.lower()
-                
-                if attr_name != lowercase_attr:
-                    change = FixChange(
-                        description=f"Convert attribute '{attr_name}' to lowercase",
-                        start_line=line,
-                        start_column=match.start(2) + 1,
-                        end_line=line,
-                        end_column=match.end(2) + 1,
-                        original_text=attr_name,
-                        replacement_text=lowercase_attr,
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+            # Lowercase every uppercase attribute on the line in a single rewrite
+            fixed_line = _UPPER_ATTR_RE.sub(
+                lambda m: f"{m.group(1)}{m.group(2).lower()}{m.group(3)}",
+                line_content
+            )
+            
+            if fixed_line != line_content:
+                change = FixChange(
+                    description="Convert attributes to lowercase",
+                    start_line=line,
+                    start_column=1,
+                    end_line=line,
+                    end_column=len(line_content) + 1,
+                    original_text=line_content,
+                    replacement_text=fixed_line,
+                    fix_type=FixType.SIMPLE
+                )
+                changes.append(change)
         
         return changes
     
@@ -874,7 +1461,7 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Check if the doctype is missing
-        if not re.search(r'<!DOCTYPE\s+html>', code, re.IGNORECASE):
+        if not _DOCTYPE_RE.search(code):
             # Add doctype at the beginning of the file
             change = FixChange(
                 description="Add HTML5 doctype declaration",
@@ -883,7 +1470,7 @@ class WebFixer(BaseFixer):
                 end_line=1,
                 end_column=1,
                 original_text="",
-                replacement_text="<!DOCTYPE html>\n",
+                replacement_text=_HTML5_DOCTYPE,
                 fix_type=FixType.SIMPLE
             )
             changes.append(change)
@@ -905,31 +1492,35 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Get the line content
-        lines = code.splitlines()
+        lines = _split_lines(code)
         if 0 < line <= len(lines):
             line_content = lines[line - 1]
             
-            # Find img tags without alt attribute
-            img_pattern = r'<img\s+([^>]*)(?<!\salt=[\'"][^\'"]*[\'"])(?<!\salt=[^\s>]+)(/?)>'
-            img_match = re.search(img_pattern, line_content)
+            # Find the first img tag without an alt attribute
+            img_match = next(
+                (m for m in _IMG_TAG_RE.finditer(line_content) if not _ALT_ATTR_RE.search(m.group(1))),
+                None
+            )
             
             if img_match:
                 # Try to infer a meaningful alt text from context
                 alt_text = "Image description"  # Default
                 
-                # Check for title or src attributes to use as alt
-                title_match = re.search(r'title=[\'"]([^\'"]+)[\'"]', img_match.group(1))
-                if title_match:
-                    alt_text = title_match.group(1)
+                # Parse the attributes once, then use title or src as alt
+                attrs = {
+                    m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+                    for m in _ATTR_KV_RE.finditer(img_match.group(1))
+                }
+                if attrs.get('title'):
+                    alt_text = attrs['title']
                 else:
-                    src_match = re.search(r'src=[\'"]([^\'"]+)[\'"]', img_match.group(1))
-                    if src_match:
+                    src_path = attrs.get('src')
+                    if src_path:
                         # Extract filename from src path
-                        src_path = src_match.group(1)
                         filename = os.path.basename(src_path)
                         name_part = os.path.splitext(filename)[0]
                         # Convert to title case and replace dashes/underscores with spaces
-                        alt_text = name_part.replace('-', ' ').replace('_', ' ').title()
+                        alt_text = name_part.translate(_WORD_SEPARATORS).title()
                 
                 # Add alt attribute before the closing bracket
                 closing_pos = img_match.end(1) + 1
@@ -948,7 +1539,8 @@ class WebFixer(BaseFixer):
         
         return changes
     
-    def _fix_invalid_hex_color(self, code: str, line: int, column: int, message: str) -> List[FixChange]:
+    def _fix_invalid_hex_color(self, code: str, line: int, column: int, message: str,
+                               match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix invalid hex color in CSS.
         
@@ -957,26 +1549,30 @@ class WebFixer(BaseFixer):
             line: Line number of the issue.
             column: Column number of the issue.
             message: The error message.
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
         
-        # Extract the invalid color from the message
-        color_match = re.search(r'#([A-Fa-f0-9]+)', message)
-        if color_match:
-            invalid_color = color_match.group(0)
+        # Get the invalid color, preferring the value parsed by the analyzer
+        invalid_color = (match_data or {}).get('color')
+        if not invalid_color:
+            color_value = _message_value(message, _MSG_HEX_COLOR_RE)
+            invalid_color = f"#{color_value}" if color_value else None
+        
+        if invalid_color:
             
             # Get the line content
-            lines = code.splitlines()
+            lines = _split_lines(code)
             if 0 < line <= len(lines):
                 line_content = lines[line - 1]
                 
                 # Find the invalid color in the line
                 if invalid_color in line_content:
                     # Determine the fix based on the length
-                    color_value = color_match.group(1)
+                    color_value = invalid_color[1:]
                     
                     fixed_color = invalid_color
                     if len(color_value) not in [3, 6, 8]:
@@ -1022,13 +1618,12 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Get the line content
-        lines = code.splitlines()
+        lines = _split_lines(code)
         if 0 < line <= len(lines):
             line_content = lines[line - 1]
             
             # Find empty blocks: selector { }
-            empty_block_pattern = r'([^{]*\{\s*\})'
-            empty_block_match = re.search(empty_block_pattern, line_content)
+            empty_block_match = _EMPTY_BLOCK_RE.search(line_content)
             
             if empty_block_match:
                 # Comment out the empty block
@@ -1048,7 +1643,8 @@ class WebFixer(BaseFixer):
         
         return changes
     
-    def _fix_invalid_css_units(self, code: str, line: int, column: int, message: str) -> List[FixChange]:
+    def _fix_invalid_css_units(self, code: str, line: int, column: int, message: str,
+                               match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix invalid CSS units.
         
@@ -1057,20 +1653,25 @@ class WebFixer(BaseFixer):
             line: Line number of the issue.
             column: Column number of the issue.
             message: The error message.
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
         
-        # Extract the invalid unit from the message
-        unit_match = re.search(r'(\d+)([a-zA-Z%]+)', message)
-        if unit_match:
-            value = unit_match.group(1)
-            invalid_unit = unit_match.group(2)
+        # Get the value and unit, preferring the values parsed by the analyzer
+        value = (match_data or {}).get('value')
+        invalid_unit = (match_data or {}).get('unit')
+        if not (value and invalid_unit):
+            unit_match = _MSG_CSS_UNIT_RE.search(message)
+            if unit_match:
+                value, invalid_unit = unit_match.groups()
+        
+        if value and invalid_unit:
             
             # Get the line content
-            lines = code.splitlines()
+            lines = _split_lines(code)
             if 0 < line <= len(lines):
                 line_content = lines[line - 1]
                 
@@ -1083,25 +1684,25 @@ class WebFixer(BaseFixer):
                         replacement = f"{value}{invalid_unit}"
                     else:
                         # Try to determine the appropriate unit
-                        property_match = re.search(r'([a-zA-Z-]+)\s*:', line_content[:match.start()])
+                        property_match = _CSS_PROPERTY_NAME_RE.search(line_content, 0, match.start())
                         
                         if property_match:
                             property_name = property_match.group(1).lower()
                             
                             # Map properties to appropriate units
                             if property_name in ['width', 'height', 'margin', 'padding', 'left', 'right', 'top', 'bottom']:
-                                replacement = f"{value}px"
+                                replacement = _px(value)
                             elif property_name in ['font-size', 'line-height']:
-                                replacement = f"{value}px"
+                                replacement = _px(value)
                             elif property_name in ['opacity']:
                                 # No unit for opacity
                                 replacement = value
                             else:
                                 # Default to pixels
-                                replacement = f"{value}px"
+                                replacement = _px(value)
                         else:
                             # Default to pixels
-                            replacement = f"{value}px"
+                            replacement = _px(value)
                     
                     if replacement != f"{value}{invalid_unit}":
                         change = FixChange(
@@ -1118,7 +1719,8 @@ class WebFixer(BaseFixer):
         
         return changes
     
-    def _fix_unused_js_variable(self, code: str, line: int, column: int, message: str, language: str) -> List[FixChange]:
+    def _fix_unused_js_variable(self, code: str, line: int, column: int, message: str, language: str,
+                                match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix unused variables in JavaScript/TypeScript.
         
@@ -1128,22 +1730,22 @@ class WebFixer(BaseFixer):
             column: Column number of the issue.
             message: The error message.
             language: "javascript" or "typescript".
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
         
-        # Extract the variable name from the message
-        var_match = re.search(r'[\'"]([a-zA-Z0-9_$]+)[\'"]', message)
-        if not var_match:
-            var_match = re.search(r'([a-zA-Z0-9_$]+)\s+is defined', message)
+        # Get the variable name, preferring the value parsed by the analyzer
+        var_name = (match_data or {}).get('var_name') or _message_value(
+            message, _MSG_QUOTED_NAME_RE, _MSG_DEFINED_NAME_RE
+        )
         
-        if var_match:
-            var_name = var_match.group(1)
+        if var_name:
             
             # Get the line content
-            lines = code.splitlines()
+            lines = _split_lines(code)
             if 0 < line <= len(lines):
                 line_content = lines[line - 1]
                 
@@ -1207,7 +1809,7 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Get the line content
-        lines = code.splitlines()
+        lines = _split_lines(code)
         if 0 < line <= len(lines):
             line_content = lines[line - 1]
             
@@ -1228,7 +1830,8 @@ class WebFixer(BaseFixer):
         
         return changes
     
-    def _fix_undefined_js_variable(self, code: str, line: int, column: int, message: str, language: str) -> List[FixChange]:
+    def _fix_undefined_js_variable(self, code: str, line: int, column: int, message: str, language: str,
+                                   match_data: Optional[Dict[str, str]] = None) -> List[FixChange]:
         """
         Fix undefined variables in JavaScript/TypeScript.
         
@@ -1238,22 +1841,22 @@ class WebFixer(BaseFixer):
             column: Column number of the issue.
             message: The error message.
             language: "javascript" or "typescript".
+            match_data: Optional values already parsed from the message by the analyzer.
         
         Returns:
             List of FixChange objects with changes to apply.
         """
         changes = []
         
-        # Extract the variable name from the message
-        var_match = re.search(r'[\'"]([a-zA-Z0-9_$]+)[\'"]', message)
-        if not var_match:
-            var_match = re.search(r'([a-zA-Z0-9_$]+)\s+is not defined', message)
+        # Get the variable name, preferring the value parsed by the analyzer
+        var_name = (match_data or {}).get('var_name') or _message_value(
+            message, _MSG_QUOTED_NAME_RE, _MSG_UNDEFINED_NAME_RE
+        )
         
-        if var_match:
-            var_name = var_match.group(1)
+        if var_name:
             
             # Get the line content
-            lines = code.splitlines()
+            lines = _split_lines(code)
             if 0 < line <= len(lines):
                 line_content = lines[line - 1]
                 
@@ -1269,11 +1872,10 @@ class WebFixer(BaseFixer):
                     # Look for function definition above the current line
                     for i in range(line - 2, -1, -1):
                         prev_line = lines[i]
-                        if re.search(r'function\s+', prev_line):
+                        if _JS_FUNCTION_RE.search(prev_line):
                             function_start = i
-                            indent_match = re.match(r'^(\s+)', prev_line)
-                            if indent_match:
-                                indent = indent_match.group(1)
+                            if prev_line[:1].isspace():
+                                indent = _leading_ws(prev_line)
                             break
                     
                     if function_start >= 0:
@@ -1289,7 +1891,7 @@ class WebFixer(BaseFixer):
                                     type_annotation = ": any"
                                     if "==" in line_content or "===" in line_content:
                                         type_annotation = ": boolean"
-                                    elif re.search(r'\d+', line_content):
+                                    elif _DIGITS_RE.search(line_content):
                                         type_annotation = ": number"
                                     elif '"' in line_content or "'" in line_content:
                                         type_annotation = ": string"
@@ -1345,33 +1947,31 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        # Fix self-closing tags
-        lines = code.splitlines()
-        for i, line in enumerate(lines):
-            # Find self-closing tags that don't use proper syntax
-            improper_tags = re.finditer(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*>(\s*)</\1>', line)
+        # Find void elements written as an empty open/close pair, in one pass over the document
+        line_starts = _line_starts(code)
+        
+        for match in _EMPTY_VOID_PAIR_RE.finditer(code):
+            tag_name = match.group(1)
+            if match.group(2).lower() != tag_name.lower():
+                continue
             
-            for match in improper_tags:
-                tag_name = match.group(1)
-                # Self-closing HTML tags
-                void_elements = ['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr']
-                
-                if tag_name.lower() in void_elements:
-                    # Convert to proper self-closing tag
-                    opening_tag = match.group(0)
-                    closing_tag_pos = opening_tag.find('>')
-                    
-                    change = FixChange(
-                        description=f"Convert to self-closing tag: <{tag_name}>",
-                        start_line=i + 1,
-                        start_column=match.start() + 1,
-                        end_line=i + 1,
-                        end_column=match.end() + 1,
-                        original_text=match.group(0),
-                        replacement_text=opening_tag[:closing_tag_pos] + "/>" if not opening_tag[:closing_tag_pos].endswith('/') else opening_tag,
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+            # Convert to proper self-closing tag
+            i = _line_index(line_starts, match.start())
+            column = match.start() - line_starts[i]
+            opening_tag = match.group(0)
+            closing_tag_pos = opening_tag.find('>')
+            
+            change = FixChange(
+                description=f"Convert to self-closing tag: <{tag_name}>",
+                start_line=i + 1,
+                start_column=column + 1,
+                end_line=i + 1,
+                end_column=column + len(opening_tag) + 1,
+                original_text=opening_tag,
+                replacement_text=opening_tag[:closing_tag_pos] + "/>" if not opening_tag[:closing_tag_pos].endswith('/') else opening_tag,
+                fix_type=FixType.SIMPLE
+            )
+            changes.append(change)
         
         return changes
     
@@ -1388,21 +1988,21 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Check for essential elements
-        has_html = re.search(r'<html', code, re.IGNORECASE) is not None
-        has_head = re.search(r'<head', code, re.IGNORECASE) is not None
-        has_body = re.search(r'<body', code, re.IGNORECASE) is not None
+        has_html = _HTML_OPEN_RE.search(code) is not None
+        has_head = _HEAD_OPEN_RE.search(code) is not None
+        has_body = _BODY_OPEN_RE.search(code) is not None
         
         # If there's content but no structure, add it
         if not has_html and not has_head and not has_body and len(code.strip()) > 0:
             # This is likely a fragment, wrap it with proper HTML structure
             indentation = "  "
-            doctype = "<!DOCTYPE html>\n"
+            doctype = _HTML5_DOCTYPE
             html_open = "<html>\n"
             head = f"{indentation}<head>\n{indentation}{indentation}<meta charset=\"UTF-8\">\n{indentation}{indentation}<meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n{indentation}{indentation}<title>Document</title>\n{indentation}</head>\n"
             body_open = f"{indentation}<body>\n"
             
             # Apply appropriate indentation to the content
-            content_lines = code.splitlines()
+            content_lines = _split_lines(code)
             indented_content = "\n".join([f"{indentation}{indentation}{line}" for line in content_lines])
             
             body_close = f"\n{indentation}</body>\n"
@@ -1444,12 +2044,17 @@ class WebFixer(BaseFixer):
         # (block elements can't be inside paragraphs)
         block_elements = ['div', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article', 'aside', 'nav', 'header', 'footer']
         
-        lines = code.splitlines()
-        for i, line in enumerate(lines):
+        # Collect the offending block elements per line in a single pass over the document
+        line_starts = _line_starts(code)
+        nested_blocks: Dict[int, Set[str]] = {}
+        for match in _BLOCK_IN_P_RE.finditer(code):
+            nested_blocks.setdefault(_line_index(line_starts, match.start()), set()).add(match.group(1))
+        
+        lines = _split_lines(code)
+        for i in sorted(nested_blocks):
+            line = lines[i]
             for block in block_elements:
-                # Look for patterns like <p>...<div>
-                block_in_p = re.search(rf'<p\b[^>]*>[^<]*<{block}\b', line)
-                if block_in_p:
+                if block in nested_blocks[i]:
                     # This is invalid nesting, suggest fixing it
                     change = FixChange(
                         description=f"Invalid nesting: <{block}> inside <p>",
@@ -1478,26 +2083,25 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        # Find CSS rules with missing properties
-        rule_pattern = r'([^{]*\{)\s*\}'
-        lines = code.splitlines()
+        # An empty rule needs an opening brace
+        if '{' not in code:
+            return changes
         
-        for i, line in enumerate(lines):
-            for match in re.finditer(rule_pattern, line):
-                selector = match.group(1).strip()
-                
-                # Add a placeholder property
-                change = FixChange(
-                    description="Add placeholder property to empty CSS rule",
-                    start_line=i + 1,
-                    start_column=match.start(0) + len(selector) + 1,
-                    end_line=i + 1,
-                    end_column=match.end(0),
-                    original_text=match.group(0)[len(selector):],
-                    replacement_text="{ /* TODO: Add properties */ }",
-                    fix_type=FixType.SIMPLE
-                )
-                changes.append(change)
+        # Find CSS rules with missing properties and add a placeholder property
+        changes.extend(
+            FixChange(
+                description="Add placeholder property to empty CSS rule",
+                start_line=i + 1,
+                start_column=match.start(0) + len(match.group(1).strip()) + 1,
+                end_line=i + 1,
+                end_column=match.end(0),
+                original_text=match.group(0)[len(match.group(1).strip()):],
+                replacement_text="{ /* TODO: Add properties */ }",
+                fix_type=FixType.SIMPLE
+            )
+            for i, line in enumerate(_split_lines(code))
+            for match in _EMPTY_RULE_RE.finditer(line)
+        )
         
         return changes
     
@@ -1521,13 +2125,13 @@ class WebFixer(BaseFixer):
             # Missing closing braces
             diff = opening_count - closing_count
             
-            lines = code.splitlines()
+            line_no = _line_count(code) + 1
             # Add missing closing braces at the end
             change = FixChange(
                 description=f"Add {diff} missing closing braces",
-                start_line=len(lines) + 1,
+                start_line=line_no,
                 start_column=1,
-                end_line=len(lines) + 1,
+                end_line=line_no,
                 end_column=1,
                 original_text="",
                 replacement_text="\n" + "}" * diff + " /* Added missing closing braces */",
@@ -1536,40 +2140,26 @@ class WebFixer(BaseFixer):
             changes.append(change)
         
         elif closing_count > opening_count:
-            # Too many closing braces, find and comment out extras
+            # Too many closing braces, comment out the last extras
             diff = closing_count - opening_count
             
-            lines = code.splitlines()
-            braces_to_find = diff
+            line_starts = _line_starts(code)
             
-            for i in range(len(lines) - 1, -1, -1):
-                line = lines[i]
-                
-                # Find closing braces and comment them
-                for j in range(len(line) - 1, -1, -1):
-                    if line[j] == '}' and braces_to_find > 0:
-                        before = line[:j]
-                        after = line[j+1:]
-                        
-                        change = FixChange(
-                            description="Comment out extra closing brace",
-                            start_line=i + 1,
-                            start_column=j + 1,
-                            end_line=i + 1,
-                            end_column=j + 2,
-                            original_text="}",
-                            replacement_text="/* } */",
-                            fix_type=FixType.SIMPLE
-                        )
-                        changes.append(change)
-                        
-                        braces_to_find -= 1
-                        
-                        if braces_to_find == 0:
-                            break
+            for offset in _last_offsets(code, '}', diff):
+                i = _line_index(line_starts, offset)
+                j = offset - line_starts[i]
                 
-                if braces_to_find == 0:
-                    break
+                change = FixChange(
+                    description="Comment out extra closing brace",
+                    start_line=i + 1,
+                    start_column=j + 1,
+                    end_line=i + 1,
+                    end_column=j + 2,
+                    original_text="}",
+                    replacement_text="/* } */",
+                    fix_type=FixType.SIMPLE
+                )
+                changes.append(change)
         
         return changes
     
@@ -1592,6 +2182,9 @@ class WebFixer(BaseFixer):
             '(': ')'
         }
         
+        # Line offsets are shared by every bracket type, so build them at most once
+        line_starts = None
+        
         for opening, closing in brackets.items():
             opening_count = code.count(opening)
             closing_count = code.count(closing)
@@ -1600,13 +2193,15 @@ class WebFixer(BaseFixer):
                 # Missing closing brackets
                 diff = opening_count - closing_count
                 
-                lines = code.splitlines()
+                if line_starts is None:
+                    line_starts = _line_starts(code)
+                
                 # Add missing closing brackets at the end
                 change = FixChange(
                     description=f"Add {diff} missing {closing} brackets",
-                    start_line=len(lines) + 1,
+                    start_line=len(line_starts) + 1,
                     start_column=1,
-                    end_line=len(lines) + 1,
+                    end_line=len(line_starts) + 1,
                     end_column=1,
                     original_text="",
                     replacement_text="\n" + closing * diff + " /* Added missing closing brackets */",
@@ -1615,37 +2210,27 @@ class WebFixer(BaseFixer):
                 changes.append(change)
             
             elif closing_count > opening_count:
-                # Too many closing brackets, find and comment out extras
+                # Too many closing brackets, comment out the last extras
                 diff = closing_count - opening_count
                 
-                lines = code.splitlines()
-                brackets_to_find = diff
+                if line_starts is None:
+                    line_starts = _line_starts(code)
                 
-                for i in range(len(lines) - 1, -1, -1):
-                    line = lines[i]
+                for offset in _last_offsets(code, closing, diff):
+                    i = _line_index(line_starts, offset)
+                    j = offset - line_starts[i]
                     
-                    # Find closing brackets and comment them
-                    for j in range(len(line) - 1, -1, -1):
-                        if line[j] == closing and brackets_to_find > 0:
-                            change = FixChange(
-                                description=f"Comment out extra {closing} bracket",
-                                start_line=i + 1,
-                                start_column=j + 1,
-                                end_line=i + 1,
-                                end_column=j + 2,
-                                original_text=closing,
-                                replacement_text=f"/* {closing} */",
-                                fix_type=FixType.SIMPLE
-                            )
-                            changes.append(change)
-                            
-                            brackets_to_find -= 1
-                            
-                            if brackets_to_find == 0:
-                                break
-                    
-                    if brackets_to_find == 0:
-                        break
+                    change = FixChange(
+                        description=f"Comment out extra {closing} bracket",
+                        start_line=i + 1,
+                        start_column=j + 1,
+                        end_line=i + 1,
+                        end_column=j + 2,
+                        original_text=closing,
+                        replacement_text=f"/* {closing} */",
+                        fix_type=FixType.SIMPLE
+                    )
+                    changes.append(change)
         
         return changes
     
@@ -1663,38 +2248,21 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Simple approach: check if lines should have semicolons
-        lines = code.splitlines()
+        lines = _split_lines(code)
         
         for i, line in enumerate(lines):
             stripped = line.strip()
             
             # Skip empty lines, lines that already have semicolons, and lines that shouldn't have semicolons
-            if not stripped or stripped.endswith(';') or stripped.endswith('{') or stripped.endswith('}') or stripped.endswith(':'):
+            if not stripped or stripped.endswith(_NO_SEMICOLON_SUFFIXES):
                 continue
             
-            # Skip lines that start function/class declarations or are clearly flow control
-            if (stripped.startswith('function ') or stripped.startswith('class ') or
-                stripped.startswith('if ') or stripped.startswith('else ') or
-                stripped.startswith('for ') or stripped.startswith('while ') or
-                stripped.startswith('switch ') or stripped.startswith('case ')):
-                continue
-            
-            # Skip comment lines
-            if stripped.startswith('//') or stripped.startswith('/*'):
+            # Skip function/class declarations, flow control and comment lines
+            if stripped.startswith(_NO_SEMICOLON_PREFIXES):
                 continue
             
             # This line likely needs a semicolon
-            change = FixChange(
-                description="Add missing semicolon",
-                start_line=i + 1,
-                start_column=len(line) + 1,
-                end_line=i + 1,
-                end_column=len(line) + 1,
-                original_text="",
-                replacement_text=";",
-                fix_type=FixType.SIMPLE
-            )
-            changes.append(change)
+            changes.append(_insertion("Add missing semicolon", i + 1, len(line) + 1, ";"))
         
         return changes
     
@@ -1708,34 +2276,7 @@ class WebFixer(BaseFixer):
         Returns:
             List of FixChange objects with changes to apply.
         """
-        changes = []
-        
-        lines = code.splitlines(True)  # Keep line endings
-        
-        for i, line in enumerate(lines):
-            stripped = line.rstrip('\r\n')
-            
-            if stripped and stripped.rstrip() != stripped:
-                # Line has trailing whitespace
-                fixed_line = stripped.rstrip()
-                if line.endswith('\r\n'):
-                    fixed_line += '\r\n'
-                elif line.endswith('\n'):
-                    fixed_line += '\n'
-                
-                change = FixChange(
-                    description="Remove trailing whitespace",
-                    start_line=i + 1,
-                    start_column=1,
-                    end_line=i + 1,
-                    end_column=len(line) + 1,
-                    original_text=line,
-                    replacement_text=fixed_line,
-                    fix_type=FixType.SIMPLE
-                )
-                changes.append(change)
-        
-        return changes
+        return self._fix_whitespace_bundle(code, final_newline=False, indentation=False)
     
     def _fix_final_newline(self, code: str) -> List[FixChange]:
         """
@@ -1747,22 +2288,7 @@ class WebFixer(BaseFixer):
         Returns:
             List of FixChange objects with changes to apply.
         """
-        changes = []
-        
-        if code and not code.endswith('\n'):
-            change = FixChange(
-                description="Add missing final newline",
-                start_line=len(code.splitlines()) + 1,
-                start_column=1,
-                end_line=len(code.splitlines()) + 1,
-                end_column=1,
-                original_text="",
-                replacement_text="\n",
-                fix_type=FixType.SIMPLE
-            )
-            changes.append(change)
-        
-        return changes
+        return self._fix_whitespace_bundle(code, trailing=False, indentation=False)
     
     def _fix_mixed_indentation(self, code: str) -> List[FixChange]:
         """
@@ -1774,79 +2300,139 @@ class WebFixer(BaseFixer):
         Returns:
             List of FixChange objects with changes to apply.
         """
-        changes = []
-        
-        lines = code.splitlines()
-        
-        # Count spaces and tabs at the beginning of lines
-        space_lines = 0
-        tab_lines = 0
+        return self._fix_whitespace_bundle(code, trailing=False, final_newline=False)
+    
+    def _fix_whitespace_bundle(self, code: str, trailing: bool = True, final_newline: bool = True,
+                               indentation: bool = True) -> List[FixChange]:
+        """
+        Fix trailing whitespace, a missing final newline and mixed indentation in one pass.
         
-        for line in lines:
-            if line.strip():  # Skip empty lines
-                if line.startswith('\t'):
-                    tab_lines += 1
-                elif line.startswith(' '):
-                    space_lines += 1
+        Args:
+            code: The code to fix.
+            trailing: Whether to fix trailing whitespace.
+            final_newline: Whether to fix a missing final newline.
+            indentation: Whether to fix mixed indentation.
         
-        # Determine the dominant indentation style
-        use_spaces = space_lines >= tab_lines
+        Returns:
+            List of FixChange objects with changes to apply, trailing whitespace fixes first,
+            then the final newline, then indentation.
+        """
+        changes = []
         
-        if use_spaces:
-            # Convert tabs to spaces (assuming 2 spaces per tab)
-            for i, line in enumerate(lines):
-                if line.startswith('\t'):
-                    # Count leading tabs
-                    leading_tabs = 0
-                    for char in line:
-                        if char == '\t':
-                            leading_tabs += 1
-                        else:
-                            break
-                    
-                    # Replace tabs with spaces
-                    spaces = ' ' * (2 * leading_tabs)
-                    fixed_line = spaces + line[leading_tabs:]
+        if trailing:
+            # Find all trailing whitespace in one scan and only slice out the affected lines
+            line_starts = None
+            for match in _TRAILING_WS_RE.finditer(code):
+                if line_starts is None:
+                    line_starts = _line_starts(code) + array('q', (len(code),))
+                
+                # A run can span lines split at \x0c and other breaks that aren't \r or \n
+                i = _line_index(line_starts, match.start())
+                while line_starts[i] < match.end():
+                    line_start = line_starts[i]
+                    line = code[line_start:line_starts[i + 1]]
                     
                     change = FixChange(
-                        description="Convert tabs to spaces",
+                        description="Remove trailing whitespace",
                         start_line=i + 1,
                         start_column=1,
                         end_line=i + 1,
                         end_column=len(line) + 1,
                         original_text=line,
-                        replacement_text=fixed_line,
+                        replacement_text=line[:max(match.start() - line_start, 0)] + line[match.end() - line_start:],
                         fix_type=FixType.SIMPLE
                     )
                     changes.append(change)
+                    i += 1
+        
+        if final_newline and code and not code.endswith('\n'):
+            # The newline goes at the start of the line after the last one
+            line_no = _line_count(code) + 1
+            
+            change = FixChange(
+                description="Add missing final newline",
+                start_line=line_no,
+                start_column=1,
+                end_line=line_no,
+                end_column=1,
+                original_text="",
+                replacement_text="\n",
+                fix_type=FixType.SIMPLE
+            )
+            changes.append(change)
+        
+        if not indentation:
+            return changes
+        
+        bare_lines = _split_lines(code)
+        
+        # Indentation fixes depend on the dominant style, so collect candidates during the pass
+        space_lines = []
+        tab_lines = []
+        space_count = 0
+        tab_count = 0
+        
+        for i, bare_line in enumerate(bare_lines):
+            # Whitespace-only lines are converted but don't count towards the dominant style
+            if bare_line.startswith('\t'):
+                tab_lines.append(i)
+                if bare_line.strip():
+                    tab_count += 1
+            elif bare_line.startswith(' '):
+                space_lines.append(i)
+                if bare_line.strip():
+                    space_count += 1
+        
+        # Determine the dominant indentation style
+        use_spaces = space_count >= tab_count
+        
+        if use_spaces:
+            # Convert tabs to spaces (assuming 2 spaces per tab)
+            for i in tab_lines:
+                line = bare_lines[i]
+                
+                # Count leading tabs
+                leading_tabs = len(line) - len(line.lstrip('\t'))
+                
+                # Replace tabs with spaces
+                spaces = ' ' * (2 * leading_tabs)
+                fixed_line = spaces + line[leading_tabs:]
+                
+                change = FixChange(
+                    description="Convert tabs to spaces",
+                    start_line=i + 1,
+                    start_column=1,
+                    end_line=i + 1,
+                    end_column=len(line) + 1,
+                    original_text=line,
+                    replacement_text=fixed_line,
+                    fix_type=FixType.SIMPLE
+                )
+                changes.append(change)
         else:
             # Convert spaces to tabs (assuming 2 or 4 spaces per tab)
-            for i, line in enumerate(lines):
-                if line.startswith(' '):
-                    # Count leading spaces
-                    leading_spaces = 0
-                    for char in line:
-                        if char == ' ':
-                            leading_spaces += 1
-                        else:
-                            break
-                    
-                    # Replace spaces with tabs
-                    tabs = '\t' * (leading_spaces // 2)  # Assuming 2 spaces per tab
-                    remaining_spaces = ' ' * (leading_spaces % 2)
-                    fixed_line = tabs + remaining_spaces + line[leading_spaces:]
-                    
-                    change = FixChange(
-                        description="Convert spaces to tabs",
-                        start_line=i + 1,
-                        start_column=1,
-                        end_line=i + 1,
-                        end_column=len(line) + 1,
-                        original_text=line,
-                        replacement_text=fixed_line,
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+            for i in space_lines:
+                line = bare_lines[i]
+                
+                # Count leading spaces
+                leading_spaces = len(line) - len(line.lstrip(' '))
+                
+                # Replace spaces with tabs
+                tabs = '\t' * (leading_spaces // 2)  # Assuming 2 spaces per tab
+                remaining_spaces = ' ' * (leading_spaces % 2)
+                fixed_line = tabs + remaining_spaces + line[leading_spaces:]
+                
+                change = FixChange(
+                    description="Convert spaces to tabs",
+                    start_line=i + 1,
+                    start_column=1,
+                    end_line=i + 1,
+                    end_column=len(line) + 1,
+                    original_text=line,
+                    replacement_text=fixed_line,
+                    fix_type=FixType.SIMPLE
+                )
+                changes.append(change)
         
         return changes
     
@@ -1863,52 +2449,34 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Count single and double quotes
-        double_quotes = len(re.findall(r'=\s*"[^"]*"', code))
-        single_quotes = len(re.findall(r"=\s*'[^']*'", code))
+        double_quotes = sum(1 for _ in _DOUBLE_QUOTED_ATTR_RE.finditer(code))
+        single_quotes = sum(1 for _ in _SINGLE_QUOTED_ATTR_RE.finditer(code))
         
         # Use the dominant quote style
         use_double_quotes = double_quotes >= single_quotes
         
-        lines = code.splitlines()
+        # Find attributes with the non-dominant quote style
+        if use_double_quotes:
+            pattern, quote = _SINGLE_QUOTED_ATTR_VALUE_RE, '"'
+            description = "Convert single quotes to double quotes in HTML attribute"
+        else:
+            pattern, quote = _DOUBLE_QUOTED_ATTR_VALUE_RE, "'"
+            description = "Convert double quotes to single quotes in HTML attribute"
         
-        for i, line in enumerate(lines):
-            # Find attributes with the non-dominant quote style
-            if use_double_quotes:
-                # Find single-quoted attributes
-                for match in re.finditer(r"(\w+\s*=\s*)('[^']*')(\s)", line):
-                    attr_value = match.group(2)
-                    # Convert to double quotes
-                    new_value = '"' + attr_value[1:-1] + '"'
-                    
-                    change = FixChange(
-                        description="Convert single quotes to double quotes in HTML attribute",
-                        start_line=i + 1,
-                        start_column=match.start(2) + 1,
-                        end_line=i + 1,
-                        end_column=match.end(2) + 1,
-                        original_text=attr_value,
-                        replacement_text=new_value,
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
-            else:
-                # Find double-quoted attributes
-                for match in re.finditer(r'(\w+\s*=\s*)("[^"]*")(\s)', line):
-                    attr_value = match.group(2)
-                    # Convert to single quotes
-                    new_value = "'" + attr_value[1:-1] + "'"
-                    
-                    change = FixChange(
-                        description="Convert double quotes to single quotes in HTML attribute",
-                        start_line=i + 1,
-                        start_column=match.start(2) + 1,
-                        end_line=i + 1,
-                        end_column=match.end(2) + 1,
-                        original_text=attr_value,
-                        replacement_text=new_value,
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+        changes.extend(
+            FixChange(
+                description=description,
+                start_line=i + 1,
+                start_column=match.start(2) + 1,
+                end_line=i + 1,
+                end_column=match.end(2) + 1,
+                original_text=match.group(2),
+                replacement_text=quote + match.group(2)[1:-1] + quote,
+                fix_type=FixType.SIMPLE
+            )
+            for i, line in enumerate(_split_lines(code))
+            for match in pattern.finditer(line)
+        )
         
         return changes
     
@@ -1924,40 +2492,39 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        # Properties that often need vendor prefixes
-        prefix_properties = {
-            'transform': ['-webkit-transform', '-moz-transform', '-ms-transform'],
-            'transition': ['-webkit-transition', '-moz-transition', '-ms-transition'],
-            'animation': ['-webkit-animation', '-moz-animation'],
-            'box-shadow': ['-webkit-box-shadow', '-moz-box-shadow'],
-            'border-radius': ['-webkit-border-radius', '-moz-border-radius'],
-            'user-select': ['-webkit-user-select', '-moz-user-select', '-ms-user-select']
-        }
+        # Only consider the properties that occur somewhere in the code
+        active_properties = [(prop, prefixes) for prop, prefixes in _VENDOR_PREFIXES.items() if prop in code]
+        if not active_properties:
+            return changes
         
-        lines = code.splitlines()
+        lines = _split_lines(code)
+        
+        # Index the lines on which each prefixed property is declared, in one pass over the code
+        line_starts = _line_starts(code)
+        prefix_rows: Dict[str, List[int]] = {}
+        for match in _VENDOR_PREFIXED_PROPERTY_RE.finditer(code):
+            prefix_rows.setdefault(match.group(1), []).append(_line_index(line_starts, match.start()))
         
         for i, line in enumerate(lines):
             # Look for properties that might need prefixes
-            for prop, prefixes in prefix_properties.items():
+            for prop, prefixes in active_properties:
                 # Check if the line contains the property but not its prefixes
-                prop_pattern = fr'\b{prop}\s*:'
-                if re.search(prop_pattern, line):
-                    # Check if any prefixes are already present
+                if prop in line and _VENDOR_PROPERTY_RES[prop].search(line):
+                    # Check if any prefixes are already present within five lines before or after
                     missing_prefixes = []
                     for prefix in prefixes:
-                        prefix_pattern = fr'\b{prefix}\s*:'
-                        if not re.search(prefix_pattern, ''.join(lines[max(0, i-5):min(len(lines), i+5)])):
+                        rows = prefix_rows.get(prefix, [])
+                        if bisect.bisect_left(rows, i - 5) == bisect.bisect_left(rows, i + 5):
                             missing_prefixes.append(prefix)
                     
                     if missing_prefixes:
                         # Extract the property value
-                        value_match = re.search(fr'{prop}\s*:\s*([^;]+);?', line)
+                        value_match = _VENDOR_VALUE_RES[prop].search(line)
                         if value_match:
                             prop_value = value_match.group(1).strip()
                             
                             # Get indentation
-                            indent_match = re.match(r'^(\s*)', line)
-                            indent = indent_match.group(1) if indent_match else ""
+                            indent = _leading_ws(line)
                             
                             # Create prefix lines
                             prefix_lines = []
@@ -1991,17 +2558,30 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
+        # Nothing to check without hex colors
+        if '#' not in code:
+            return changes
+        
+        # #RGB is only expanded when the file already uses lowercase #RRGGBB
+        expand_short = _LONG_HEX_COLOR_RE.search(code) is not None
+        has_upper = any(ch in code for ch in 'ABCDEF')
+        
+        if not expand_short and not has_upper:
+            return changes
+        
+        # Without expansion only colors with uppercase digits need visiting
+        pattern = _HEX_COLOR_RE if expand_short else _UPPER_HEX_COLOR_RE
+        
         # Find hex colors and normalize them
-        hex_pattern = r'#([0-9a-fA-F]{3,6})\b'
-        lines = code.splitlines()
+        lines = _split_lines(code)
         
         for i, line in enumerate(lines):
-            for match in re.finditer(hex_pattern, line):
+            for match in pattern.finditer(line):
                 hex_color = match.group(0)
                 hex_value = match.group(1)
                 
                 # Normalize to lowercase
-                if not hex_color.islower():
+                if has_upper and not hex_color.islower():
                     normalized = '#' + hex_value.lower()
                     
                     if hex_color != normalized:
@@ -2022,7 +2602,7 @@ class WebFixer(BaseFixer):
                     expanded = '#' + ''.join([c * 2 for c in hex_value.lower()])
                     
                     # Only suggest if we find another expanded hex
-                    if re.search(r'#[0-9a-f]{6}\b', code):
+                    if expand_short:
                         change = FixChange(
                             description="Convert #RGB to #RRGGBB format",
                             start_line=i + 1,
@@ -2051,13 +2631,13 @@ class WebFixer(BaseFixer):
         changes = []
         
         # Count single and double quotes
-        double_quotes = len(re.findall(r'"[^"]*"', code))
-        single_quotes = len(re.findall(r"'[^']*'", code))
+        double_quotes = sum(1 for _ in _DOUBLE_QUOTED_STRING_RE.finditer(code))
+        single_quotes = sum(1 for _ in _SINGLE_QUOTED_STRING_RE.finditer(code))
         
         # Determine the dominant quote style
         use_double_quotes = double_quotes > single_quotes
         
-        lines = code.splitlines()
+        lines = _split_lines(code)
         
         for i, line in enumerate(lines):
             # Skip comment lines
@@ -2067,7 +2647,7 @@ class WebFixer(BaseFixer):
             # Find strings with the non-dominant quote style
             if use_double_quotes:
                 # Replace single quotes with double quotes
-                for match in re.finditer(r"'([^']*)'", line):
+                for match in _SINGLE_QUOTED_STRING_RE.finditer(line):
                     # Skip if the string contains double quotes
                     if '"' in match.group(1):
                         continue
@@ -2087,7 +2667,7 @@ class WebFixer(BaseFixer):
                     changes.append(change)
             else:
                 # Replace double quotes with single quotes
-                for match in re.finditer(r'"([^"]*)"', line):
+                for match in _DOUBLE_QUOTED_STRING_RE.finditer(line):
                     # Skip if the string contains single quotes
                     if "'" in match.group(1):
                         continue
@@ -2120,28 +2700,15 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        lines = _split_lines(code)
         
         for i, line in enumerate(lines):
             # Fix missing spaces after keywords
-            for keyword in ['if', 'for', 'while', 'switch', 'catch']:
-                keyword_pattern = fr'\b{keyword}(\()'
-                for match in re.finditer(keyword_pattern, line):
-                    change = FixChange(
-                        description=f"Add space after '{keyword}' keyword",
-                        start_line=i + 1,
-                        start_column=match.start(1) + 1,
-                        end_line=i + 1,
-                        end_column=match.start(1) + 1,
-                        original_text="",
-                        replacement_text=" ",
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+            for match in _KEYWORD_PAREN_RE.finditer(line):
+                changes.append(_insertion(f"Add space after '{match.group(1)}' keyword", i + 1, match.start(2) + 1, " "))
             
             # Fix missing spaces around operators
-            operator_pattern = r'([a-zA-Z0-9_])([\+\-\*\/\%\=\<\>\!\&\|])([a-zA-Z0-9_])'
-            for match in re.finditer(operator_pattern, line):
+            for match in _JS_OPERATOR_RE.finditer(line):
                 # Skip ++ and -- operators
                 if match.group(2) in ['+', '-'] and line[match.start(2):match.start(2)+2] in ['++', '--']:
                     continue
@@ -2173,23 +2740,25 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        # Attributes only occur inside tags
+        if '<' not in code:
+            return changes
+        
+        lines = _split_lines(code)
         
         for i, line in enumerate(lines):
             # Fix attributes without values
-            attr_pattern = r'(<[a-zA-Z][a-zA-Z0-9]*\s+[^>]*?)(\b[a-zA-Z][a-zA-Z0-9]*\b)(\s|>)'
-            for match in re.finditer(attr_pattern, line):
+            for match in _VALUELESS_ATTR_RE.finditer(line):
                 prefix = match.group(1)
                 attr = match.group(2)
                 suffix = match.group(3)
                 
                 # Skip if this is actually valid HTML5 (boolean attributes are valid)
-                boolean_attrs = ['checked', 'selected', 'disabled', 'readonly', 'required', 'multiple', 'hidden', 'autofocus', 'novalidate', 'formnovalidate']
-                if attr.lower() in boolean_attrs:
+                if attr.lower() in _BOOLEAN_ATTRIBUTES:
                     continue
                 
                 # Skip if it's already a properly formatted attribute
-                if re.search(rf'{attr}\s*=\s*[\'"]', prefix) or re.search(rf'{attr}\s*=\s*[a-zA-Z0-9_]', prefix):
+                if _attr_assignment_re(attr).search(prefix):
                     continue
                 
                 # Fix by adding ="" to the attribute
@@ -2219,14 +2788,27 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        # Only images and form inputs are checked
+        if '<img' not in code and '<input' not in code:
+            return changes
         
-        for i, line in enumerate(lines):
-            # Fix missing alt attribute on images
-            img_pattern = r'<img\s+([^>]*)(?<!\salt=[\'"][^\'"]*[\'"])(?<!\salt=[^\s>]+)(/?)>'
-            for match in re.finditer(img_pattern, line):
+        lines = _split_lines(code)
+        line_starts = _line_starts(code)
+        input_ids = count(1)
+        
+        # Find img and input tags in a single pass and dispatch on which one matched
+        for match in _ACCESSIBILITY_TAG_RE.finditer(code):
+            i = _line_index(line_starts, match.start())
+            line = lines[i]
+            column = match.start() - line_starts[i]
+            
+            if match.lastgroup == 'img':
+                # Fix missing alt attribute on images
+                if _ALT_ATTR_RE.search(match.group('img_attrs')):
+                    continue
+                
                 # Add alt attribute
-                end_pos = match.end(1) + 1
+                end_pos = match.end('img_attrs') - line_starts[i] + 1
                 
                 change = FixChange(
                     description="Add alt attribute for accessibility",
@@ -2239,13 +2821,15 @@ class WebFixer(BaseFixer):
                     fix_type=FixType.SIMPLE
                 )
                 changes.append(change)
-            
-            # Fix missing labels for form inputs
-            input_pattern = r'<input\s+([^>]*?type=[\'"](?:text|password|email|number|tel|url)[\'"][^>]*)(?<!\sid=[\'"][^\'"]*[\'"])(?<!\sid=[^\s>]+)(/?)>'
-            for match in re.finditer(input_pattern, line):
-                # Generate a random ID for the input
-                input_id = f"input-{i}-{match.start()}"
-                end_pos = match.end(1) + 1
+            else:
+                # Fix missing labels for text-like form inputs without an id
+                attrs = match.group('input_attrs')
+                if not _TEXT_INPUT_TYPE_RE.search(attrs) or _ID_ATTR_RE.search(attrs):
+                    continue
+                
+                # Number the generated IDs in document order, so fixing the same code always gives the same IDs
+                input_id = f"input-{next(input_ids)}"
+                end_pos = match.end('input_attrs') - line_starts[i] + 1
                 
                 # Add id attribute
                 change = FixChange(
@@ -2261,21 +2845,20 @@ class WebFixer(BaseFixer):
                 changes.append(change)
                 
                 # Add a label before the input
-                indent = re.match(r'^(\s*)', line).group(1)
+                indent = _leading_ws(line)
                 label_text = "Input label"
                 
                 # Try to infer label from nearby attributes
-                attrs = match.group(1)
-                name_match = re.search(r'name=[\'"]([^\'"]*)[\'"]', attrs)
+                name_match = _NAME_ATTR_RE.search(attrs)
                 if name_match:
-                    label_text = name_match.group(1).replace('-', ' ').replace('_', ' ').title()
+                    label_text = name_match.group(1).translate(_WORD_SEPARATORS).title()
                 
                 label_change = FixChange(
                     description=f"Add label for input #{input_id}",
                     start_line=i + 1,
-                    start_column=match.start() + 1,
+                    start_column=column + 1,
                     end_line=i + 1,
-                    end_column=match.start() + 1,
+                    end_column=column + 1,
                     original_text="",
                     replacement_text=f'<label for="{input_id}">{label_text}:</label>\n{indent}',
                     fix_type=FixType.SIMPLE,
@@ -2297,43 +2880,52 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        # Both checks look at property declarations
+        if ':' not in code:
+            return changes
         
-        for i, line in enumerate(lines):
-            # Fix missing semicolons
-            rule_pattern = r'([a-zA-Z-]+\s*:\s*[^;{}]+)(\s*})'
-            for match in re.finditer(rule_pattern, line):
-                # Add semicolon
-                change = FixChange(
-                    description="Add missing semicolon in CSS rule",
-                    start_line=i + 1,
-                    start_column=match.end(1) + 1,
-                    end_line=i + 1,
-                    end_column=match.end(1) + 1,
-                    original_text="",
-                    replacement_text=";",
-                    fix_type=FixType.SIMPLE
-                )
-                changes.append(change)
+        # Run each pattern once over the whole document and map matches back to lines
+        line_starts = _line_starts(code)
+        
+        # Fix missing semicolons
+        for match in _CSS_UNTERMINATED_RULE_RE.finditer(code):
+            i = _line_index(line_starts, match.start())
+            column = match.end(1) - line_starts[i] + 1
             
-            # Fix invalid property names (with uppercase letters)
-            prop_pattern = r'([a-zA-Z-]*[A-Z][a-zA-Z-]*)\s*:'
-            for match in re.finditer(prop_pattern, line):
-                prop_name = match.group(1)
-                lowercase_prop = prop_name.lower()
-                
-                # Convert to lowercase
-                change = FixChange(
-                    description=f"Convert CSS property '{prop_name}' to lowercase",
-                    start_line=i + 1,
-                    start_column=match.start(1) + 1,
-                    end_line=i + 1,
-                    end_column=match.end(1) + 1,
-                    original_text=prop_name,
-                    replacement_text=lowercase_prop,
-                    fix_type=FixType.SIMPLE
-                )
-                changes.append(change)
+            # Add semicolon
+            change = FixChange(
+                description="Add missing semicolon in CSS rule",
+                start_line=i + 1,
+                start_column=column,
+                end_line=i + 1,
+                end_column=column,
+                original_text="",
+                replacement_text=";",
+                fix_type=FixType.SIMPLE
+            )
+            changes.append(change)
+        
+        # Fix invalid property names (with uppercase letters)
+        for match in _CSS_UPPER_PROPERTY_RE.finditer(code):
+            prop_name = match.group(1)
+            lowercase_prop = prop_name.lower()
+            i = _line_index(line_starts, match.start())
+            
+            # Convert to lowercase
+            change = FixChange(
+                description=f"Convert CSS property '{prop_name}' to lowercase",
+                start_line=i + 1,
+                start_column=match.start(1) - line_starts[i] + 1,
+                end_line=i + 1,
+                end_column=match.end(1) - line_starts[i] + 1,
+                original_text=prop_name,
+                replacement_text=lowercase_prop,
+                fix_type=FixType.SIMPLE
+            )
+            changes.append(change)
+        
+        # Keep the changes grouped by line (the sort is stable)
+        changes.sort(key=lambda change: change.start_line)
         
         return changes
     
@@ -2349,27 +2941,31 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        # Nothing to check without media queries
+        if '@media' not in code:
+            return changes
         
-        for i, line in enumerate(lines):
-            # Fix media queries without parentheses
-            media_pattern = r'(@media\s+)([a-zA-Z-]+)(\s*{)'
-            for match in re.finditer(media_pattern, line):
-                media_type = match.group(2)
+        line_starts = _line_starts(code)
+        
+        # Fix media queries without parentheses
+        for match in _MEDIA_TYPE_RE.finditer(code):
+            media_type = match.group(2)
+            
+            # For standard media types, add proper parentheses
+            if media_type in ['screen', 'print', 'all', 'speech']:
+                i = _line_index(line_starts, match.start())
                 
-                # For standard media types, add proper parentheses
-                if media_type in ['screen', 'print', 'all', 'speech']:
-                    change = FixChange(
-                        description=f"Fix media query syntax for '{media_type}'",
-                        start_line=i + 1,
-                        start_column=match.end(1) + 1,
-                        end_line=i + 1,
-                        end_column=match.end(2) + 1,
-                        original_text=media_type,
-                        replacement_text=f"all and ({media_type})",
-                        fix_type=FixType.SIMPLE
-                    )
-                    changes.append(change)
+                change = FixChange(
+                    description=f"Fix media query syntax for '{media_type}'",
+                    start_line=i + 1,
+                    start_column=match.end(1) - line_starts[i] + 1,
+                    end_line=i + 1,
+                    end_column=match.end(2) - line_starts[i] + 1,
+                    original_text=media_type,
+                    replacement_text=f"all and ({media_type})",
+                    fix_type=FixType.SIMPLE
+                )
+                changes.append(change)
         
         return changes
     
@@ -2386,67 +2982,47 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        # Find variable usages that might be undefined
-        lines = code.splitlines()
-        
-        # Collect all defined variables
-        defined_vars = set()
-        
-        # Look for variable declarations
-        var_pattern = r'\b(var|let|const|function|class)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)'
-        for line in lines:
-            for match in re.finditer(var_pattern, line):
-                defined_vars.add(match.group(2))
+        # Record declarations and buffer usages in a single pass, skipping usages on comment lines
+        line_starts = _line_starts(code)
+        comment_lines = _js_comment_lines(code)
         
-        # Add common globals
-        globals_js = {'window', 'document', 'console', 'setTimeout', 'setInterval', 'clearTimeout', 'clearInterval',
-                     'alert', 'confirm', 'prompt', 'location', 'navigator', 'history', 'Math', 'JSON', 'Date',
-                     'Array', 'Object', 'String', 'Number', 'Boolean', 'RegExp', 'Error', 'Map', 'Set', 'Promise',
-                     'Symbol', 'this', 'undefined', 'null', 'NaN', 'Infinity', 'isNaN', 'isFinite', 'eval',
-                     'encodeURI', 'decodeURI', 'encodeURIComponent', 'decodeURIComponent'}
+        defined_vars = set(_JS_GLOBALS)
+        usages = []
         
-        defined_vars.update(globals_js)
+        for match in _JS_DECLARATION_OR_USE_RE.finditer(code):
+            if match.lastgroup == 'decl':
+                defined_vars.add(match.group('decl'))
+            elif not comment_lines or _line_index(line_starts, match.start()) not in comment_lines:
+                usages.append(match.group('use'))
         
-        # Look for variable usages
-        for i, line in enumerate(lines):
-            # Skip comment lines
-            if line.strip().startswith('//') or line.strip().startswith('/*'):
+        for var_name in usages:
+            # Skip keywords and in operators
+            if var_name in _JS_KEYWORDS:
                 continue
             
-            # Find variable usages
-            usage_pattern = r'\b([a-zA-Z_$][a-zA-Z0-9_$]*)\b(?!\s*[:,\.]|[\(:])'
-            for match in re.finditer(usage_pattern, line):
-                var_name = match.group(1)
+            # Check if variable might be undefined
+            if var_name not in defined_vars:
+                # Suggest declaring the variable
+                if language == "typescript":
+                    declaration = f"let {var_name}: any; // TODO: Define variable"
+                else:
+                    declaration = f"let {var_name}; // TODO: Define variable"
                 
-                # Skip keywords and in operators
-                if var_name in {'if', 'else', 'for', 'while', 'switch', 'case', 'break', 'continue', 'return',
-                              'function', 'var', 'let', 'const', 'class', 'new', 'this', 'typeof', 'instanceof',
-                              'in', 'of', 'true', 'false', 'null', 'undefined', 'try', 'catch', 'finally'}:
-                    continue
+                change = FixChange(
+                    description=f"Declare potentially undefined variable '{var_name}'",
+                    start_line=1,
+                    start_column=1,
+                    end_line=1,
+                    end_column=1,
+                    original_text="",
+                    replacement_text=f"{declaration}\n",
+                    fix_type=FixType.COMPLEX,
+                    confidence=0.6  # Lower confidence since this is a heuristic
+                )
+                changes.append(change)
                 
-                # Check if variable might be undefined
-                if var_name not in defined_vars:
-                    # Suggest declaring the variable
-                    if language == "typescript":
-                        declaration = f"let {var_name}: any; // TODO: Define variable"
-                    else:
-                        declaration = f"let {var_name}; // TODO: Define variable"
-                    
-                    change = FixChange(
-                        description=f"Declare potentially undefined variable '{var_name}'",
-                        start_line=1,
-                        start_column=1,
-                        end_line=1,
-                        end_column=1,
-                        original_text="",
-                        replacement_text=f"{declaration}\n",
-                        fix_type=FixType.COMPLEX,
-                        confidence=0.6  # Lower confidence since this is a heuristic
-                    )
-                    changes.append(change)
-                    
-                    # Add to defined vars to avoid duplicate suggestions
-                    defined_vars.add(var_name)
+                # Add to defined vars to avoid duplicate suggestions
+                defined_vars.add(var_name)
         
         return changes
     
@@ -2463,54 +3039,58 @@ class WebFixer(BaseFixer):
         """
         changes = []
         
-        lines = code.splitlines()
+        lines = _split_lines(code)
+        line_starts = _line_starts(code)
+        comment_lines = _js_comment_lines(code)
         
-        for i, line in enumerate(lines):
+        # Collect the object names that are null-checked or guarded on each line
+        checked_by_line: Dict[int, Set[str]] = {}
+        for match in _JS_NULL_CHECK_RE.finditer(code):
+            i = _line_index(line_starts, match.start())
+            checked_by_line.setdefault(i, set()).add(match.group(1) or match.group(2))
+        
+        # Find potential null references (obj.prop without null check) in one pass over the document
+        for match in _JS_MEMBER_ACCESS_RE.finditer(code):
+            i = _line_index(line_starts, match.start())
+            
             # Skip comment lines
-            if line.strip().startswith('//') or line.strip().startswith('/*'):
+            if i in comment_lines:
                 continue
             
-            # Find potential null references (obj.prop without null check)
-            ref_pattern = r'(\b[a-zA-Z_$][a-zA-Z0-9_$]*)(\.)[a-zA-Z_$][a-zA-Z0-9_$]*\b'
-            for match in re.finditer(ref_pattern, line):
-                obj_name = match.group(1)
-                
-                # Skip references to common globals that shouldn't be null
-                if obj_name in {'window', 'document', 'console', 'Math', 'JSON', 'Object', 'Array', 'String'}:
-                    continue
-                
-                # Check if there's a null check already in this line or nearby
-                null_check_pattern = fr'(if\s*\(\s*{re.escape(obj_name)}\s*[!=]=|{re.escape(obj_name)}\s*(\?\.|&&))'
-                has_null_check = False
-                
-                # Check current line
-                if re.search(null_check_pattern, line):
-                    has_null_check = True
-                
-                # Check previous line
-                if i > 0 and re.search(null_check_pattern, lines[i-1]):
-                    has_null_check = True
+            line = lines[i]
+            column = match.start() - line_starts[i]
+            obj_name = match.group(1)
+            
+            # Skip references to common globals that shouldn't be null
+            if obj_name in _NON_NULL_GLOBALS:
+                continue
+            
+            # Check if there's a null check already in this line or the previous one
+            has_null_check = (
+                obj_name in checked_by_line.get(i, _NO_NAMES)
+                or obj_name in checked_by_line.get(i - 1, _NO_NAMES)
+            )
+            
+            if not has_null_check:
+                # Suggest adding a null check
+                if "?" in line:
+                    # Already using optional chaining (ES2020)?
+                    replacement_text = f"{obj_name}?."
+                else:
+                    replacement_text = f"{obj_name} && {obj_name}."
                 
-                if not has_null_check:
-                    # Suggest adding a null check
-                    if "?" in line:
-                        # Already using optional chaining (ES2020)?
-                        replacement_text = f"{obj_name}?."
-                    else:
-                        replacement_text = f"{obj_name} && {obj_name}."
-                    
-                    change = FixChange(
-                        description=f"Add null check for '{obj_name}'",
-                        start_line=i + 1,
-                        start_column=match.start(1) + 1,
-                        end_line=i + 1,
-                        end_column=match.end(2) + 1,
-                        original_text=f"{obj_name}.",
-                        replacement_text=replacement_text,
-                        fix_type=FixType.SIMPLE,
-                        confidence=0.7  # Lower confidence since this is a heuristic
-                    )
-                    changes.append(change)
+                change = FixChange(
+                    description=f"Add null check for '{obj_name}'",
+                    start_line=i + 1,
+                    start_column=column + 1,
+                    end_line=i + 1,
+                    end_column=match.end(2) - line_starts[i] + 1,
+                    original_text=f"{obj_name}.",
+                    replacement_text=replacement_text,
+                    fix_type=FixType.SIMPLE,
+                    confidence=0.7  # Lower confidence since this is a heuristic
+                )
+                changes.append(change)
         
         return changes
     
@@ -2524,7 +3104,7 @@ class WebFixer(BaseFixer):
         Returns:
             The re-indented code.
         """
-        lines = code.splitlines()
+        lines = _split_lines(code)
         result = []
         indent = 0
         indent_size = 2
@@ -2537,23 +3117,20 @@ class WebFixer(BaseFixer):
                 result.append('')
                 continue
             
+            # Classify the leading tag once: closing, opening, or none
+            tag_match = _LEADING_TAG_RE.match(stripped)
+            
             # Check for closing tags at the beginning
-            if stripped.startswith('</'):
+            if tag_match and tag_match.group(1):
                 indent -= 1
             
             # Add line with proper indentation
             result.append(' ' * (indent * indent_size) + stripped)
             
-            # Check for opening tags (that aren't self-closing)
-            if stripped.startswith('<') and not stripped.startswith('</') and not stripped.endswith('/>'):
-                # Check if it's a void element that doesn't need a closing tag
-                tag_match = re.match(r'<([a-zA-Z][a-zA-Z0-9]*)', stripped)
-                if tag_match:
-                    tag = tag_match.group(1).lower()
-                    void_elements = ['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr']
-                    
-                    if tag not in void_elements:
-                        indent += 1
+            # Check for opening tags (that aren't self-closing or void elements)
+            if (tag_match and not tag_match.group(1) and tag_match.group(2)
+                    and not stripped.endswith('/>') and tag_match.group(2).lower() not in _VOID_ELEMENTS):
+                indent += 1
             
             # Check for closing tag at the end
             if stripped.endswith('</'):
@@ -2571,15 +3148,9 @@ class WebFixer(BaseFixer):
         Returns:
             The reformatted code.
         """
-        # Basic formatter - insert proper spacing and line breaks
-        code = re.sub(r'\s*{\s*', ' {\n  ', code)
-        code = re.sub(r';\s*', ';\n  ', code)
-        code = re.sub(r'\s*}\s*', '\n}\n\n', code)
-        
-        # Remove excess new lines
-        code = re.sub(r'\n{3,}', '\n\n', code)
-        
-        return code
+        # Basic formatter - insert proper spacing and line breaks around braces and
+        # semicolons, and remove excess new lines, in a single substitution pass
+        return _CSS_FORMAT_RE.sub(_css_format_run, code)
     
     async def _get_llm_suggestions(self, code: str, issue: Dict[str, Any], language: str, 
                                  file_path: Optional[str] = None) -> List[FixChange]:
@@ -2607,14 +3178,15 @@ class WebFixer(BaseFixer):
             description = issue.get('description', '')
             line = issue.get('line', 0)
             
-            # Extract the relevant code
-            lines = code.splitlines()
-            
-            # Get context lines around the issue
+            # Get context lines around the issue by slicing the code between line offsets
+            line_starts = _line_starts(code)
             start_line = max(0, line - 5)
-            end_line = min(len(lines), line + 5)
+            end_line = min(len(line_starts), line + 5)
             
-            context_code = '\n'.join(lines[start_line:end_line])
+            if start_line < end_line:
+                context_code = code[line_starts[start_line]:_line_end(code, line_starts, end_line - 1)]
+            else:
+                context_code = ""
             
             # Construct the prompt for the LLM
             prompt = f"""I have a {language.upper()} code issue to fix. Here's the issue:
@@ -2645,8 +3217,8 @@ Return your response in JSON format:
 ```
 """
             
-            # Call the LLM to get a suggested fix
-            suggestion = await self.llm.suggest_refactoring(code, language, prompt)
+            # Call the LLM to get a suggested fix, reusing the answer to an identical request
+            suggestion = await self._cached_llm_suggestion(code, language, prompt)
             
             if suggestion.original_code and suggestion.refactored_code and suggestion.original_code != suggestion.refactored_code:
                 # Create a fix change
@@ -2655,7 +3227,10 @@ Return your response in JSON format:
                     start_line=line,
                     start_column=1,
                     end_line=line,
-                    end_column=len(lines[line - 1]) + 1 if 0 < line <= len(lines) else 1,
+                    end_column=(
+                        _line_end(code, line_starts, line - 1) - line_starts[line - 1] + 1
+                        if 0 < line <= len(line_starts) else 1
+                    ),
                     original_text=suggestion.original_code,
                     replacement_text=suggestion.refactored_code,
                     fix_type=FixType.LLM,
@@ -2667,6 +3242,39 @@ Return your response in JSON format:
             self.logger.warning(f"Error getting LLM suggestions: {str(e)}")
         
         return changes
+    
+    async def _cached_llm_suggestion(self, code: str, language: str, prompt: str) -> 'RefactorSuggestion':
+        """
+        Get a refactoring suggestion from the LLM, using a bounded LRU cache of earlier answers.
+        
+        Args:
+            code: The code sent along with the prompt.
+            language: The code language.
+            prompt: The issue prompt.
+        
+        Returns:
+            The RefactorSuggestion for the request.
+        """
+        key = (
+            language,
+            hashlib.blake2b(code.encode(), digest_size=16).digest(),
+            hashlib.blake2b(prompt.encode(), digest_size=16).digest()
+        )
+        
+        suggestion = self._llm_cache.get(key)
+        if suggestion is not None:
+            self._llm_cache.move_to_end(key)
+            return suggestion
+        
+        suggestion = await self.llm.suggest_refactoring(code, language, prompt)
+        
+        # Only keep usable answers, so failed requests are retried next time
+        if suggestion.refactored_code and self.llm_cache_size > 0:
+            self._llm_cache[key] = suggestion
+            if len(self._llm_cache) > self.llm_cache_size:
+                self._llm_cache.popitem(last=False)
+        
+        return suggestion
 
 
 if __name__ == "__main__":
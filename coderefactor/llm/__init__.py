@@ -8,6 +8,8 @@ This module provides interfaces for interacting with Claude via the Anthropic AP
 
 # Import the Claude API client
 from .claude_api import ClaudeAPI, LLMConfig, RefactorSuggestion, AnalysisResult
+from .cache import LLMCache, FileLLMCache, cache_key
+from .rate_limit import RateLimiter
 
 # Export the classes
 __all__ = [
@@ -15,4 +17,8 @@ __all__ = [
     'LLMConfig',
     'RefactorSuggestion',
     'AnalysisResult',
+    'LLMCache',
+    'FileLLMCache',
+    'cache_key',
+    'RateLimiter',
 ]
\ No newline at end of file
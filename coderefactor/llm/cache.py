@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Response Cache: Exact-match caching of Claude API responses.
+Part of the CodeRefactor project.
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+
+def cache_key(request: Dict[str, Any]) -> str:
+    """
+    Build the cache key for an API request body.
+    
+    The key covers everything sent to the model (model, messages, temperature, max_tokens,
+    system prompt), so two requests share a key only if they are byte-identical once
+    serialized with sorted keys.
+    
+    Args:
+        request: The JSON body of the messages request.
+    
+    Returns:
+        Hex SHA-256 digest of the canonical request body.
+    """
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """In-memory LRU cache of API responses with an optional time-to-live."""
+    
+    def __init__(self, max_size: int = 256, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of responses kept; the least recently used is evicted first.
+            ttl: Seconds a response stays valid, or None to keep it until evicted.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The cached response, or None on a miss or when the entry has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, response = entry
+            if expires is None or expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+            del self._entries[key]
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, key: str, response: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store a response.
+        
+        Args:
+            key: The cache key.
+            response: The API response to cache.
+            ttl: Optional override of the cache's time-to-live for this entry.
+        """
+        if self.max_size <= 0:
+            return
+        
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = (time.monotonic() + ttl if ttl is not None else None, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters and current size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class FileLLMCache(LLMCache):
+    """LLM cache that also persists responses as JSON files, so they survive between runs."""
+    
+    def __init__(self, directory: str, max_size: int = 256, ttl: Optional[float] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Directory the response files are stored in (created if missing).
+            max_size: Maximum number of responses kept in memory.
+            ttl: Seconds a response stays valid, or None to keep it indefinitely.
+            logger: Optional logger for I/O errors.
+        """
+        super().__init__(max_size, ttl)
+        self.directory = Path(os.path.expanduser(directory))
+        self.logger = logger or logging.getLogger("coderefactor.claude.cache")
+    
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response from memory, falling back to the response file.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The cached response, or None on a miss or when the entry has expired.
+        """
+        response = await super().get(key)
+        if response is not None:
+            return response
+        
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, self._read, key)
+        if response is not None:
+            # Count the disk hit instead of the in-memory miss, and keep it in memory from now on
+            self.misses -= 1
+            self.hits += 1
+            await super().set(key, response)
+        return response
+    
+    async def set(self, key: str, response: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store a response in memory and in its response file.
+        
+        Args:
+            key: The cache key.
+            response: The API response to cache.
+            ttl: Unused for the file copy, whose age is checked against the cache's ttl on read.
+        """
+        await super().set(key, response, ttl)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, key, response)
+    
+    def clear(self) -> None:
+        """Remove all cached responses, including the response files."""
+        super().clear()
+        for path in self.directory.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError as e:
+                self.logger.warning("Could not remove cached response %s: %s", path, e)
+    
+    def _path(self, key: str) -> Path:
+        """Get the response file for a key."""
+        return self.directory / f"{key}.json"
+    
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read a response file, ignoring missing, expired or unreadable files."""
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                response = json.load(f)
+            if not isinstance(response, dict):
+                raise ValueError("not a JSON object")
+            return response
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not read cached response %s: %s", path, e)
+            return None
+    
+    def _write(self, key: str, response: Dict[str, Any]) -> None:
+        """Write a response file atomically, so concurrent readers never see a partial file."""
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(response, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning("Could not write cached response %s: %s", path, e)
@@ -7,16 +7,207 @@ Part of the CodeRefactor project.
 """
 
 import os
+import ast
+import sys
 import json
 import logging
-import time
-import re
-from typing import Dict, Any, List, Optional, Tuple, Union
-import httpx
-from dataclasses import dataclass, field, asdict
+import random
+import asyncio
+import importlib.util
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, List, Mapping, Optional, Tuple, Union
+from dataclasses import dataclass, field
 
+# httpx is imported on first use, so importing this module (e.g. for prompts) stays cheap
+if TYPE_CHECKING:
+    import httpx
 
-@dataclass
+# h2 enables HTTP/2 in httpx (pip install httpx[http2]); only probe for it, httpx imports it itself
+HAS_H2 = importlib.util.find_spec("h2") is not None
+
+# orjson parses and serializes request/response bodies faster than the json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from .cache import LLMCache, FileLLMCache, cache_key
+    from .rate_limit import RateLimiter
+except ImportError:
+    from cache import LLMCache, FileLLMCache, cache_key
+    from rate_limit import RateLimiter
+
+
+# Slotted dataclasses need Python 3.10+; older versions fall back to instance dicts
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Body codecs: orjson when installed, otherwise the json module (both accept str or bytes input)
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+_json_dumps = orjson.dumps if HAS_ORJSON else json.dumps
+
+_MESSAGES_URL = "https://api.anthropic.com/v1/messages"
+
+# Rate limited, server errors and overloaded: worth retrying after a pause
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504, 529})
+_MAX_RETRY_DELAY = 30.0
+
+# Static instructions sent ahead of every request of a kind. They never mention the code or its
+# language, so the provider can cache them as a prompt prefix and only process the suffix per call.
+_SYSTEM_PROMPT = "Think step-by-step about the code analysis problem before responding."
+
+_ANALYSIS_PREFIX = """You are a senior software engineer reviewing code. I would like you to analyze the code at the end of this message and identify potential issues, bugs, or improvements.
+
+Please provide your analysis in this JSON format:
+```json
+{
+  "issues": [
+    {
+      "title": "Issue title",
+      "description": "Detailed description of the issue",
+      "severity": "critical|high|medium|low",
+      "category": "security|performance|maintainability|complexity|style|error|other",
+      "line_numbers": [X, Y, Z],
+      "fixable": true|false,
+      "fix_difficulty": "simple|moderate|complex"
+    }
+  ],
+  "suggestions": [
+    {
+      "title": "Suggestion title",
+      "description": "Detailed description of the suggestion",
+      "before": "The relevant code snippet to be changed",
+      "after": "The improved code snippet",
+      "explanation": "Why this change is beneficial"
+    }
+  ],
+  "explanation": "A brief overall assessment of the code quality"
+}
+```
+
+Focus on the most important issues first. For each issue, provide concrete suggestions for how to fix it when possible."""
+
+_REFACTORING_PREFIX = """You are a senior software engineer helping refactor code. At the end of this message is some code that needs improvement, together with the issue that needs to be fixed.
+
+Please provide your refactoring suggestion in this JSON format:
+```json
+{
+  "refactored_code": "The entire refactored code",
+  "changes": [
+    {
+      "description": "Description of a specific change",
+      "before": "The relevant code snippet before change",
+      "after": "The relevant code snippet after change",
+      "line_numbers": [X, Y]
+    }
+  ],
+  "explanation": "A detailed explanation of the changes and why they address the issue",
+  "confidence": 0.9
+}
+```
+
+The refactored code should maintain the same functionality while addressing the issue. Only make changes that are necessary to fix the described issue."""
+
+_EXPLANATION_PREFIX = """You are a senior software engineer explaining code to a colleague. Please explain what the code at the end of this message does.
+
+Provide a clear and concise explanation of:
+1. The overall purpose of the code
+2. The main components or functions and what they do
+3. Any important algorithms or patterns being used
+4. Potential edge cases or limitations
+
+Keep your explanation technical but accessible to someone familiar with programming."""
+
+
+def _transport_errors() -> type:
+    """Get httpx's base class for connection and timeout errors, which are worth retrying."""
+    import httpx
+    return httpx.TransportError
+
+
+def _split_python_code(code: str, max_chars: int) -> List[Tuple[int, str]]:
+    """
+    Split Python code into chunks of whole top-level statements.
+    
+    Consecutive top-level definitions (with their decorators) are grouped until a chunk
+    would exceed max_chars; a single larger definition becomes a chunk of its own.
+    
+    Args:
+        code: The Python source
+        max_chars: Preferred maximum chunk length in characters
+    
+    Returns:
+        (first line number, chunk source) pairs in file order; the whole code as one
+        chunk if it does not parse
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return [(1, code)]
+    
+    lines = code.splitlines(keepends=True)
+    starts = [1]
+    for node in tree.body[1:]:
+        decorators = getattr(node, "decorator_list", None)
+        starts.append(min([node.lineno] + [d.lineno for d in decorators or ()]))
+    starts.append(len(lines) + 1)
+    
+    chunks = []
+    chunk_start = 1
+    chunk_len = 0
+    for start, end in zip(starts, starts[1:]):
+        block_len = sum(len(line) for line in lines[start - 1:end - 1])
+        if chunk_len and chunk_len + block_len > max_chars:
+            chunks.append((chunk_start, "".join(lines[chunk_start - 1:start - 1])))
+            chunk_start = start
+            chunk_len = 0
+        chunk_len += block_len
+    chunks.append((chunk_start, "".join(lines[chunk_start - 1:])))
+    return chunks
+
+
+def _extract_json(content: str) -> str:
+    """
+    Extract the JSON document from Claude's response text.
+    
+    Takes the body of the first ```json fence, or when there is no such fence, everything
+    from the first "{" to the last "}" so that prose or a bare fence around the JSON is
+    ignored.
+    
+    Args:
+        content: The text content of the response
+    
+    Returns:
+        The JSON text to parse
+    """
+    start = content.find("```json")
+    if start >= 0:
+        start += 7
+        end = content.find("```", start)
+        return content[start:end if end >= 0 else len(content)].strip()
+    
+    start = content.find("{")
+    end = content.rfind("}")
+    if 0 <= start < end:
+        return content[start:end + 1]
+    return content
+
+
+def _parse_response_json(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse the JSON document in the text of a messages API response.
+    
+    Args:
+        response: The API response
+    
+    Returns:
+        The parsed JSON object
+    """
+    content = response.get("content", [{"text": ""}])[0]["text"]
+    return _json_loads(_extract_json(content))
+
+
+@dataclass(**_SLOTS)
 class LLMConfig:
     """Configuration for the Claude API."""
     api_key: str = ""
@@ -25,9 +216,17 @@ class LLMConfig:
     temperature: float = 0.3
     max_tokens: int = 4000
     use_extended_thinking: bool = True
+    cache_size: int = 256  # Responses kept in the exact-match cache; 0 disables caching
+    cache_ttl: Optional[float] = 3600.0  # Seconds a cached response stays valid; None keeps it until evicted
+    cache_dir: Optional[str] = None  # Also persist cached responses in this directory
+    cache_all_temperatures: bool = False  # Cache sampled (temperature > 0) responses too, not just deterministic ones
+    requests_per_minute: int = 50  # Client-side request pacing; 0 disables it
+    http2: bool = True  # Multiplex concurrent requests over one connection (needs the h2 package)
+    max_retries: int = 3  # Retries of rate limited, overloaded or failed requests before giving up
+    chunk_size: int = 24000  # Python code longer than this (in characters) is analyzed in parallel chunks; 0 disables
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RefactorSuggestion:
     """Represents a code refactoring suggestion from the LLM."""
     original_code: str = ""
@@ -35,9 +234,9 @@ class RefactorSuggestion:
     changes: List[Dict[str, Any]] = field(default_factory=list)
     explanation: str = ""
     confidence: float = 0.0
-    
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Represents the result of an LLM code analysis."""
     issues: List[Dict[str, Any]] = field(default_factory=list)
@@ -48,7 +247,7 @@ class AnalysisResult:
 
 class ClaudeAPI:
     """Interface for interacting with Claude API for code analysis and refactoring."""
-
+    
     def __init__(self, config: LLMConfig = None, logger=None):
         """Initialize the Claude API interface."""
         self.config = config or LLMConfig()
@@ -57,9 +256,58 @@ class ClaudeAPI:
         if not self.config.api_key:
             # Try to get API key from environment
             self.config.api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-            
+        
         if not self.config.api_key:
             self.logger.warning("No Claude API key provided. API calls will fail.")
+        
+        # Exact-match cache of API responses
+        if self.config.cache_dir:
+            self.cache = FileLLMCache(self.config.cache_dir, self.config.cache_size, self.config.cache_ttl, self.logger)
+        else:
+            self.cache = LLMCache(self.config.cache_size, self.config.cache_ttl)
+        
+        # Paces requests below the account's rate limit, tightened by the API's rate limit headers
+        self.limiter = RateLimiter(self.config.requests_per_minute, 60.0)
+        
+        # Shared HTTP client, created on first use so connections are kept alive across calls
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def __aenter__(self) -> "ClaudeAPI":
+        """Enter an async context that closes the HTTP client on exit."""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the HTTP client when leaving the async context."""
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+    
+    def _get_client(self) -> "httpx.AsyncClient":
+        """
+        Get the shared HTTP client for the running event loop.
+        
+        Pooled connections belong to the loop that opened them, so callers that run each
+        request in a fresh event loop get a fresh client instead of a stale pool.
+        
+        Returns:
+            The pooled httpx.AsyncClient.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            import httpx
+            
+            self._client = httpx.AsyncClient(
+                http2=self.config.http2 and HAS_H2,
+                timeout=self.config.timeout,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=60.0)
+            )
+            self._client_loop = loop
+        return self._client
     
     async def analyze_code(self, code: str, language: str, specific_concerns: List[str] = None) -> AnalysisResult:
         """
@@ -73,25 +321,110 @@ class ClaudeAPI:
         Returns:
             AnalysisResult containing identified issues and suggestions
         """
-        self.logger.info(f"Analyzing {language} code with Claude")
+        self.logger.info("Analyzing %s code with Claude", language)
         
+        if self.config.chunk_size > 0 and len(code) > self.config.chunk_size and language.lower() == "python":
+            chunks = _split_python_code(code, self.config.chunk_size)
+            if len(chunks) > 1:
+                return await self._analyze_chunks(chunks, language, specific_concerns)
+        
+        return await self._analyze_single(code, language, specific_concerns)
+    
+    async def _analyze_single(self, code: str, language: str, specific_concerns: List[str] = None) -> AnalysisResult:
+        """Analyze code in a single request."""
         try:
             # Build the prompt
             prompt = self._build_analysis_prompt(code, language, specific_concerns)
             
             # Call the API
-            response = await self._call_claude_api(prompt)
+            response = await self._call_claude_api(prompt, prefix=_ANALYSIS_PREFIX)
             
             if not response:
                 return AnalysisResult(error="Failed to get response from Claude API")
             
             # Parse the analysis results
             return self._parse_analysis_response(response, code)
-            
+        
         except Exception as e:
-            self.logger.error(f"Error analyzing code with Claude: {str(e)}")
+            self.logger.error("Error analyzing code with Claude: %s", e)
             return AnalysisResult(error=str(e))
     
+    async def _analyze_chunks(self, chunks: List[Tuple[int, str]], language: str,
+                              specific_concerns: List[str] = None) -> AnalysisResult:
+        """
+        Analyze chunks of a file concurrently and merge the results.
+        
+        Args:
+            chunks: (first line number, code) pairs covering the file
+            language: The programming language
+            specific_concerns: Optional list of specific concerns to focus on
+        
+        Returns:
+            AnalysisResult with the issues of all chunks, numbered by file line
+        """
+        self.logger.info("Splitting %s code into %d chunks for analysis", language, len(chunks))
+        concerns = list(specific_concerns or []) + [
+            "This code is one part of a larger file; names imported or defined in other parts are not errors"
+        ]
+        results = await asyncio.gather(
+            *(self._analyze_single(chunk, language, concerns) for _, chunk in chunks)
+        )
+        
+        merged = AnalysisResult()
+        explanations = []
+        errors = []
+        for (first_line, _), result in zip(chunks, results):
+            if result.error:
+                errors.append(f"lines {first_line}+: {result.error}")
+                continue
+            
+            # Line numbers in a chunk's issues are relative to the chunk
+            for issue in result.issues:
+                line_numbers = issue.get("line_numbers")
+                if isinstance(line_numbers, list):
+                    issue["line_numbers"] = [
+                        line + first_line - 1 if isinstance(line, int) else line
+                        for line in line_numbers
+                    ]
+                merged.issues.append(issue)
+            merged.suggestions.extend(result.suggestions)
+            if result.explanation:
+                explanations.append(result.explanation)
+        
+        merged.explanation = "\n\n".join(explanations)
+        if errors:
+            if len(errors) == len(chunks):
+                merged.error = "; ".join(errors)
+            else:
+                self.logger.warning("Analysis failed for some chunks: %s", "; ".join(errors))
+        return merged
+    
+    async def analyze_many(self, items: List[Tuple[str, str]], concurrency: int = 8) -> List[AnalysisResult]:
+        """
+        Analyze several pieces of code concurrently.
+        
+        Args:
+            items: (code, language) pairs to analyze
+            concurrency: Maximum number of requests in flight at once
+        
+        Returns:
+            One AnalysisResult per item, in the same order as the items
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def analyze_one(code: str, language: str) -> AnalysisResult:
+            async with semaphore:
+                return await self.analyze_code(code, language)
+        
+        results = await asyncio.gather(
+            *(analyze_one(code, language) for code, language in items),
+            return_exceptions=True
+        )
+        return [
+            AnalysisResult(error=str(result)) if isinstance(result, Exception) else result
+            for result in results
+        ]
+    
     async def suggest_refactoring(self, code: str, language: str, issue_description: str) -> RefactorSuggestion:
         """
         Suggest a refactoring for a specific issue in the code.
@@ -104,14 +437,14 @@ class ClaudeAPI:
         Returns:
             RefactorSuggestion with the suggested changes
         """
-        self.logger.info(f"Requesting refactoring suggestion for {language} code")
+        self.logger.info("Requesting refactoring suggestion for %s code", language)
         
         try:
             # Build the prompt
             prompt = self._build_refactoring_prompt(code, language, issue_description)
             
             # Call the API
-            response = await self._call_claude_api(prompt)
+            response = await self._call_claude_api(prompt, prefix=_REFACTORING_PREFIX)
             
             if not response:
                 return RefactorSuggestion(
@@ -121,9 +454,9 @@ class ClaudeAPI:
             
             # Parse the refactoring suggestion
             return self._parse_refactoring_response(response, code)
-            
+        
         except Exception as e:
-            self.logger.error(f"Error getting refactoring suggestion: {str(e)}")
+            self.logger.error("Error getting refactoring suggestion: %s", e)
             return RefactorSuggestion(
                 original_code=code,
                 explanation=f"Error: {str(e)}"
@@ -140,32 +473,57 @@ class ClaudeAPI:
         Returns:
             String containing the explanation
         """
-        self.logger.info(f"Requesting code explanation for {language} code")
+        self.logger.info("Requesting code explanation for %s code", language)
         
         try:
             # Build the prompt
             prompt = self._build_explanation_prompt(code, language)
             
             # Call the API
-            response = await self._call_claude_api(prompt, max_tokens=1000)
+            response = await self._call_claude_api(prompt, max_tokens=1000, prefix=_EXPLANATION_PREFIX)
             
             if not response:
                 return "Failed to get explanation from Claude API"
             
             # Extract the explanation text
             return response.get("content", [{"text": "No explanation provided"}])[0]["text"]
-            
+        
         except Exception as e:
-            self.logger.error(f"Error getting code explanation: {str(e)}")
+            self.logger.error("Error getting code explanation: %s", e)
             return f"Error: {str(e)}"
-
-    async def _call_claude_api(self, prompt: str, max_tokens: Optional[int] = None) -> Dict[str, Any]:
+    
+    async def explain_code_stream(self, code: str, language: str) -> AsyncIterator[str]:
+        """
+        Stream an explanation of what the code does, yielding text as Claude produces it.
+        
+        Args:
+            code: The code to explain
+            language: The programming language
+        
+        Yields:
+            Successive fragments of the explanation
+        """
+        self.logger.info("Streaming code explanation for %s code", language)
+        
+        prompt = self._build_explanation_prompt(code, language)
+        received = False
+        async for text in self._call_claude_api_stream(prompt, max_tokens=1000, prefix=_EXPLANATION_PREFIX):
+            received = True
+            yield text
+        
+        if not received:
+            yield "Failed to get explanation from Claude API"
+    
+    async def _call_claude_api(self, prompt: str, max_tokens: Optional[int] = None,
+                               prefix: Optional[str] = None) -> Dict[str, Any]:
         """
         Call the Claude API with the given prompt.
         
         Args:
             prompt: The prompt to send to Claude
             max_tokens: Optional override for max response tokens
+            prefix: Optional static instructions sent before the prompt and marked as a
+                prompt-cache breakpoint, so repeated requests reuse the processed prefix
         
         Returns:
             The API response as a dictionary
@@ -175,145 +533,215 @@ class ClaudeAPI:
             return {}
         
         try:
-            headers = {
-                "x-api-key": self.config.api_key,
-                "anthropic-version": "2023-06-01",
-                "content-type": "application/json"
-            }
-            
-            data = {
-                "model": self.config.model,
-                "max_tokens": max_tokens or self.config.max_tokens,
-                "temperature": self.config.temperature,
-                "messages": [
-                    {"role": "user", "content": prompt}
-                ]
-            }
+            headers, data = self._build_request(prompt, max_tokens, prefix)
             
-            # Add extended thinking if enabled
-            if self.config.use_extended_thinking:
-                data["system"] = "Think step-by-step about the code analysis problem before responding."
+            # Serve byte-identical requests from the cache; sampled responses are only cached when opted in
+            key = None
+            if self.config.cache_size > 0 and (data["temperature"] == 0 or self.config.cache_all_temperatures):
+                key = cache_key(data)
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    return cached
             
-            async with httpx.AsyncClient(timeout=self.config.timeout) as client:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=headers,
-                    json=data
-                )
-                
-                if response.status_code != 200:
-                    self.logger.error(f"Claude API error: {response.status_code} - {response.text}")
-                    return {}
-                
-                return response.json()
+            body = _json_dumps(data)
+            for attempt in range(self.config.max_retries + 1):
+                retries_left = attempt < self.config.max_retries
+                try:
+                    async with self.limiter:
+                        response = await self._get_client().post(_MESSAGES_URL, headers=headers, content=body)
+                except _transport_errors() as e:
+                    if not retries_left:
+                        raise
+                    await self._wait_before_retry(attempt, str(e) or type(e).__name__)
+                    continue
                 
+                self.limiter.update_from_headers(response.headers)
+                if response.status_code in _RETRYABLE_STATUS and retries_left:
+                    await self._wait_before_retry(attempt, response.status_code, response.headers)
+                    continue
+                break
+            
+            if response.status_code != 200:
+                self.logger.error("Claude API error: %s - %s", response.status_code, response.text)
+                return {}
+            
+            result = _json_loads(response.content)
+            if key is not None:
+                await self.cache.set(key, result)
+            
+            return result
+        
         except Exception as e:
-            self.logger.error(f"Error calling Claude API: {str(e)}")
+            self.logger.error("Error calling Claude API: %s", e)
             return {}
     
+    async def _call_claude_api_stream(self, prompt: str, max_tokens: Optional[int] = None,
+                                      prefix: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Call the Claude API with streaming enabled and yield the response text as it arrives.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            max_tokens: Optional override for max response tokens
+            prefix: Optional cacheable static instructions sent before the prompt
+        
+        Yields:
+            Text fragments of the response, in order
+        """
+        if not self.config.api_key:
+            self.logger.error("Cannot call Claude API: No API key provided")
+            return
+        
+        try:
+            headers, data = self._build_request(prompt, max_tokens, prefix)
+            data["stream"] = True
+            
+            body = _json_dumps(data)
+            
+            # Retries are only possible until the first text has been yielded
+            for attempt in range(self.config.max_retries + 1):
+                retries_left = attempt < self.config.max_retries
+                received = False
+                await self.limiter.acquire()
+                try:
+                    async with self._get_client().stream("POST", _MESSAGES_URL, headers=headers, content=body) as response:
+                        self.limiter.update_from_headers(response.headers)
+                        if response.status_code in _RETRYABLE_STATUS and retries_left:
+                            await self._wait_before_retry(attempt, response.status_code, response.headers)
+                            continue
+                        if response.status_code != 200:
+                            error = await response.aread()
+                            self.logger.error("Claude API error: %s - %s", response.status_code, error.decode('utf-8', 'replace'))
+                            return
+                        
+                        # Server-sent events: only the "data:" lines carry the JSON payloads
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            event = _json_loads(line[5:])
+                            event_type = event.get("type")
+                            if event_type == "content_block_delta":
+                                delta = event.get("delta", {})
+                                if delta.get("type") == "text_delta":
+                                    received = True
+                                    yield delta.get("text", "")
+                            elif event_type == "error":
+                                self.logger.error("Claude API stream error: %s", event.get('error'))
+                                return
+                            elif event_type == "message_stop":
+                                return
+                        return
+                except _transport_errors() as e:
+                    if received or not retries_left:
+                        raise
+                    await self._wait_before_retry(attempt, str(e) or type(e).__name__)
+        
+        except Exception as e:
+            self.logger.error("Error streaming from Claude API: %s", e)
+    
+    async def _wait_before_retry(self, attempt: int, reason: Any, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Sleep before retrying a failed request.
+        
+        Honors the server's retry-after header; otherwise backs off exponentially with jitter.
+        
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            reason: Status code or error that caused the retry, for the log
+            headers: Response headers of the failed attempt, if there was a response
+        """
+        delay = None
+        if headers is not None and "retry-after" in headers:
+            try:
+                delay = float(headers["retry-after"])
+            except ValueError:
+                pass
+        if delay is None:
+            delay = min(2 ** attempt + random.random(), _MAX_RETRY_DELAY)
+        
+        self.logger.warning("Claude API request failed (%s), retrying in %.1fs (attempt %d of %d)",
+                            reason, delay, attempt + 1, self.config.max_retries)
+        await asyncio.sleep(delay)
+    
+    def _build_request(self, prompt: str, max_tokens: Optional[int] = None,
+                       prefix: Optional[str] = None) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build the headers and JSON body of a messages request.
+        
+        Args:
+            prompt: The prompt to send to Claude
+            max_tokens: Optional override for max response tokens
+            prefix: Optional cacheable static instructions sent before the prompt
+        
+        Returns:
+            Tuple of (headers, request body)
+        """
+        headers = {
+            "x-api-key": self.config.api_key,
+            "anthropic-version": "2023-06-01",
+            "anthropic-beta": "prompt-caching-2024-07-31",
+            "content-type": "application/json"
+        }
+        
+        content: Union[str, List[Dict[str, Any]]] = prompt
+        if prefix:
+            content = [
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ]
+        
+        data = {
+            "model": self.config.model,
+            "max_tokens": max_tokens or self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": [
+                {"role": "user", "content": content}
+            ]
+        }
+        
+        # Add extended thinking if enabled
+        if self.config.use_extended_thinking:
+            data["system"] = [{"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+        
+        return headers, data
+    
     def _build_analysis_prompt(self, code: str, language: str, specific_concerns: List[str] = None) -> str:
-        """Build a prompt for code analysis."""
+        """Build the request-specific part of a code analysis prompt (follows _ANALYSIS_PREFIX)."""
         concerns_text = ""
         if specific_concerns:
-            concerns_text = "Pay special attention to these specific concerns:\n" + "\n".join(f"- {concern}" for concern in specific_concerns)
+            concerns_text = "\n\nPay special attention to these specific concerns:\n" + "\n".join(f"- {concern}" for concern in specific_concerns)
         
-        return f"""You are a senior software engineer reviewing code. I would like you to analyze this {language} code and identify potential issues, bugs, or improvements.
+        return f"""Here is the {language} code to analyze:
 
 ```{language}
 {code}
-```
-
-Please provide your analysis in this JSON format:
-```json
-{{
-  "issues": [
-    {{
-      "title": "Issue title",
-      "description": "Detailed description of the issue",
-      "severity": "critical|high|medium|low",
-      "category": "security|performance|maintainability|complexity|style|error|other",
-      "line_numbers": [X, Y, Z],
-      "fixable": true|false,
-      "fix_difficulty": "simple|moderate|complex"
-    }}
-  ],
-  "suggestions": [
-    {{
-      "title": "Suggestion title",
-      "description": "Detailed description of the suggestion",
-      "before": "The relevant code snippet to be changed",
-      "after": "The improved code snippet",
-      "explanation": "Why this change is beneficial"
-    }}
-  ],
-  "explanation": "A brief overall assessment of the code quality"
-}}
-```
-
-{concerns_text}
-
-Focus on the most important issues first. For each issue, provide concrete suggestions for how to fix it when possible.
+```{concerns_text}
 """
-
+    
     def _build_refactoring_prompt(self, code: str, language: str, issue_description: str) -> str:
-        """Build a prompt for code refactoring."""
-        return f"""You are a senior software engineer helping refactor code. I have the following {language} code that needs improvement:
+        """Build the request-specific part of a code refactoring prompt (follows _REFACTORING_PREFIX)."""
+        return f"""The issue that needs to be fixed is: {issue_description}
+
+Here is the {language} code that needs improvement:
 
 ```{language}
 {code}
 ```
-
-The issue that needs to be fixed is: {issue_description}
-
-Please provide your refactoring suggestion in this JSON format:
-```json
-{{
-  "refactored_code": "The entire refactored code",
-  "changes": [
-    {{
-      "description": "Description of a specific change",
-      "before": "The relevant code snippet before change",
-      "after": "The relevant code snippet after change",
-      "line_numbers": [X, Y]
-    }}
-  ],
-  "explanation": "A detailed explanation of the changes and why they address the issue",
-  "confidence": 0.9
-}}
-```
-
-The refactored code should maintain the same functionality while addressing the issue. Only make changes that are necessary to fix the described issue.
 """
-
+    
     def _build_explanation_prompt(self, code: str, language: str) -> str:
-        """Build a prompt for code explanation."""
-        return f"""You are a senior software engineer explaining code to a colleague. Please explain what this {language} code does:
+        """Build the request-specific part of a code explanation prompt (follows _EXPLANATION_PREFIX)."""
+        return f"""Here is the {language} code to explain:
 
 ```{language}
 {code}
 ```
-
-Provide a clear and concise explanation of:
-1. The overall purpose of the code
-2. The main components or functions and what they do
-3. Any important algorithms or patterns being used
-4. Potential edge cases or limitations
-
-Keep your explanation technical but accessible to someone familiar with programming.
 """
-
+    
     def _parse_analysis_response(self, response: Dict[str, Any], original_code: str) -> AnalysisResult:
         """Parse the response from the code analysis API call."""
         try:
-            # Extract the text content from the response
-            content = response.get("content", [{"text": ""}])[0]["text"]
-            
-            # Extract JSON from the content (it might be wrapped in ```json blocks)
-            json_match = re.search(r"```json\s*([\s\S]*?)\s*```", content)
-            json_str = json_match.group(1) if json_match else content
-            
-            # Parse JSON
-            result_data = json.loads(json_str)
+            result_data = _parse_response_json(response)
             
             # Create AnalysisResult object
             result = AnalysisResult(
@@ -338,23 +766,15 @@ Keep your explanation technical but accessible to someone familiar with programm
                 result.suggestions.append(suggestion)
             
             return result
-            
+        
         except Exception as e:
-            self.logger.error(f"Error parsing analysis response: {str(e)}")
+            self.logger.error("Error parsing analysis response: %s", e)
             return AnalysisResult(error=f"Failed to parse response: {str(e)}")
     
     def _parse_refactoring_response(self, response: Dict[str, Any], original_code: str) -> RefactorSuggestion:
         """Parse the response from the refactoring API call."""
         try:
-            # Extract the text content from the response
-            content = response.get("content", [{"text": ""}])[0]["text"]
-            
-            # Extract JSON from the content (it might be wrapped in ```json blocks)
-            json_match = re.search(r"```json\s*([\s\S]*?)\s*```", content)
-            json_str = json_match.group(1) if json_match else content
-            
-            # Parse JSON
-            result_data = json.loads(json_str)
+            result_data = _parse_response_json(response)
             
             # Create RefactorSuggestion object
             suggestion = RefactorSuggestion(
@@ -366,9 +786,9 @@ Keep your explanation technical but accessible to someone familiar with programm
             )
             
             return suggestion
-            
+        
         except Exception as e:
-            self.logger.error(f"Error parsing refactoring response: {str(e)}")
+            self.logger.error("Error parsing refactoring response: %s", e)
             return RefactorSuggestion(
                 original_code=original_code,
                 explanation=f"Failed to parse response: {str(e)}"
@@ -377,9 +797,6 @@ Keep your explanation technical but accessible to someone familiar with programm
 
 # Simple CLI test if run directly
 if __name__ == "__main__":
-    import asyncio
-    import sys
-    
     async def main():
         # Setup logging
         logging.basicConfig(
@@ -393,10 +810,6 @@ if __name__ == "__main__":
             print("Error: ANTHROPIC_API_KEY environment variable not set")
             sys.exit(1)
         
-        # Create Claude API client
-        config = LLMConfig(api_key=api_key)
-        claude = ClaudeAPI(config)
-        
         # Test code to analyze
         test_code = """
 def calculate_average(numbers):
@@ -406,23 +819,31 @@ def calculate_average(numbers):
     return total / len(numbers)
         """
         
-        # Get analysis
-        result = await claude.analyze_code(test_code, "python")
-        
-        # Print results
-        print("\nAnalysis Result:")
-        print(f"Overall assessment: {result.explanation}")
-        print("\nIssues:")
-        for issue in result.issues:
-            print(f"- {issue['title']} (Severity: {issue['severity']})")
-            print(f"  {issue['description']}")
-        
-        print("\nSuggestions:")
-        for suggestion in result.suggestions:
-            print(f"- {suggestion.changes[0]['description'] if suggestion.changes else 'Suggestion'}")
-            print(f"  Before: {suggestion.original_code}")
-            print(f"  After: {suggestion.refactored_code}")
-            print(f"  Explanation: {suggestion.explanation}")
+        # Create Claude API client and get analysis
+        config = LLMConfig(api_key=api_key)
+        async with ClaudeAPI(config) as claude:
+            result = await claude.analyze_code(test_code, "python")
+            
+            # Print results
+            print("\nAnalysis Result:")
+            print(f"Overall assessment: {result.explanation}")
+            print("\nIssues:")
+            for issue in result.issues:
+                print(f"- {issue['title']} (Severity: {issue['severity']})")
+                print(f"  {issue['description']}")
+            
+            print("\nSuggestions:")
+            for suggestion in result.suggestions:
+                print(f"- {suggestion.changes[0]['description'] if suggestion.changes else 'Suggestion'}")
+                print(f"  Before: {suggestion.original_code}")
+                print(f"  After: {suggestion.refactored_code}")
+                print(f"  Explanation: {suggestion.explanation}")
+            
+            # Stream the explanation so the first words show up as soon as Claude produces them
+            print("\nExplanation:")
+            async for text in claude.explain_code_stream(test_code, "python"):
+                print(text, end="", flush=True)
+            print()
     
     # Run the async main function
     asyncio.run(main())
\ No newline at end of file
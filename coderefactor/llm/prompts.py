@@ -6,18 +6,14 @@ LLM Prompts: Prompt templates for Claude API interactions.
 These prompts are used to guide Claude for code analysis and refactoring tasks.
 """
 
-# Analysis prompt template
-CODE_ANALYSIS_PROMPT = """You are a senior software engineer reviewing code. I would like you to analyze this {language} code and identify potential issues, bugs, or improvements.
-
-```{language}
-{code}
-```
+# Analysis prompt: static prefix (cacheable across requests) and per-request suffix
+ANALYSIS_PREFIX = """You are a senior software engineer reviewing code. I would like you to analyze the code at the end of this message and identify potential issues, bugs, or improvements.
 
 Please provide your analysis in this JSON format:
 ```json
-{{
+{
   "issues": [
-    {{
+    {
       "title": "Issue title",
       "description": "Detailed description of the issue",
       "severity": "critical|error|warning|info",
@@ -25,61 +21,47 @@ Please provide your analysis in this JSON format:
       "line_numbers": [X, Y, Z],
       "fixable": true|false,
       "fix_difficulty": "simple|moderate|complex"
-    }}
+    }
   ],
   "suggestions": [
-    {{
+    {
       "title": "Suggestion title",
       "description": "Detailed description of the suggestion",
       "before": "The relevant code snippet to be changed",
       "after": "The improved code snippet",
       "explanation": "Why this change is beneficial"
-    }}
+    }
   ],
   "explanation": "A brief overall assessment of the code quality"
-}}
+}
 ```
 
-{specific_concerns}
-
-Focus on the most important issues first. For each issue, provide concrete suggestions for how to fix it when possible.
-"""
-
-# Refactoring prompt template
-CODE_REFACTORING_PROMPT = """You are a senior software engineer helping refactor code. I have the following {language} code that needs improvement:
+Focus on the most important issues first. For each issue, provide concrete suggestions for how to fix it when possible."""
 
-```{language}
-{code}
-```
-
-The issue that needs to be fixed is: {issue_description}
+# Refactoring prompt: static prefix and per-request suffix
+REFACTORING_PREFIX = """You are a senior software engineer helping refactor code. At the end of this message is some code that needs improvement, together with the issue that needs to be fixed.
 
 Please provide your refactoring suggestion in this JSON format:
 ```json
-{{
+{
   "refactored_code": "The entire refactored code",
   "changes": [
-    {{
+    {
       "description": "Description of a specific change",
       "before": "The relevant code snippet before change",
       "after": "The relevant code snippet after change",
       "line_numbers": [X, Y]
-    }}
+    }
   ],
   "explanation": "A detailed explanation of the changes and why they address the issue",
   "confidence": 0.9
-}}
+}
 ```
 
-The refactored code should maintain the same functionality while addressing the issue. Only make changes that are necessary to fix the described issue.
-"""
-
-# Explanation prompt template
-CODE_EXPLANATION_PROMPT = """You are a senior software engineer explaining code to a colleague. Please explain what this {language} code does:
+The refactored code should maintain the same functionality while addressing the issue. Only make changes that are necessary to fix the described issue."""
 
-```{language}
-{code}
-```
+# Explanation prompt: static prefix and per-request suffix
+EXPLANATION_PREFIX = """You are a senior software engineer explaining code to a colleague. Please explain what the code at the end of this message does.
 
 Provide a clear and concise explanation of:
 1. The overall purpose of the code
@@ -87,7 +69,69 @@ Provide a clear and concise explanation of:
 3. Any important algorithms or patterns being used
 4. Potential edge cases or limitations
 
-Keep your explanation technical but accessible to someone familiar with programming.
+Keep your explanation technical but accessible to someone familiar with programming."""
+
+# Function to get the request-specific part of an analysis prompt
+def analysis_suffix(code: str, language: str, specific_concerns: str = "") -> str:
+    """
+    Generate the part of an analysis prompt that follows ANALYSIS_PREFIX.
+    
+    Args:
+        code: The code to analyze
+        language: The programming language
+        specific_concerns: Optional specific concerns to focus on
+        
+    Returns:
+        Formatted prompt suffix
+    """
+    return f"""Here is the {language} code to analyze:
+
+```{language}
+{code}
+```
+
+{specific_concerns}
+"""
+
+# Function to get the request-specific part of a refactoring prompt
+def refactoring_suffix(code: str, language: str, issue_description: str) -> str:
+    """
+    Generate the part of a refactoring prompt that follows REFACTORING_PREFIX.
+    
+    Args:
+        code: The code to refactor
+        language: The programming language
+        issue_description: Description of the issue to fix
+        
+    Returns:
+        Formatted prompt suffix
+    """
+    return f"""The issue that needs to be fixed is: {issue_description}
+
+Here is the {language} code that needs improvement:
+
+```{language}
+{code}
+```
+"""
+
+# Function to get the request-specific part of an explanation prompt
+def explanation_suffix(code: str, language: str) -> str:
+    """
+    Generate the part of an explanation prompt that follows EXPLANATION_PREFIX.
+    
+    Args:
+        code: The code to explain
+        language: The programming language
+        
+    Returns:
+        Formatted prompt suffix
+    """
+    return f"""Here is the {language} code to explain:
+
+```{language}
+{code}
+```
 """
 
 # Function to get an analysis prompt
@@ -103,11 +147,7 @@ def get_analysis_prompt(code: str, language: str, specific_concerns: str = "") -
     Returns:
         Formatted prompt string
     """
-    return CODE_ANALYSIS_PROMPT.format(
-        language=language,
-        code=code,
-        specific_concerns=specific_concerns
-    )
+    return f"{ANALYSIS_PREFIX}\n\n{analysis_suffix(code, language, specific_concerns)}"
 
 # Function to get a refactoring prompt
 def get_refactoring_prompt(code: str, language: str, issue_description: str) -> str:
@@ -122,11 +162,7 @@ def get_refactoring_prompt(code: str, language: str, issue_description: str) ->
     Returns:
         Formatted prompt string
     """
-    return CODE_REFACTORING_PROMPT.format(
-        language=language,
-        code=code,
-        issue_description=issue_description
-    )
+    return f"{REFACTORING_PREFIX}\n\n{refactoring_suffix(code, language, issue_description)}"
 
 # Function to get an explanation prompt
 def get_explanation_prompt(code: str, language: str) -> str:
@@ -140,7 +176,4 @@ def get_explanation_prompt(code: str, language: str) -> str:
     Returns:
         Formatted prompt string
     """
-    return CODE_EXPLANATION_PROMPT.format(
-        language=language,
-        code=code
-    )
+    return f"{EXPLANATION_PREFIX}\n\n{explanation_suffix(code, language)}"
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Rate Limiter: Client-side pacing of Claude API requests.
+Part of the CodeRefactor project.
+"""
+
+import time
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+from types import TracebackType
+from typing import Mapping, Optional, Type
+
+
+class RateLimiter:
+    """
+    Sliding-window limiter allowing at most max_requests requests per period seconds.
+    
+    Use it as an async context manager around each request. The limiter also reads the
+    API's rate limit response headers, so it tightens to the account's real limit and
+    waits out a window the server reports as exhausted instead of running into 429s.
+    """
+    
+    def __init__(self, max_requests: int, period: float = 60.0):
+        """
+        Initialize the limiter.
+        
+        Args:
+            max_requests: Requests allowed per period; 0 or less disables limiting.
+            period: Length of the sliding window in seconds.
+        """
+        self.max_requests = max_requests
+        self.period = period
+        self._sent: deque = deque()
+        self._blocked_until = 0.0
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then record it."""
+        if self.max_requests <= 0:
+            return
+        
+        while True:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                await asyncio.sleep(self._blocked_until - now)
+                continue
+            
+            window_start = now - self.period
+            while self._sent and self._sent[0] <= window_start:
+                self._sent.popleft()
+            
+            if len(self._sent) < self.max_requests:
+                self._sent.append(now)
+                return
+            
+            # Sleep until the oldest request leaves the window
+            await asyncio.sleep(self._sent[0] - window_start)
+    
+    async def __aenter__(self) -> "RateLimiter":
+        """Wait for a request slot."""
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException],
+                        tb: Optional[TracebackType]) -> None:
+        """Nothing to release; slots expire with the window."""
+        return None
+    
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adjust the limiter from an API response's rate limit headers.
+        
+        Args:
+            headers: Response headers (anthropic-ratelimit-requests-*, retry-after).
+        """
+        limit = _parse_int(headers.get("anthropic-ratelimit-requests-limit"))
+        if limit and limit < self.max_requests:
+            self.max_requests = limit
+        
+        delay = None
+        retry_after = headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                pass
+        elif _parse_int(headers.get("anthropic-ratelimit-requests-remaining")) == 0:
+            delay = _seconds_until(headers.get("anthropic-ratelimit-requests-reset"))
+        
+        if delay is not None and delay > 0:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + min(delay, self.period))
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """Parse an integer header value, returning None if it is missing or malformed."""
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _seconds_until(timestamp: Optional[str]) -> Optional[float]:
+    """Get the seconds from now until an RFC 3339 timestamp, or None if it can't be parsed."""
+    if not timestamp:
+        return None
+    try:
+        reset = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset.tzinfo is None:
+        reset = reset.replace(tzinfo=timezone.utc)
+    return (reset - datetime.now(timezone.utc)).total_seconds()
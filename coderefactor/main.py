@@ -7,15 +7,28 @@ CodeRefactor: Advanced Code Analysis & Refactoring Tool
 This is the main application entry point that integrates all components.
 """
 
+import io
 import os
 import sys
 import logging
 import argparse
 import json
+import re
+import html
 import tempfile
 import subprocess
+import threading
 import asyncio
-from typing import Dict, List, Any, Optional
+import copy
+import heapq
+import pickle
+import itertools
+import fnmatch
+import functools
+import operator
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Any, Callable, IO, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 import importlib.util
 import yaml
@@ -26,6 +39,13 @@ from python_analyzer import PythonAnalyzer
 from html_js_css_analyzer import WebTechAnalyzer
 from claude_api import ClaudeAPI, LLMConfig
 
+# orjson serializes JSON reports much faster than the json module
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Try importing C# analyzer (optional)
 try:
     import clr
@@ -35,6 +55,361 @@ except ImportError:
     HAS_CSHARP = False
 
 
+# Languages passed to the LLM, by file extension
+_LANGUAGE_MAP = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.html': 'html',
+    '.htm': 'html',
+    '.css': 'css',
+    '.scss': 'css',
+    '.less': 'css',
+    '.cs': 'csharp'
+}
+
+# File extensions handled by each analyzer
+_PYTHON_EXTENSIONS = frozenset({'.py'})
+_WEB_EXTENSIONS = frozenset({'.js', '.jsx', '.ts', '.tsx', '.html', '.htm', '.css', '.scss', '.less'})
+_CSHARP_EXTENSIONS = frozenset({'.cs', '.csx'})
+
+# Keys of an issue dictionary and the attributes they are read from
+_ISSUE_FIELDS = (
+    "id", "line", "column", "end_line", "end_column", "message", "description",
+    "severity", "category", "source", "rule_id", "fixable", "fix_type",
+    "code_snippet", "match_data"
+)
+_get_issue_fields = operator.attrgetter(*_ISSUE_FIELDS)
+
+# C# issues come from .NET objects with PascalCase properties and no match data
+_CSHARP_ISSUE_FIELDS = _ISSUE_FIELDS[:-1]
+_get_csharp_issue_fields = operator.attrgetter(
+    "Id", "Line", "Column", "EndLine", "EndColumn", "Message", "Description",
+    "Severity", "Category", "Source", "RuleId", "Fixable", "FixType", "CodeSnippet"
+)
+_get_enum_name = operator.attrgetter("name")
+
+
+def _issues_to_dicts(issues: Iterable[Any], csharp: bool = False) -> List[Dict[str, Any]]:
+    """
+    Convert analyzer issues to dictionaries for JSON serialization.
+    
+    Args:
+        issues: Issues reported by an analyzer.
+        csharp: Whether the issues come from the C# analyzer.
+    
+    Returns:
+        One dictionary per issue, with severity and category as lowercase names.
+    """
+    if csharp:
+        fields, get_fields, label = _CSHARP_ISSUE_FIELDS, _get_csharp_issue_fields, str
+    else:
+        fields, get_fields, label = _ISSUE_FIELDS, _get_issue_fields, _get_enum_name
+    
+    issue_dicts = [dict(zip(fields, get_fields(issue))) for issue in issues]
+    for issue_dict in issue_dicts:
+        issue_dict["severity"] = label(issue_dict["severity"]).lower()
+        issue_dict["category"] = label(issue_dict["category"]).lower()
+    return issue_dicts
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON indented by two spaces, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+# Opening of the HTML report, up to the report body; {timestamp} is filled in per report
+_HTML_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>CodeRefactor Analysis Report</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        h1, h2, h3 {
+            color: #2c3e50;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin-bottom: 20px;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 8px;
+            text-align: left;
+        }
+        th {
+            background-color: #f2f2f2;
+        }
+        tr:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        .issue-critical {
+            border-left: 5px solid #e74c3c;
+        }
+        .issue-error {
+            border-left: 5px solid #e67e22;
+        }
+        .issue-warning {
+            border-left: 5px solid #f1c40f;
+        }
+        .issue-info {
+            border-left: 5px solid #3498db;
+        }
+        .code-snippet {
+            background-color: #f8f8f8;
+            border: 1px solid #ddd;
+            border-radius: 3px;
+            padding: 10px;
+            overflow-x: auto;
+            font-family: Consolas, Monaco, 'Andale Mono', monospace;
+            font-size: 14px;
+            margin-top: 5px;
+        }
+        .suggestion {
+            background-color: #e8f4fc;
+            padding: 15px;
+            border-radius: 5px;
+            margin-bottom: 15px;
+        }
+        .summary-box {
+            background-color: #f8f9fa;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+        .file-summary {
+            cursor: pointer;
+            padding: 10px;
+            border: 1px solid #ddd;
+            margin-bottom: 5px;
+            border-radius: 3px;
+        }
+        .file-summary:hover {
+            background-color: #f5f5f5;
+        }
+        .hidden {
+            display: none;
+        }
+    </style>
+</head>
+<body>
+    <h1>CodeRefactor Analysis Report</h1>
+    <p>Generated on: {timestamp}</p>
+"""
+
+# Closing of the HTML report, with the script that expands and collapses file sections
+_HTML_REPORT_TAIL = """
+<script>
+    function toggleFile(fileId) {
+        const element = document.getElementById(fileId);
+        if (element.classList.contains('hidden')) {
+            element.classList.remove('hidden');
+        } else {
+            element.classList.add('hidden');
+        }
+    }
+</script>
+</body>
+</html>
+"""
+
+# Issue rows of the single file and directory HTML reports
+_HTML_ISSUE_ROW = """<tr class="issue-{severity}">
+                        <td>{severity_label}</td>
+                        <td>{location}</td>
+                        <td>{rule_id}</td>
+                        <td>
+                            <strong>{message}</strong>
+                            <p>{description}</p>
+                            {code_snippet}
+                        </td>
+                        <td>{fixable}</td>
+                    </tr>"""
+_HTML_CODE_SNIPPET = '<div class="code-snippet"><pre>{}</pre></div>'
+_HTML_FILE_ISSUE_ROW = """<tr class="issue-{severity}">
+                    <td>{severity_label}</td>
+                    <td>{location}</td>
+                    <td>{rule_id}</td>
+                    <td>
+                        <strong>{message}</strong>
+                        <p>{description}</p>
+                    </td>
+                </tr>"""
+
+
+# Rank of each severity in reports; unknown severities sort last
+_SEVERITY_ORDER = {"critical": 0, "error": 1, "warning": 2, "info": 3}
+
+
+def _issue_sort_key(issue: Dict[str, Any], _rank=_SEVERITY_ORDER.get) -> Tuple[int, int]:
+    """Sort key that orders issues by severity, then by line."""
+    return (_rank(issue["severity"], 99), issue["line"])
+
+
+@functools.lru_cache(maxsize=None)
+def _severity_row(template: str, severity: str) -> str:
+    """Fill the severity class and label into an issue row template, once per severity."""
+    return template.replace("{severity_label}", severity.upper()).replace("{severity}", severity)
+
+
+def _escape(value: Any) -> str:
+    """Escape a value for an HTML report; missing values (e.g. JSON null from the LLM) render empty."""
+    return html.escape("" if value is None else str(value))
+
+
+# Parsed configuration files by absolute path, with the mtime and size they were parsed at
+_config_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_CONFIG_CACHE_SIZE = 100
+
+
+def _load_config_file(config_path: str) -> Any:
+    """
+    Parse a YAML configuration file, reusing the parsed data while the file is unchanged.
+    
+    Args:
+        config_path: Path to the configuration file.
+    
+    Returns:
+        A private copy of the parsed data, safe for the caller to modify.
+    """
+    path = os.path.abspath(config_path)
+    stat = os.stat(path)
+    
+    entry = _config_cache.get(path)
+    if entry is None or entry[0] != stat.st_mtime_ns or entry[1] != stat.st_size:
+        with open(path, 'r') as f:
+            entry = (stat.st_mtime_ns, stat.st_size, yaml.safe_load(f))
+        _config_cache[path] = entry
+        while len(_config_cache) > _CONFIG_CACHE_SIZE:
+            _config_cache.popitem(last=False)
+    
+    _config_cache.move_to_end(path)
+    return copy.deepcopy(entry[2])
+
+
+@functools.lru_cache(maxsize=256)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Read a UTF-8 text file; the mtime and size only serve as part of the cache key."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _read_text(file_path: str) -> str:
+    """
+    Read a UTF-8 source file, reusing the text of an earlier read while the file is unchanged.
+    
+    Args:
+        file_path: Path to the file.
+    
+    Returns:
+        The file contents.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    return _read_text_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _iter_source_files(dir_path: str, recursive: bool, extensions: frozenset,
+                       name_filter: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    Find the files in a directory with one of the given extensions, in the order os.walk lists them.
+    
+    Uses os.scandir directly, so file types come from the directory listing without extra
+    stat calls, and subdirectories are never listed when recursive is False.
+    
+    Args:
+        dir_path: Directory to search.
+        recursive: Whether to descend into subdirectories (symlinked ones are not followed).
+        extensions: Lowercase file extensions to include, with the leading dot.
+        name_filter: Optional predicate that file names must satisfy.
+    
+    Yields:
+        Paths of the matching files.
+    """
+    pending = [dir_path]
+    while pending:
+        root = pending.pop()
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if is_dir:
+                        if recursive and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif (os.path.splitext(entry.name)[1].lower() in extensions and
+                          (name_filter is None or name_filter(entry.name))):
+                        files.append(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            continue
+        
+        yield from files
+        
+        # Visit subdirectories depth-first in listing order
+        pending.extend(reversed(subdirs))
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Analyzer results kept per application, for files that haven't changed since they were analyzed
+_ANALYSIS_CACHE_SIZE = 1024
+
+
+def _copy_file_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a file's analysis results deep enough that the copy's issues can be modified."""
+    copied = dict(result)
+    copied["issues"] = [dict(issue) for issue in result["issues"]]
+    copied["suggestions"] = list(result["suggestions"])
+    return copied
+
+
+# Per-process state for parallel directory analysis, set once by the pool initializer
+_worker_app = None
+_worker_loop = None
+
+
+def _init_directory_worker(app: "CodeRefactorApp") -> None:
+    """Store the application in the worker process so it is only sent once."""
+    global _worker_app, _worker_loop
+    _worker_app = app
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _analyze_file_in_worker(file_path: str) -> Dict[str, Any]:
+    """Analyze a single file inside a worker process."""
+    _worker_app.logger.info(f"Analyzing file: {file_path}")
+    return _worker_loop.run_until_complete(_worker_app.analyze_file_async(file_path))
+
+
 class CodeRefactorApp:
     """Main application class that integrates all analyzers and components."""
     
@@ -45,8 +420,16 @@ class CodeRefactorApp:
         # Load configuration
         self.config = self._load_config(config_path)
         
-        # Initialize analyzers
-        self._init_analyzers()
+        # Analyzer results by absolute path, with the mtime and size of the file they describe
+        self._analysis_cache: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+        
+        # Event loop the synchronous methods run their coroutines on, started on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        
+        # Runs the Python analyzer one file at a time: its in-process pylint and mypy runs aren't
+        # thread-safe, so only the LLM requests of concurrently analyzed files overlap
+        self._python_executor: Optional[ThreadPoolExecutor] = None
         
         # Initialize LLM if configured
         self._init_llm()
@@ -94,14 +477,17 @@ class CodeRefactorApp:
             "output": {
                 "format": "terminal",
                 "colored": True
+            },
+            "analysis": {
+                "max_workers": os.cpu_count() or 1,
+                "max_concurrency": 16
             }
         }
         
         if config_path:
             try:
-                with open(config_path, 'r') as f:
-                    file_config = yaml.safe_load(f)
-                    
+                file_config = _load_config_file(config_path)
+                
                 # Merge configurations
                 self._deep_merge(config, file_config)
                 
@@ -114,44 +500,70 @@ class CodeRefactorApp:
     
     def _deep_merge(self, base: Dict, update: Dict) -> None:
         """Deep merge two dictionaries."""
-        for key, value in update.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._deep_merge(base[key], value)
-            else:
-                base[key] = value
-    
-    def _init_analyzers(self):
-        """Initialize code analyzers based on configuration."""
-        # Initialize Python analyzer
-        if self.config["python"]["enabled"]:
-            self.python_analyzer = PythonAnalyzer(self.config["python"])
-            self.logger.info("Initialized Python analyzer")
-        else:
-            self.python_analyzer = None
-        
-        # Initialize Web Tech analyzer (JS/TS/HTML/CSS)
-        if (self.config["javascript"]["enabled"] or
-            self.config["typescript"]["enabled"] or
-            self.config["html"]["enabled"] or
-            self.config["css"]["enabled"]):
-            
-            web_config = {
-                "javascript": self.config["javascript"],
-                "typescript": self.config["typescript"],
-                "html": self.config["html"],
-                "css": self.config["css"]
-            }
-            self.web_analyzer = WebTechAnalyzer(web_config)
-            self.logger.info("Initialized Web Technologies analyzer")
-        else:
-            self.web_analyzer = None
+        stack = [(base, update)]
+        while stack:
+            base, update = stack.pop()
+            
+            # Merge nested dictionaries level by level, and replace everything else in one update
+            leaves = {}
+            for key, value in update.items():
+                if isinstance(value, dict) and isinstance(base.get(key), dict):
+                    stack.append((base[key], value))
+                else:
+                    leaves[key] = value
+            base.update(leaves)
+    
+    # Analyzers are created on first use, so a scan only pays for the languages it touches
+    @functools.cached_property
+    def python_analyzer(self) -> Optional[PythonAnalyzer]:
+        """The Python analyzer, or None if Python analysis is disabled."""
+        if not self._python_enabled():
+            return None
         
-        # Initialize C# analyzer
-        if self.config["csharp"]["enabled"] and HAS_CSHARP:
-            self.csharp_analyzer = CSharpAnalyzer(self.config["csharp"])
-            self.logger.info("Initialized C# analyzer")
-        else:
-            self.csharp_analyzer = None
+        analyzer = PythonAnalyzer(self.config["python"])
+        self.logger.info("Initialized Python analyzer")
+        return analyzer
+    
+    @functools.cached_property
+    def web_analyzer(self) -> Optional[WebTechAnalyzer]:
+        """The Web Tech analyzer (JS/TS/HTML/CSS), or None if all web languages are disabled."""
+        if not self._web_enabled():
+            return None
+        
+        web_config = {
+            "javascript": self.config["javascript"],
+            "typescript": self.config["typescript"],
+            "html": self.config["html"],
+            "css": self.config["css"]
+        }
+        analyzer = WebTechAnalyzer(web_config)
+        self.logger.info("Initialized Web Technologies analyzer")
+        return analyzer
+    
+    @functools.cached_property
+    def csharp_analyzer(self) -> Optional["CSharpAnalyzer"]:
+        """The C# analyzer, or None if C# analysis is disabled or unavailable."""
+        if not self._csharp_enabled():
+            return None
+        
+        analyzer = CSharpAnalyzer(self.config["csharp"])
+        self.logger.info("Initialized C# analyzer")
+        return analyzer
+    
+    def _python_enabled(self) -> bool:
+        """Check whether Python files are analyzed, without creating the analyzer."""
+        return bool(self.config["python"]["enabled"])
+    
+    def _web_enabled(self) -> bool:
+        """Check whether web files are analyzed, without creating the analyzer."""
+        return bool(self.config["javascript"]["enabled"] or
+                    self.config["typescript"]["enabled"] or
+                    self.config["html"]["enabled"] or
+                    self.config["css"]["enabled"])
+    
+    def _csharp_enabled(self) -> bool:
+        """Check whether C# files are analyzed, without creating the analyzer."""
+        return bool(self.config["csharp"]["enabled"] and HAS_CSHARP)
     
     def _init_llm(self):
         """Initialize LLM integration if enabled in config."""
@@ -176,12 +588,100 @@ class CodeRefactorApp:
         else:
             self.llm = None
     
+    def _run_async(self, coro: Any) -> Any:
+        """
+        Run a coroutine on the application's event loop and wait for its result.
+        
+        The loop runs in a background thread for the lifetime of the application, so the LLM
+        client and its pooled connections are reused across calls instead of being rebuilt
+        for a new loop every time.
+        
+        Args:
+            coro: The coroutine to run.
+        
+        Returns:
+            The coroutine's result.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                 name="coderefactor-loop", daemon=True)
+            self._loop_thread.start()
+        else:
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            if running_loop is self._loop:
+                coro.close()
+                raise RuntimeError("Synchronous CodeRefactorApp methods can't be called from its own event loop")
+        
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def close(self) -> None:
+        """Close the LLM client and stop the application's event loop."""
+        if self._python_executor is not None:
+            self._python_executor.shutdown()
+            self._python_executor = None
+        
+        if self._loop is None:
+            return
+        
+        if self.llm:
+            try:
+                self._run_async(self.llm.aclose())
+            except Exception as e:
+                self.logger.warning(f"Error closing LLM client: {str(e)}")
+        
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = self._loop_thread = None
+    
     def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze a single file using the appropriate analyzer."""
+        return self._run_async(self.analyze_file_async(file_path))
+    
+    async def analyze_file_async(self, file_path: str) -> Dict[str, Any]:
+        """
+        Analyze a single file using the appropriate analyzer.
+        
+        The blocking web analyzer runs in the loop's default executor, the Python analyzer in
+        a single thread of its own, and the C# analyzer and LLM are awaited directly, so
+        several files can be analyzed concurrently on one event loop.
+        """
         if not os.path.exists(file_path):
             self.logger.error(f"File does not exist: {file_path}")
             return {"error": f"File not found: {file_path}"}
         
+        result = await self._analyze_file_static(file_path)
+        
+        # If LLM is enabled and there are issues, get AI suggestions
+        if self.llm:
+            await self._add_ai_analysis(result)
+        
+        return result
+    
+    async def _analyze_file_static(self, file_path: str) -> Dict[str, Any]:
+        """
+        Run the analyzer for a file, reusing the results of an earlier run while the file is unchanged.
+        
+        Args:
+            file_path: Path to an existing file.
+        
+        Returns:
+            The file's analysis results without LLM suggestions, as a copy the caller may modify.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        
+        entry = self._analysis_cache.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self._analysis_cache.move_to_end(path)
+            result = _copy_file_result(entry[2])
+            result["file_path"] = file_path
+            return result
+        
         # Get file extension to determine analyzer
         file_ext = os.path.splitext(file_path)[1].lower()
         
@@ -192,134 +692,98 @@ class CodeRefactorApp:
             "suggestions": []
         }
         
+        loop = asyncio.get_running_loop()
+        
         # Python files
-        if file_ext == '.py' and self.python_analyzer:
-            analysis_result = self.python_analyzer.analyze_file(file_path)
+        if file_ext in _PYTHON_EXTENSIONS and self.python_analyzer:
+            if self._python_executor is None:
+                self._python_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coderefactor-python")
+            analysis_result = await loop.run_in_executor(self._python_executor, self.python_analyzer.analyze_file,
+                                                         file_path)
             
             if analysis_result.error:
                 result["error"] = analysis_result.error
             else:
                 # Convert issues to dictionary format for JSON serialization
-                for issue in analysis_result.issues:
-                    result["issues"].append({
-                        "id": issue.id,
-                        "line": issue.line,
-                        "column": issue.column,
-                        "end_line": issue.end_line,
-                        "end_column": issue.end_column,
-                        "message": issue.message,
-                        "description": issue.description,
-                        "severity": issue.severity.name.lower(),
-                        "category": issue.category.name.lower(),
-                        "source": issue.source,
-                        "rule_id": issue.rule_id,
-                        "fixable": issue.fixable,
-                        "fix_type": issue.fix_type,
-                        "code_snippet": issue.code_snippet
-                    })
+                result["issues"] = _issues_to_dicts(analysis_result.issues)
         
         # Web Tech files (JS/TS/HTML/CSS)
-        elif file_ext in ['.js', '.jsx', '.ts', '.tsx', '.html', '.htm', '.css', '.scss', '.less'] and self.web_analyzer:
-            analysis_result = self.web_analyzer.analyze_file(file_path)
+        elif file_ext in _WEB_EXTENSIONS and self.web_analyzer:
+            analysis_result = await loop.run_in_executor(None, self.web_analyzer.analyze_file, file_path)
             
             if analysis_result.error:
                 result["error"] = analysis_result.error
             else:
                 # Convert issues to dictionary format for JSON serialization
-                for issue in analysis_result.issues:
-                    result["issues"].append({
-                        "id": issue.id,
-                        "line": issue.line,
-                        "column": issue.column,
-                        "end_line": issue.end_line,
-                        "end_column": issue.end_column,
-                        "message": issue.message,
-                        "description": issue.description,
-                        "severity": issue.severity.name.lower(),
-                        "category": issue.category.name.lower(),
-                        "source": issue.source,
-                        "rule_id": issue.rule_id,
-                        "fixable": issue.fixable,
-                        "fix_type": issue.fix_type,
-                        "code_snippet": issue.code_snippet
-                    })
+                result["issues"] = _issues_to_dicts(analysis_result.issues)
         
         # C# files
-        elif file_ext in ['.cs', '.csx'] and self.csharp_analyzer:
-            # This would be asynchronous in the real implementation
-            analysis_result = asyncio.run(self.csharp_analyzer.AnalyzeFileAsync(file_path))
+        elif file_ext in _CSHARP_EXTENSIONS and self.csharp_analyzer:
+            analysis_result = await self.csharp_analyzer.AnalyzeFileAsync(file_path)
             
-            if hasattr(analysis_result, 'Error') and analysis_result.Error:
-                result["error"] = analysis_result.Error
+            error = getattr(analysis_result, 'Error', None)
+            if error:
+                result["error"] = error
             else:
                 # Convert issues to dictionary format for JSON serialization
-                for issue in analysis_result.Issues:
-                    result["issues"].append({
-                        "id": issue.Id,
-                        "line": issue.Line,
-                        "column": issue.Column,
-                        "end_line": issue.EndLine,
-                        "end_column": issue.EndColumn,
-                        "message": issue.Message,
-                        "description": issue.Description,
-                        "severity": str(issue.Severity).lower(),
-                        "category": str(issue.Category).lower(),
-                        "source": issue.Source,
-                        "rule_id": issue.RuleId,
-                        "fixable": issue.Fixable,
-                        "fix_type": issue.FixType,
-                        "code_snippet": issue.CodeSnippet
-                    })
+                result["issues"] = _issues_to_dicts(analysis_result.Issues, csharp=True)
         
         else:
             result["error"] = f"Unsupported file type: {file_ext}"
         
-        # If LLM is enabled and there are issues, get AI suggestions
-        if self.llm and "error" not in result and result["issues"]:
-            # Get file content
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
-                
-                # Determine language based on file extension
-                language_map = {
-                    '.py': 'python',
-                    '.js': 'javascript',
-                    '.jsx': 'javascript',
-                    '.ts': 'typescript',
-                    '.tsx': 'typescript',
-                    '.html': 'html',
-                    '.htm': 'html',
-                    '.css': 'css',
-                    '.scss': 'css',
-                    '.less': 'css',
-                    '.cs': 'csharp'
-                }
-                
-                language = language_map.get(file_ext, 'text')
-                
-                # Get AI analysis
-                ai_result = asyncio.run(self.llm.analyze_code(code, language))
-                
-                if not ai_result.error:
-                    # Add AI issues and suggestions
-                    for suggestion in ai_result.suggestions:
-                        result["suggestions"].append({
-                            "title": suggestion.changes[0].get("description", "AI Suggestion") if suggestion.changes else "AI Suggestion",
-                            "description": suggestion.explanation,
-                            "before": suggestion.original_code,
-                            "after": suggestion.refactored_code
-                        })
-                    
-                    # Add explanation if available
-                    if ai_result.explanation:
-                        result["ai_explanation"] = ai_result.explanation
-            
-            except Exception as e:
-                self.logger.error(f"Error getting AI suggestions: {str(e)}")
+        # Failed runs are not cached, so they are retried next time
+        if "error" not in result:
+            self._analysis_cache[path] = (stat.st_mtime_ns, stat.st_size, _copy_file_result(result))
+            while len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
         
         return result
     
+    async def _add_ai_analysis(self, result: Dict[str, Any]) -> None:
+        """Add the LLM's suggestions and assessment to a file's results, if it has any issues."""
+        if "error" in result or not result["issues"]:
+            return
+        
+        file_path = result["file_path"]
+        file_ext = os.path.splitext(file_path)[1].lower()
+        
+        # Get file content
+        try:
+            code = _read_text(file_path)
+            
+            # Determine language based on file extension
+            language = _LANGUAGE_MAP.get(file_ext, 'text')
+            
+            # Get AI analysis
+            ai_result = await self.llm.analyze_code(code, language)
+            
+            if not ai_result.error:
+                # Add AI issues and suggestions
+                for suggestion in ai_result.suggestions:
+                    result["suggestions"].append({
+                        "title": suggestion.changes[0].get("description", "AI Suggestion") if suggestion.changes else "AI Suggestion",
+                        "description": suggestion.explanation,
+                        "before": suggestion.original_code,
+                        "after": suggestion.refactored_code
+                    })
+                
+                # Add explanation if available
+                if ai_result.explanation:
+                    result["ai_explanation"] = ai_result.explanation
+        
+        except Exception as e:
+            self.logger.error(f"Error getting AI suggestions: {str(e)}")
+    
+    async def _add_ai_analysis_many(self, file_results: List[Dict[str, Any]]) -> None:
+        """Add LLM analysis to several files' results, with the requests running concurrently."""
+        semaphore = asyncio.Semaphore(self.config.get("analysis", {}).get("max_concurrency", 16))
+        
+        async def add_one(file_result: Dict[str, Any]) -> None:
+            async with semaphore:
+                await self._add_ai_analysis(file_result)
+        
+        await asyncio.gather(*(add_one(file_result) for file_result in file_results))
+    
     def analyze_directory(self, dir_path: str, recursive: bool = True, pattern: Optional[str] = None) -> Dict[str, Any]:
         """Analyze all supported files in a directory."""
         if not os.path.isdir(dir_path):
@@ -327,82 +791,157 @@ class CodeRefactorApp:
             return {"error": f"Directory not found: {dir_path}"}
         
         # Initialize result structure
-        result = {
-            "directory": dir_path,
-            "timestamp": datetime.now().isoformat(),
-            "files_analyzed": 0,
-            "total_issues": 0,
-            "issues_by_severity": {
-                "critical": 0,
-                "error": 0,
-                "warning": 0,
-                "info": 0
-            },
-            "issues_by_category": {},
-            "files": []
-        }
+        result = self._new_directory_summary(dir_path)
+        result["files"] = list(self.iter_analyze_directory(dir_path, recursive, pattern, result))
+        
+        return result
+    
+    def iter_analyze_directory(self, dir_path: str, recursive: bool = True, pattern: Optional[str] = None,
+                               summary: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze all supported files in a directory, yielding each file's results as they are ready.
+        
+        Unlike analyze_directory, this never holds the results of the whole directory in memory,
+        so large projects can be reported on file by file.
         
-        # Find files to analyze
-        files_to_analyze = []
+        Args:
+            dir_path: Directory to analyze.
+            recursive: Whether to descend into subdirectories.
+            pattern: Optional glob pattern that file names must match.
+            summary: Optional summary from _new_directory_summary, whose counters are updated
+                with each file before it is yielded.
+        
+        Yields:
+            The analysis results of each file that was analyzed without errors.
+        """
+        if summary is None:
+            summary = self._new_directory_summary(dir_path)
         
         # Define supported extensions
         supported_extensions = set()
         
-        if self.python_analyzer:
-            supported_extensions.add('.py')
+        if self._python_enabled():
+            supported_extensions.update(_PYTHON_EXTENSIONS)
         
-        if self.web_analyzer:
-            supported_extensions.update(['.js', '.jsx', '.ts', '.tsx', '.html', '.htm', '.css', '.scss', '.less'])
+        if self._web_enabled():
+            supported_extensions.update(_WEB_EXTENSIONS)
         
-        if self.csharp_analyzer:
-            supported_extensions.update(['.cs', '.csx'])
+        if self._csharp_enabled():
+            supported_extensions.update(_CSHARP_EXTENSIONS)
         
-        # Walk directory and find supported files
-        for root, _, files in os.walk(dir_path):
-            if not recursive and root != dir_path:
-                continue
+        # Compile the pattern once instead of matching it anew for every file
+        name_filter: Optional[Callable[[str], bool]] = None
+        if pattern:
+            pattern_match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
             
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_ext = os.path.splitext(file)[1].lower()
-                
-                if file_ext in supported_extensions:
-                    # Apply pattern filter if specified
-                    if pattern and not self._match_pattern(file, pattern):
-                        continue
-                    
-                    files_to_analyze.append(file_path)
+            def matches_pattern(name: str) -> bool:
+                return pattern_match(os.path.normcase(name)) is not None
+            
+            name_filter = matches_pattern
+        
+        # Walk directory and find supported files
+        files_to_analyze = list(_iter_source_files(dir_path, recursive, frozenset(supported_extensions), name_filter))
         
         # Analyze each file
-        for file_path in files_to_analyze:
-            self.logger.info(f"Analyzing file: {file_path}")
-            file_result = self.analyze_file(file_path)
-            
+        for file_result in self._analyze_files(files_to_analyze):
             # Update summary statistics
             if "error" not in file_result:
-                result["files_analyzed"] += 1
-                result["total_issues"] += len(file_result["issues"])
+                summary["files_analyzed"] += 1
+                summary["total_issues"] += len(file_result["issues"])
                 
                 # Count issues by severity
                 for issue in file_result["issues"]:
                     severity = issue["severity"]
-                    result["issues_by_severity"][severity] = result["issues_by_severity"].get(severity, 0) + 1
+                    summary["issues_by_severity"][severity] = summary["issues_by_severity"].get(severity, 0) + 1
                     
                     # Count issues by category
                     category = issue["category"]
-                    result["issues_by_category"][category] = result["issues_by_category"].get(category, 0) + 1
+                    summary["issues_by_category"][category] = summary["issues_by_category"].get(category, 0) + 1
                 
-                # Add to files list
-                result["files"].append(file_result)
+                yield file_result
         
-        self.logger.info(f"Analyzed {result['files_analyzed']} files, found {result['total_issues']} issues")
+        self.logger.info(f"Analyzed {summary['files_analyzed']} files, found {summary['total_issues']} issues")
+    
+    def _new_directory_summary(self, dir_path: str) -> Dict[str, Any]:
+        """Create the summary counters of a directory analysis."""
+        return {
+            "directory": dir_path,
+            "timestamp": datetime.now().isoformat(),
+            "files_analyzed": 0,
+            "total_issues": 0,
+            "issues_by_severity": {
+                "critical": 0,
+                "error": 0,
+                "warning": 0,
+                "info": 0
+            },
+            "issues_by_category": {}
+        }
+    
+    def _analyze_files(self, file_paths: List[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze files, spreading them over worker processes when several workers are configured.
         
-        return result
+        The LLM client can't be sent to worker processes, so the workers only run the analyzers
+        and the LLM requests for each batch of their results are made here, concurrently. The
+        .NET-backed C# analyzer can't be sent either, so while it is active the files are
+        analyzed concurrently on one event loop instead, a batch at a time.
+        
+        Args:
+            file_paths: Paths of the files to analyze.
+        
+        Yields:
+            Analysis results, in the order of file_paths.
+        """
+        analysis_config = self.config.get("analysis", {})
+        max_workers = analysis_config.get("max_workers", 1) or 1
+        # Bound the results held at once while still letting LLM requests overlap
+        batch_size = max(analysis_config.get("max_concurrency", 16), 1) * 4
+        done = 0
+        
+        if max_workers > 1 and len(file_paths) > 1 and not self._csharp_enabled():
+            workers = min(max_workers, len(file_paths))
+            worker_app = copy.copy(self)
+            worker_app.llm = None
+            worker_app._analysis_cache = OrderedDict()
+            worker_app._loop = worker_app._loop_thread = None
+            worker_app._python_executor = None
+            
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_directory_worker,
+                                         initargs=(worker_app,)) as executor:
+                    file_results = executor.map(_analyze_file_in_worker, file_paths, chunksize=4)
+                    for batch in _batched(file_results, batch_size):
+                        if self.llm:
+                            self._run_async(self._add_ai_analysis_many(batch))
+                        yield from batch
+                        done += len(batch)
+                return
+            except Exception as e:
+                self.logger.warning(f"Parallel analysis failed, falling back to sequential: {str(e)}")
+        
+        for start in range(done, len(file_paths), batch_size):
+            batch = file_paths[start:start + batch_size]
+            yield from self._run_async(self._analyze_files_async(batch))
     
-    def _match_pattern(self, filename: str, pattern: str) -> bool:
-        """Check if a filename matches a glob pattern."""
-        import fnmatch
-        return fnmatch.fnmatch(filename, pattern)
+    async def _analyze_files_async(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze files concurrently on one event loop, so LLM requests for different files overlap.
+        
+        Args:
+            file_paths: Paths of the files to analyze.
+        
+        Returns:
+            List of analysis results, in the order of file_paths.
+        """
+        semaphore = asyncio.Semaphore(self.config.get("analysis", {}).get("max_concurrency", 16))
+        
+        async def analyze_one(file_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                self.logger.info(f"Analyzing file: {file_path}")
+                return await self.analyze_file_async(file_path)
+        
+        return list(await asyncio.gather(*(analyze_one(file_path) for file_path in file_paths)))
     
     async def get_fix_suggestion(self, file_path: str, issue_id: str) -> Dict[str, Any]:
         """Get a fix suggestion for a specific issue using LLM."""
@@ -412,8 +951,8 @@ class CodeRefactorApp:
         if not os.path.exists(file_path):
             return {"error": f"File not found: {file_path}"}
         
-        # First analyze the file to get the issues
-        analysis = self.analyze_file(file_path)
+        # First analyze the file to get the issues; the LLM's own analysis isn't needed here
+        analysis = await self._analyze_file_static(file_path)
         
         if "error" in analysis:
             return {"error": analysis["error"]}
@@ -430,26 +969,11 @@ class CodeRefactorApp:
         
         # Get file content
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
+            code = _read_text(file_path)
             
             # Determine language based on file extension
             file_ext = os.path.splitext(file_path)[1].lower()
-            language_map = {
-                '.py': 'python',
-                '.js': 'javascript',
-                '.jsx': 'javascript',
-                '.ts': 'typescript',
-                '.tsx': 'typescript',
-                '.html': 'html',
-                '.htm': 'html',
-                '.css': 'css',
-                '.scss': 'css',
-                '.less': 'css',
-                '.cs': 'csharp'
-            }
-            
-            language = language_map.get(file_ext, 'text')
+            language = _LANGUAGE_MAP.get(file_ext, 'text')
             
             # Get fix suggestion from LLM
             suggestion = await self.llm.suggest_refactoring(
@@ -476,14 +1000,17 @@ class CodeRefactorApp:
         
         if output_file:
             try:
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    if format_type == "json":
-                        json.dump(results, f, indent=2)
-                    elif format_type == "html":
-                        f.write(self._generate_html_report(results))
-                    else:
-                        # Default to text format
-                        f.write(self._generate_text_report(results))
+                if format_type == "json":
+                    # Written as bytes, since the JSON is already encoded
+                    with open(output_file, 'wb') as f:
+                        f.write(_json_dumps(results))
+                else:
+                    with open(output_file, 'w', encoding='utf-8') as f:
+                        if format_type == "html":
+                            self._write_html_report(f, results)
+                        else:
+                            # Default to text format
+                            f.write(self._generate_text_report(results))
                 
                 self.logger.info(f"Results saved to {output_file}")
                 
@@ -492,11 +1019,124 @@ class CodeRefactorApp:
         else:
             # Output to terminal
             if format_type == "json":
-                print(json.dumps(results, indent=2))
+                print(_json_dumps(results).decode("utf-8"))
             else:
                 # Default to text format
                 print(self._generate_text_report(results))
     
+    def output_directory_results(self, dir_path: str, recursive: bool = True, pattern: Optional[str] = None,
+                                 output_format: Optional[str] = None, output_file: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Analyze a directory and output the report while the files are being analyzed.
+        
+        Produces the same report as analyze_directory followed by output_results, but writes
+        each file's results out as soon as they are ready instead of keeping the results of the
+        whole directory in memory.
+        
+        Args:
+            dir_path: Directory to analyze.
+            recursive: Whether to descend into subdirectories.
+            pattern: Optional glob pattern that file names must match.
+            output_format: Report format (text, json or html); defaults to the configured format.
+            output_file: File to write the report to; the report is printed if omitted.
+        
+        Returns:
+            The summary counters of the analysis, without the per-file results.
+        """
+        if not os.path.isdir(dir_path):
+            results = self.analyze_directory(dir_path, recursive, pattern)
+            self.output_results(results, output_format, output_file)
+            return results
+        
+        format_type = output_format or self.config["output"]["format"]
+        summary = self._new_directory_summary(dir_path)
+        file_results = self.iter_analyze_directory(dir_path, recursive, pattern, summary)
+        
+        if output_file:
+            try:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    self._write_directory_report(f, format_type, summary, file_results)
+                
+                self.logger.info(f"Results saved to {output_file}")
+            
+            except Exception as e:
+                self.logger.error(f"Error saving results: {str(e)}")
+        else:
+            # Output to terminal, where HTML falls back to text as in output_results
+            self._write_directory_report(sys.stdout, format_type if format_type == "json" else "text",
+                                         summary, file_results)
+            sys.stdout.write("\n")
+        
+        return summary
+    
+    def _write_directory_report(self, f: IO[str], format_type: str, summary: Dict[str, Any],
+                                file_results: Iterable[Dict[str, Any]]) -> None:
+        """Write a directory report, consuming the file results as they are produced."""
+        if format_type == "json":
+            self._write_json_directory_report(f, summary, file_results)
+        elif format_type == "html":
+            self._write_html_directory_report(f, summary, file_results)
+        else:
+            # The text report only lists the ten files with the most issues
+            top_files = heapq.nlargest(10, file_results, key=lambda r: len(r["issues"]))
+            f.write(self._generate_text_report(dict(summary, files=top_files)))
+    
+    def _write_json_directory_report(self, f: IO[str], summary: Dict[str, Any],
+                                     file_results: Iterable[Dict[str, Any]]) -> None:
+        """
+        Write a directory report as JSON, encoding each file's results as soon as they are ready.
+        
+        The counters are only final once every file is analyzed, so they follow the files list.
+        """
+        f.write('{\n')
+        f.write(f'  "directory": {_json_dumps(summary["directory"]).decode("utf-8")},\n')
+        f.write(f'  "timestamp": {_json_dumps(summary["timestamp"]).decode("utf-8")},\n')
+        f.write('  "files": [')
+        
+        count = 0
+        for file_result in file_results:
+            f.write(",\n    " if count else "\n    ")
+            # Encoded strings never contain raw newlines, so this only re-indents the structure
+            f.write(_json_dumps(file_result).decode("utf-8").replace("\n", "\n    "))
+            count += 1
+        
+        f.write("\n  ]" if count else "]")
+        
+        for key in ("files_analyzed", "total_issues", "issues_by_severity", "issues_by_category"):
+            f.write(f',\n  "{key}": ' + _json_dumps(summary[key]).decode("utf-8").replace("\n", "\n  "))
+        
+        f.write("\n}")
+    
+    def _write_html_directory_report(self, f: IO[str], summary: Dict[str, Any],
+                                     file_results: Iterable[Dict[str, Any]]) -> None:
+        """
+        Write a directory report as HTML.
+        
+        The summary tables come first but depend on every file, so the file results are
+        spooled to a temporary file as they are ready, then read back after the summary and
+        written with the files that have the most issues first.
+        """
+        sections = []
+        
+        with tempfile.TemporaryFile() as spool:
+            for index, file_result in enumerate(file_results):
+                data = pickle.dumps(file_result, pickle.HIGHEST_PROTOCOL)
+                sections.append((-len(file_result["issues"]), index, spool.tell(), len(data)))
+                spool.write(data)
+            
+            f.write(_HTML_REPORT_HEAD.replace("{timestamp}", summary["timestamp"]))
+            f.write(self._html_directory_summary(summary))
+            
+            if sections:
+                f.write("<h3>Files</h3>")
+                
+                # Sections are numbered in report order, as in _generate_html_report
+                for position, (_, _, offset, length) in enumerate(sorted(sections)):
+                    spool.seek(offset)
+                    f.write(self._html_file_section(pickle.loads(spool.read(length)), f"file-{position}"))
+            
+            f.write(_HTML_REPORT_TAIL)
+    
     def _generate_text_report(self, results: Dict[str, Any]) -> str:
         """Generate a text report from analysis results."""
         report = []
@@ -583,121 +1223,38 @@ class CodeRefactorApp:
     
     def _generate_html_report(self, results: Dict[str, Any]) -> str:
         """Generate an HTML report from analysis results."""
-        # Basic HTML template
-        html = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>CodeRefactor Analysis Report</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        h1, h2, h3 {
-            color: #2c3e50;
-        }
-        table {
-            border-collapse: collapse;
-            width: 100%;
-            margin-bottom: 20px;
-        }
-        th, td {
-            border: 1px solid #ddd;
-            padding: 8px;
-            text-align: left;
-        }
-        th {
-            background-color: #f2f2f2;
-        }
-        tr:nth-child(even) {
-            background-color: #f9f9f9;
-        }
-        .issue-critical {
-            border-left: 5px solid #e74c3c;
-        }
-        .issue-error {
-            border-left: 5px solid #e67e22;
-        }
-        .issue-warning {
-            border-left: 5px solid #f1c40f;
-        }
-        .issue-info {
-            border-left: 5px solid #3498db;
-        }
-        .code-snippet {
-            background-color: #f8f8f8;
-            border: 1px solid #ddd;
-            border-radius: 3px;
-            padding: 10px;
-            overflow-x: auto;
-            font-family: Consolas, Monaco, 'Andale Mono', monospace;
-            font-size: 14px;
-            margin-top: 5px;
-        }
-        .suggestion {
-            background-color: #e8f4fc;
-            padding: 15px;
-            border-radius: 5px;
-            margin-bottom: 15px;
-        }
-        .summary-box {
-            background-color: #f8f9fa;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            padding: 15px;
-            margin-bottom: 20px;
-        }
-        .file-summary {
-            cursor: pointer;
-            padding: 10px;
-            border: 1px solid #ddd;
-            margin-bottom: 5px;
-            border-radius: 3px;
-        }
-        .file-summary:hover {
-            background-color: #f5f5f5;
-        }
-        .hidden {
-            display: none;
-        }
-    </style>
-</head>
-<body>
-    <h1>CodeRefactor Analysis Report</h1>
-    <p>Generated on: {timestamp}</p>
-"""
-        
+        buffer = io.StringIO()
+        self._write_html_report(buffer, results)
+        return buffer.getvalue()
+    
+    def _write_html_report(self, f: IO[str], results: Dict[str, Any]) -> None:
+        """Write an HTML report of analysis results to a text stream, one part at a time."""
         # Handle error
         if "error" in results:
-            html += f"<div class='error'><h2>Error</h2><p>{results['error']}</p></div>"
-            html += "</body></html>"
-            return html
+            f.write(_HTML_REPORT_HEAD)
+            f.write(f"<div class='error'><h2>Error</h2><p>{_escape(results['error'])}</p></div>")
+            f.write("</body></html>")
+            return
         
         # Add timestamp
         timestamp = results.get("timestamp", datetime.now().isoformat())
-        html = html.format(timestamp=timestamp)
+        f.write(_HTML_REPORT_HEAD.replace("{timestamp}", timestamp))
         
         # Single file report
         if "file_path" in results:
             file_path = results["file_path"]
             issues = results["issues"]
             
-            html += f"<h2>Analysis Results for: {file_path}</h2>"
+            f.write(f"<h2>Analysis Results for: {_escape(file_path)}</h2>")
             
             if not issues:
-                html += "<div class='summary-box'><p>No issues found! Good job!</p></div>"
+                f.write("<div class='summary-box'><p>No issues found! Good job!</p></div>")
             else:
-                html += f"<div class='summary-box'><p>Found {len(issues)} issues</p></div>"
+                f.write(f"<div class='summary-box'><p>Found {len(issues)} issues</p></div>")
                 
                 # Issues table
-                html += "<h3>Issues</h3>"
-                html += """<table>
+                f.write("<h3>Issues</h3>")
+                f.write("""<table>
                 <tr>
                     <th>Severity</th>
                     <th>Location</th>
@@ -705,11 +1262,10 @@ class CodeRefactorApp:
                     <th>Description</th>
                     <th>Fixable</th>
                 </tr>
-                """
+                """)
                 
                 # Sort issues by severity
-                severity_order = {"critical": 0, "error": 1, "warning": 2, "info": 3}
-                sorted_issues = sorted(issues, key=lambda x: (severity_order.get(x["severity"], 99), x["line"]))
+                sorted_issues = sorted(issues, key=_issue_sort_key)
                 
                 for issue in sorted_issues:
                     severity = issue["severity"]
@@ -717,145 +1273,134 @@ class CodeRefactorApp:
                     if issue['column']:
                         location += f", Col {issue['column']}"
                     
-                    html += f"""<tr class="issue-{severity}">
-                        <td>{severity.upper()}</td>
-                        <td>{location}</td>
-                        <td>{issue['rule_id']}</td>
-                        <td>
-                            <strong>{issue['message']}</strong>
-                            <p>{issue['description']}</p>
-                            {f'<div class="code-snippet"><pre>{issue["code_snippet"]}</pre></div>' if issue['code_snippet'] else ''}
-                        </td>
-                        <td>{issue['fix_type'] if issue['fixable'] else 'No'}</td>
-                    </tr>"""
+                    f.write(_severity_row(_HTML_ISSUE_ROW, severity).format(
+                        location=location,
+                        rule_id=_escape(issue['rule_id']),
+                        message=_escape(issue['message']),
+                        description=_escape(issue['description']),
+                        code_snippet=_HTML_CODE_SNIPPET.format(_escape(issue['code_snippet'])) if issue['code_snippet'] else '',
+                        fixable=issue['fix_type'] if issue['fixable'] else 'No'
+                    ))
                 
-                html += "</table>"
+                f.write("</table>")
             
             # Add AI suggestions if available
             if "suggestions" in results and results["suggestions"]:
-                html += "<h3>AI Suggestions</h3>"
+                f.write("<h3>AI Suggestions</h3>")
                 
                 for suggestion in results["suggestions"]:
-                    html += f"""<div class="suggestion">
-                        <h4>{suggestion['title']}</h4>
-                        <p>{suggestion['description']}</p>
+                    f.write(f"""<div class="suggestion">
+                        <h4>{_escape(suggestion['title'])}</h4>
+                        <p>{_escape(suggestion['description'])}</p>
                         <h5>Before:</h5>
-                        <div class="code-snippet"><pre>{suggestion['before']}</pre></div>
+                        <div class="code-snippet"><pre>{_escape(suggestion['before'])}</pre></div>
                         <h5>After:</h5>
-                        <div class="code-snippet"><pre>{suggestion['after']}</pre></div>
-                    </div>"""
+                        <div class="code-snippet"><pre>{_escape(suggestion['after'])}</pre></div>
+                    </div>""")
             
             # Add AI explanation if available
             if "ai_explanation" in results:
-                html += f"""<div class="summary-box">
+                f.write(f"""<div class="summary-box">
                     <h3>AI Code Assessment</h3>
-                    <p>{results['ai_explanation']}</p>
-                </div>"""
+                    <p>{_escape(results['ai_explanation'])}</p>
+                </div>""")
         
         # Directory report
         elif "directory" in results:
-            directory = results["directory"]
-            files_analyzed = results["files_analyzed"]
-            total_issues = results["total_issues"]
-            
-            html += f"<h2>Analysis Results for Directory: {directory}</h2>"
-            
-            # Summary box
-            html += f"""<div class="summary-box">
-                <p>Files analyzed: {files_analyzed}</p>
-                <p>Total issues found: {total_issues}</p>
-            </div>"""
-            
-            # Issues by severity
-            html += "<h3>Issues by Severity</h3>"
-            html += "<table>"
-            html += "<tr><th>Severity</th><th>Count</th></tr>"
-            
-            for severity, count in results["issues_by_severity"].items():
-                html += f"<tr><td>{severity.upper()}</td><td>{count}</td></tr>"
-            
-            html += "</table>"
-            
-            # Issues by category
-            html += "<h3>Issues by Category</h3>"
-            html += "<table>"
-            html += "<tr><th>Category</th><th>Count</th></tr>"
-            
-            for category, count in sorted(results["issues_by_category"].items(), key=lambda x: x[1], reverse=True):
-                html += f"<tr><td>{category}</td><td>{count}</td></tr>"
-            
-            html += "</table>"
+            f.write(self._html_directory_summary(results))
             
             # Files details
             if results["files"]:
-                html += "<h3>Files</h3>"
+                f.write("<h3>Files</h3>")
                 
                 # Sort files by issue count
-                files_sorted = sorted(results["files"], key=lambda f: len(f["issues"]), reverse=True)
+                files_sorted = sorted(results["files"], key=lambda r: len(r["issues"]), reverse=True)
                 
                 for i, file in enumerate(files_sorted):
-                    file_path = file["file_path"]
-                    issue_count = len(file["issues"])
-                    file_id = f"file-{i}"
-                    
-                    html += f"""<div class="file-summary" onclick="toggleFile('{file_id}')">
-                        {file_path} - {issue_count} issues
-                    </div>
-                    <div id="{file_id}" class="hidden">"""
-                    
-                    if file["issues"]:
-                        # Issues table for this file
-                        html += "<table>"
-                        html += """<tr>
-                            <th>Severity</th>
-                            <th>Location</th>
-                            <th>Rule</th>
-                            <th>Description</th>
-                        </tr>"""
-                        
-                        # Sort issues by severity
-                        severity_order = {"critical": 0, "error": 1, "warning": 2, "info": 3}
-                        sorted_issues = sorted(file["issues"], key=lambda x: (severity_order.get(x["severity"], 99), x["line"]))
-                        
-                        for issue in sorted_issues:
-                            severity = issue["severity"]
-                            location = f"Line {issue['line']}"
-                            if issue['column']:
-                                location += f", Col {issue['column']}"
-                            
-                            html += f"""<tr class="issue-{severity}">
-                                <td>{severity.upper()}</td>
-                                <td>{location}</td>
-                                <td>{issue['rule_id']}</td>
-                                <td>
-                                    <strong>{issue['message']}</strong>
-                                    <p>{issue['description']}</p>
-                                </td>
-                            </tr>"""
-                        
-                        html += "</table>"
-                    else:
-                        html += "<p>No issues found in this file!</p>"
-                    
-                    html += "</div>"
+                    f.write(self._html_file_section(file, f"file-{i}"))
         
         # Add JavaScript for file toggling
-        html += """
-<script>
-    function toggleFile(fileId) {
-        const element = document.getElementById(fileId);
-        if (element.classList.contains('hidden')) {
-            element.classList.remove('hidden');
-        } else {
-            element.classList.add('hidden');
-        }
-    }
-</script>
-</body>
-</html>
-"""
+        f.write(_HTML_REPORT_TAIL)
+    
+    def _html_directory_summary(self, results: Dict[str, Any]) -> str:
+        """Generate the heading and summary tables of an HTML directory report."""
+        directory = results["directory"]
+        files_analyzed = results["files_analyzed"]
+        total_issues = results["total_issues"]
+        
+        parts = [f"<h2>Analysis Results for Directory: {_escape(directory)}</h2>"]
+        
+        # Summary box
+        parts.append(f"""<div class="summary-box">
+            <p>Files analyzed: {files_analyzed}</p>
+            <p>Total issues found: {total_issues}</p>
+        </div>""")
+        
+        # Issues by severity
+        parts.append("<h3>Issues by Severity</h3>")
+        parts.append("<table>")
+        parts.append("<tr><th>Severity</th><th>Count</th></tr>")
+        
+        for severity, count in results["issues_by_severity"].items():
+            parts.append(f"<tr><td>{severity.upper()}</td><td>{count}</td></tr>")
+        
+        parts.append("</table>")
+        
+        # Issues by category
+        parts.append("<h3>Issues by Category</h3>")
+        parts.append("<table>")
+        parts.append("<tr><th>Category</th><th>Count</th></tr>")
+        
+        for category, count in sorted(results["issues_by_category"].items(), key=lambda x: x[1], reverse=True):
+            parts.append(f"<tr><td>{_escape(category)}</td><td>{count}</td></tr>")
+        
+        parts.append("</table>")
+        
+        return "".join(parts)
+    
+    def _html_file_section(self, file: Dict[str, Any], file_id: str) -> str:
+        """Generate the collapsible section of one file in an HTML directory report."""
+        file_path = file["file_path"]
+        issue_count = len(file["issues"])
+        
+        parts = [f"""<div class="file-summary" onclick="toggleFile('{file_id}')">
+            {_escape(file_path)} - {issue_count} issues
+        </div>
+        <div id="{file_id}" class="hidden">"""]
+        
+        if file["issues"]:
+            # Issues table for this file
+            parts.append("<table>")
+            parts.append("""<tr>
+                <th>Severity</th>
+                <th>Location</th>
+                <th>Rule</th>
+                <th>Description</th>
+            </tr>""")
+            
+            # Sort issues by severity
+            sorted_issues = sorted(file["issues"], key=_issue_sort_key)
+            
+            for issue in sorted_issues:
+                severity = issue["severity"]
+                location = f"Line {issue['line']}"
+                if issue['column']:
+                    location += f", Col {issue['column']}"
+                
+                parts.append(_severity_row(_HTML_FILE_ISSUE_ROW, severity).format(
+                    location=location,
+                    rule_id=_escape(issue['rule_id']),
+                    message=_escape(issue['message']),
+                    description=_escape(issue['description'])
+                ))
+            
+            parts.append("</table>")
+        else:
+            parts.append("<p>No issues found in this file!</p>")
+        
+        parts.append("</div>")
         
-        return html
+        return "".join(parts)
     
     def start_web_interface(self, host: str = '0.0.0.0', port: int = 5000):
         """Start the web interface."""
@@ -925,31 +1470,36 @@ def main():
     app = CodeRefactorApp(args.config if hasattr(args, 'config') else None)
     
     # Execute the command
-    if args.command == "analyze":
-        if os.path.isfile(args.path):
-            # Analyze a single file
-            result = app.analyze_file(args.path)
-        else:
-            # Analyze a directory
-            result = app.analyze_directory(args.path, args.recursive, args.pattern)
+    try:
+        if args.command == "analyze":
+            if os.path.isfile(args.path):
+                # Analyze a single file
+                result = app.analyze_file(args.path)
+            else:
+                # Analyze a directory, writing the report out file by file
+                app.output_directory_results(args.path, args.recursive, args.pattern, args.format, args.output)
+                return
+            
+            # Output the results
+            app.output_results(result, args.format, args.output)
         
-        # Output the results
-        app.output_results(result, args.format, args.output)
-    
-    elif args.command == "fix":
-        # Get fix suggestion
-        result = asyncio.run(app.get_fix_suggestion(args.file, args.issue_id))
+        elif args.command == "fix":
+            # Get fix suggestion
+            result = app._run_async(app.get_fix_suggestion(args.file, args.issue_id))
+            
+            # Output the results
+            app.output_results(result, "json" if args.output else "text", args.output)
         
-        # Output the results
-        app.output_results(result, "json" if args.output else "text", args.output)
-    
-    elif args.command == "web":
-        # Start the web interface
-        app.start_web_interface(args.host, args.port)
-    
-    else:
-        # No command specified, show help
-        parser.print_help()
+        elif args.command == "web":
+            # Start the web interface
+            app.start_web_interface(args.host, args.port)
+        
+        else:
+            # No command specified, show help
+            parser.print_help()
+    finally:
+        # Close the LLM client and stop the event loop shared by the commands
+        app.close()
 
 
 if __name__ == "__main__":
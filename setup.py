@@ -51,13 +51,15 @@ setup(
         "test": read_requirements("test.txt"),
         "web": ["flask>=2.0.0", "flask-cors>=3.0.10"],
         "csharp": ["pythonnet>=3.0.0"],
-        "llm": ["anthropic>=0.8.0", "aiohttp>=3.8.0"],
+        "llm": ["anthropic>=0.8.0", "aiohttp>=3.8.0", "h2>=4.0"],
+        "speedups": ["google-re2>=1.0", "orjson>=3.9", "brotli>=1.0", "zstandard>=0.18"],
         "all": read_requirements("base.txt") + 
                read_requirements("dev.txt") + 
                read_requirements("docs.txt") + 
                read_requirements("test.txt") +
                ["flask>=2.0.0", "flask-cors>=3.0.10", 
-                "pythonnet>=3.0.0", "anthropic>=0.8.0", "aiohttp>=3.8.0"],
+                "pythonnet>=3.0.0", "anthropic>=0.8.0", "aiohttp>=3.8.0", "h2>=4.0",
+                "google-re2>=1.0", "orjson>=3.9", "brotli>=1.0", "zstandard>=0.18"],
     },
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 
 from coderefactor.analyzers.base import BaseAnalyzer
-from coderefactor.fixers.base import BaseFixer, FixResult, FixStatus
+from coderefactor.fixers.base import BaseFixer, FixChange, FixResult, FixStatus
 from coderefactor.analyzers.utils.models import AnalysisResult, AnalysisIssue, IssueSeverity, IssueCategory
 
 
@@ -213,4 +213,77 @@ class TestBaseFixer:
         assert str(FixStatus.SKIPPED) == "skipped"
 
 
+class TestApplyChanges:
+    """Test suite for BaseFixer.apply_changes."""
+
+    @pytest.fixture
+    def fixer(self):
+        """A fixer using the base class implementation of apply_changes."""
+        return BaseFixer()
+
+    def test_single_column_insert(self, fixer):
+        """Test that an empty column range inserts text without replacing any."""
+        code = "print('a')\nx = 1\n"
+        change = FixChange(start_line=2, start_column=2, end_line=2, end_column=2, replacement_text="y")
+        
+        assert fixer.apply_changes(code, [change]) == "print('a')\nxy = 1\n"
+
+    def test_replacement_at_end_of_line(self, fixer):
+        """Test that end_column is exclusive and a change may end at the last character."""
+        code = "x = 1\ny = 2\n"
+        change = FixChange(start_line=1, start_column=5, end_line=1, end_column=6, replacement_text="42")
+        
+        assert fixer.apply_changes(code, [change]) == "x = 42\ny = 2\n"
+
+    def test_out_of_range_columns_replace_line(self, fixer):
+        """Test that columns outside the line replace the whole line, including its ending."""
+        code = "x = 1\ny = 2\n"
+        change = FixChange(start_line=1, start_column=3, end_line=1, end_column=40, replacement_text="x = 3\n")
+        
+        assert fixer.apply_changes(code, [change]) == "x = 3\ny = 2\n"
+
+    def test_multi_line_change(self, fixer):
+        """Test that a multi-line change replaces its lines completely."""
+        code = "a = 1\nif a:\n    pass\nb = 2\n"
+        change = FixChange(start_line=2, start_column=1, end_line=3, end_column=9, replacement_text="c = 3\n")
+        
+        assert fixer.apply_changes(code, [change]) == "a = 1\nc = 3\nb = 2\n"
+
+    def test_two_changes_on_one_line(self, fixer):
+        """Test that several changes on one line all apply to the original columns."""
+        code = "foo(a,b)\n"
+        changes = [
+            FixChange(start_line=1, start_column=1, end_line=1, end_column=4, replacement_text="bar"),
+            FixChange(start_line=1, start_column=7, end_line=1, end_column=7, replacement_text=" "),
+        ]
+        
+        assert fixer.apply_changes(code, changes) == "bar(a, b)\n"
+        # The order of the list doesn't matter
+        assert fixer.apply_changes(code, list(reversed(changes))) == "bar(a, b)\n"
+
+    def test_overlapping_changes(self, fixer):
+        """Test that a change overlapping a later one applies to the code that change produced."""
+        code = "abcdef\n"
+        changes = [
+            FixChange(start_line=1, start_column=2, end_line=1, end_column=4, replacement_text="XY"),
+            FixChange(start_line=1, start_column=3, end_line=1, end_column=6, replacement_text="Z"),
+        ]
+        
+        # "cde" becomes "Z" first, then columns 2-3 of "abZf" ("bZ") become "XY"
+        assert fixer.apply_changes(code, changes) == "aXYf\n"
+
+    def test_invalid_line(self, fixer):
+        """Test that changes to lines that don't exist are skipped."""
+        code = "x = 1\ny = 2\n"
+        changes = [
+            FixChange(start_line=0, start_column=1, end_line=0, end_column=2, replacement_text="bad"),
+            FixChange(start_line=5, start_column=1, end_line=5, end_column=2, replacement_text="bad"),
+            FixChange(start_line=2, start_column=1, end_line=1, end_column=2, replacement_text="bad"),
+            FixChange(start_line=2, start_column=1, end_line=2, end_column=2, replacement_text="z"),
+        ]
+        
+        assert fixer.apply_changes(code, changes) == "x = 1\nz = 2\n"
+        assert fixer.apply_changes(code, changes[:3]) == code
+
+
 import tempfile  # Add this at the top of the file
\ No newline at end of file
@@ -17,6 +17,8 @@ from coderefactor.cli.commands import (
     web_command, 
     main
 )
+from coderefactor import CodeRefactorApp
+import coderefactor.main as app_main
 
 
 class TestCLICommands:
@@ -419,4 +421,141 @@ class TestCLIIntegration:
                         assert 'success' in output.lower()
                         assert '1' in output  # Should show 1 change
         finally:
-            os.unlink(temp_path)
\ No newline at end of file
+            os.unlink(temp_path)
+
+
+class TestDirectoryReports:
+    """Test suite for directory reports streamed while the files are analyzed."""
+
+    @pytest.fixture
+    def app(self):
+        """An application without LLM, analyzing files in this process."""
+        app = CodeRefactorApp()
+        app.llm = None
+        app.config.setdefault("analysis", {})["max_workers"] = 1
+        yield app
+        app.close()
+
+    @pytest.fixture(params=["empty", "files"])
+    def source_dir(self, request, tmp_path):
+        """A directory that is either empty or holds Python files with and without issues."""
+        source_dir = tmp_path / "src"
+        source_dir.mkdir()
+        if request.param == "files":
+            (source_dir / "sub").mkdir()
+            (source_dir / "clean.py").write_text("def add(a, b):\n    return a + b\n")
+            (source_dir / "sub" / "messy.py").write_text(
+                "import os\nimport sys\n\n"
+                "def check(x):\n" + "".join(f"    if x == {i}:\n        return '<{i}>'\n" for i in range(15)) +
+                "    return None\n"
+            )
+            (source_dir / "notes.txt").write_text("not analyzed\n")
+        return source_dir
+
+    @pytest.mark.parametrize("output_format", ["json", "html", "text"])
+    def test_streamed_report_matches(self, app, source_dir, tmp_path, output_format):
+        """Test that streamed reports match analyze_directory followed by output_results."""
+        streamed_path = tmp_path / f"streamed.{output_format}"
+        expected_path = tmp_path / f"expected.{output_format}"
+        
+        summary = app.output_directory_results(str(source_dir), True, None, output_format, str(streamed_path))
+        
+        # File results are cached by the streamed run, so only the directory timestamp differs
+        results = app.analyze_directory(str(source_dir), True, None)
+        results["timestamp"] = summary["timestamp"]
+        app.output_results(results, output_format, str(expected_path))
+        
+        assert summary["files_analyzed"] == len(results["files"])
+        assert summary["total_issues"] == results["total_issues"]
+        
+        streamed = streamed_path.read_text(encoding="utf-8")
+        expected = expected_path.read_text(encoding="utf-8")
+        if output_format == "json":
+            # The streamed report lists the counters after the files, which are only final at the end
+            streamed_data = json.loads(streamed)
+            assert list(streamed_data) == ["directory", "timestamp", "files", "files_analyzed",
+                                           "total_issues", "issues_by_severity", "issues_by_category"]
+            assert streamed_data == json.loads(expected)
+        else:
+            assert streamed == expected
+
+    def test_streamed_report_to_stdout(self, app, source_dir, capsys):
+        """Test that reports printed to the terminal match as well."""
+        summary = app.output_directory_results(str(source_dir), True, None, "json", None)
+        streamed = capsys.readouterr().out
+        
+        results = app.analyze_directory(str(source_dir), True, None)
+        results["timestamp"] = summary["timestamp"]
+        app.output_results(results, "json", None)
+        
+        assert json.loads(streamed) == json.loads(capsys.readouterr().out)
+
+    def test_html_report_with_missing_values(self, app):
+        """Test that missing issue and suggestion fields render as empty text in HTML reports."""
+        issue = {
+            "id": "1", "file_path": "a.py", "line": 3, "column": None, "message": "<bad>",
+            "description": None, "severity": "warning", "category": "style", "source": "csharp",
+            "rule_id": None, "fixable": False, "fix_type": None, "code_snippet": None,
+        }
+        file_report = app._generate_html_report({
+            "file_path": "a.py", "issues": [issue], "ai_explanation": None,
+            "suggestions": [{"title": None, "description": "d", "before": None, "after": None}],
+        })
+        directory_report = app._generate_html_report({
+            "directory": "src", "files": [{"file_path": "a.py", "issues": [issue]}], "files_analyzed": 1,
+            "total_issues": 1, "issues_by_severity": {"warning": 1}, "issues_by_category": {"style": 1},
+        })
+        
+        for report in (file_report, directory_report):
+            assert report.rstrip().endswith("</html>")
+            assert "&lt;bad&gt;" in report
+            assert "None" not in report
+
+
+class TestMainEntryPoint:
+    """Test suite for the application's own entry point."""
+
+    @pytest.fixture
+    def apps(self, monkeypatch):
+        """Record the applications main() creates and closes."""
+        created, closed = [], []
+        original_init = CodeRefactorApp.__init__
+        original_close = CodeRefactorApp.close
+        
+        def init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            self.llm = None
+            created.append(self)
+        
+        def close(self):
+            closed.append(self)
+            original_close(self)
+        
+        monkeypatch.setattr(CodeRefactorApp, "__init__", init)
+        monkeypatch.setattr(CodeRefactorApp, "close", close)
+        return created, closed
+
+    def test_fix_runs_on_app_loop_and_closes(self, apps, tmp_path, capsys):
+        """Test that the fix command runs on the application's loop and closes the application."""
+        source = tmp_path / "a.py"
+        source.write_text("import os\n")
+        created, closed = apps
+        
+        with patch('sys.argv', ['coderefactor', 'fix', str(source), 'W0611']):
+            with patch('asyncio.run', side_effect=AssertionError("throwaway event loop")):
+                app_main.main()
+        
+        assert "LLM integration not enabled" in capsys.readouterr().out
+        assert closed == created and len(created) == 1
+        assert created[0]._loop is None
+
+    def test_app_closed_when_command_fails(self, apps, tmp_path):
+        """Test that the application is closed even when a command raises."""
+        created, closed = apps
+        
+        with patch('sys.argv', ['coderefactor', 'analyze', str(tmp_path)]):
+            with patch.object(CodeRefactorApp, 'output_directory_results', side_effect=RuntimeError("boom")):
+                with pytest.raises(RuntimeError):
+                    app_main.main()
+        
+        assert closed == created and len(created) == 1
@@ -3,20 +3,58 @@ Tests for the Claude API integration and LLM functionality.
 """
 import os
 import sys
+import time
+import asyncio
 import pytest
 import json
+import httpx
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union
 from unittest.mock import patch, MagicMock
 
 # Import the LLM module components
 try:
-    from claude_api import ClaudeAPI, LLMConfig, RefactorSuggestion
+    from claude_api import ClaudeAPI, LLMConfig, RefactorSuggestion, AnalysisResult, _split_python_code
+    from cache import LLMCache, FileLLMCache, cache_key
+    from rate_limit import RateLimiter
     HAS_CLAUDE_API = True
 except ImportError:
     HAS_CLAUDE_API = False
 
 
+def _response_body(text: str) -> Dict[str, Any]:
+    """Build a messages API response body with a single text block."""
+    return {"content": [{"type": "text", "text": text}]}
+
+
+def _sse(*events: Dict[str, Any]) -> bytes:
+    """Encode events as a server-sent events stream body."""
+    return b"".join(b"data: " + json.dumps(event).encode("utf-8") + b"\n\n" for event in events)
+
+
+def _text_delta(text: str) -> Dict[str, Any]:
+    """Build a streamed text delta event."""
+    return {"type": "content_block_delta", "delta": {"type": "text_delta", "text": text}}
+
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Response body that loses the connection after its first chunk."""
+    
+    def __init__(self, first: bytes):
+        self.first = first
+    
+    async def __aiter__(self):
+        yield self.first
+        raise httpx.ReadError("connection lost")
+
+
+def _use_transport(api: "ClaudeAPI", handler) -> None:
+    """Send the API client's requests to handler through an httpx.MockTransport."""
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    api._client_loop = asyncio.get_running_loop()
+
+
 class TestClaudeAPI:
     """Test suite for the Claude API integration."""
     
@@ -241,6 +279,464 @@ class TestClaudeAPI:
             pytest.skip(f"API call failed: {str(e)}")
 
 
+@pytest.mark.skipif(not HAS_CLAUDE_API, reason="Claude API not available")
+class TestLLMCache:
+    """Test suite for the LLM response caches."""
+    
+    def test_cache_key(self):
+        """Test that the key ignores dict order but not content."""
+        request = {"model": "m", "temperature": 0, "messages": [{"role": "user", "content": "hi"}]}
+        reordered = {"messages": [{"role": "user", "content": "hi"}], "temperature": 0, "model": "m"}
+        
+        assert cache_key(request) == cache_key(reordered)
+        assert cache_key(request) != cache_key(dict(request, temperature=0.3))
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used response is evicted first."""
+        cache = LLMCache(max_size=2)
+        await cache.set("a", {"n": 1})
+        await cache.set("b", {"n": 2})
+        assert await cache.get("a") == {"n": 1}
+        
+        await cache.set("c", {"n": 3})
+        
+        assert await cache.get("b") is None
+        assert await cache.get("a") == {"n": 1}
+        assert await cache.get("c") == {"n": 3}
+        assert cache.stats() == {"hits": 3, "misses": 1, "size": 2}
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test that responses expire after the cache's or the entry's time-to-live."""
+        cache = LLMCache(ttl=0.05)
+        await cache.set("short", {"n": 1})
+        await cache.set("long", {"n": 2}, ttl=60)
+        assert await cache.get("short") == {"n": 1}
+        
+        await asyncio.sleep(0.1)
+        
+        assert await cache.get("short") is None
+        assert await cache.get("long") == {"n": 2}
+        assert cache.stats()["size"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_zero_size_disables_cache(self):
+        """Test that a cache without room stores nothing."""
+        cache = LLMCache(max_size=0)
+        await cache.set("a", {"n": 1})
+        
+        assert await cache.get("a") is None
+    
+    @pytest.mark.asyncio
+    async def test_file_cache_persists(self, tmp_path):
+        """Test that responses are read back from disk by a new cache, counting as hits."""
+        await FileLLMCache(str(tmp_path)).set("key", {"n": 1})
+        
+        # Written atomically: only the final file is left behind
+        assert [p.name for p in tmp_path.iterdir()] == ["key.json"]
+        
+        cache = FileLLMCache(str(tmp_path))
+        assert await cache.get("key") == {"n": 1}
+        assert cache.stats() == {"hits": 1, "misses": 0, "size": 1}
+        
+        # The disk hit is kept in memory from now on
+        (tmp_path / "key.json").unlink()
+        assert await cache.get("key") == {"n": 1}
+        assert cache.stats() == {"hits": 2, "misses": 0, "size": 1}
+    
+    @pytest.mark.asyncio
+    async def test_file_cache_ignores_bad_files(self, tmp_path):
+        """Test that missing, unreadable, non-object and expired files are misses."""
+        (tmp_path / "garbage.json").write_text("not json", encoding="utf-8")
+        (tmp_path / "list.json").write_text("[1, 2]", encoding="utf-8")
+        (tmp_path / "old.json").write_text('{"n": 1}', encoding="utf-8")
+        old = time.time() - 120
+        os.utime(tmp_path / "old.json", (old, old))
+        
+        cache = FileLLMCache(str(tmp_path), ttl=60)
+        
+        for key in ("missing", "garbage", "list", "old"):
+            assert await cache.get(key) is None
+        assert cache.stats() == {"hits": 0, "misses": 4, "size": 0}
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("temperature, cache_all, expected_requests", [
+        (0, False, 1),
+        (0.3, False, 2),
+        (0.3, True, 1),
+    ])
+    async def test_only_deterministic_requests_cached(self, temperature, cache_all, expected_requests):
+        """Test that sampled responses are only cached when cache_all_temperatures is set."""
+        requests = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json=_response_body("ok"))
+        
+        api = ClaudeAPI(LLMConfig(api_key="test-key", temperature=temperature,
+                                  cache_all_temperatures=cache_all, requests_per_minute=0))
+        _use_transport(api, handler)
+        
+        try:
+            first = await api._call_claude_api("prompt")
+            second = await api._call_claude_api("prompt")
+        finally:
+            await api.aclose()
+        
+        assert first == second == _response_body("ok")
+        assert len(requests) == expected_requests
+
+
+@pytest.mark.skipif(not HAS_CLAUDE_API, reason="Claude API not available")
+class TestRateLimiter:
+    """Test suite for the client-side request rate limiter."""
+    
+    @pytest.mark.asyncio
+    async def test_sliding_window(self):
+        """Test that requests beyond the limit wait for the oldest one to leave the window."""
+        limiter = RateLimiter(2, period=0.2)
+        
+        start = time.monotonic()
+        async with limiter:
+            pass
+        async with limiter:
+            pass
+        assert time.monotonic() - start < 0.1
+        
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.2
+    
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """Test that a limit of zero never waits."""
+        limiter = RateLimiter(0, period=60)
+        
+        start = time.monotonic()
+        for _ in range(100):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.1
+    
+    def test_limit_tightening(self):
+        """Test that the limit only ever tightens to the account's reported limit."""
+        limiter = RateLimiter(50, period=0.2)
+        
+        limiter.update_from_headers({"anthropic-ratelimit-requests-limit": "100"})
+        assert limiter.max_requests == 50
+        
+        limiter.update_from_headers({"anthropic-ratelimit-requests-limit": "20"})
+        assert limiter.max_requests == 20
+        
+        limiter.update_from_headers({"anthropic-ratelimit-requests-limit": "bogus"})
+        assert limiter.max_requests == 20
+    
+    @pytest.mark.asyncio
+    async def test_retry_after(self):
+        """Test that a retry-after header blocks requests for that long."""
+        limiter = RateLimiter(10, period=5)
+        limiter.update_from_headers({"retry-after": "0.2"})
+        
+        start = time.monotonic()
+        await limiter.acquire()
+        assert 0.15 <= time.monotonic() - start < 1
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_window_waits_for_reset(self):
+        """Test that no remaining requests blocks until the reported reset time."""
+        limiter = RateLimiter(10, period=5)
+        reset = (datetime.now(timezone.utc) + timedelta(seconds=0.3)).isoformat().replace("+00:00", "Z")
+        limiter.update_from_headers({
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-requests-reset": reset,
+        })
+        
+        start = time.monotonic()
+        await limiter.acquire()
+        assert 0.15 <= time.monotonic() - start < 1
+    
+    @pytest.mark.asyncio
+    async def test_block_capped_at_period(self):
+        """Test that a reported wait never blocks for longer than one period."""
+        limiter = RateLimiter(10, period=0.2)
+        reset = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+        limiter.update_from_headers({"retry-after": "3600"})
+        limiter.update_from_headers({
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-requests-reset": reset,
+        })
+        
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start < 1
+    
+    @pytest.mark.asyncio
+    async def test_unparseable_headers_ignored(self):
+        """Test that malformed retry and reset headers don't block requests."""
+        limiter = RateLimiter(10, period=5)
+        limiter.update_from_headers({"retry-after": "soon"})
+        limiter.update_from_headers({
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-requests-reset": "tomorrow",
+        })
+        
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start < 0.1
+
+
+@pytest.mark.skipif(not HAS_CLAUDE_API, reason="Claude API not available")
+class TestRetries:
+    """Test suite for retrying failed Claude API requests."""
+    
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        """Record the delays waited before retries instead of sleeping."""
+        delays = []
+        
+        async def fake_sleep(delay, result=None):
+            delays.append(delay)
+            return result
+        
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        return delays
+    
+    def _api(self, max_retries: int = 3) -> "ClaudeAPI":
+        """Create an uncached, unpaced client."""
+        return ClaudeAPI(LLMConfig(api_key="test-key", cache_size=0, requests_per_minute=0,
+                                   max_retries=max_retries))
+    
+    async def _call(self, api: "ClaudeAPI", responses: List[Any]) -> Dict[str, Any]:
+        """Call the API once, answering its requests with responses in turn (exceptions are raised)."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        
+        _use_transport(api, handler)
+        try:
+            return await api._call_claude_api("prompt")
+        finally:
+            await api.aclose()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("status", [429, 500, 502, 503, 504, 529])
+    async def test_retryable_status(self, sleeps, status):
+        """Test that rate limited, overloaded and failed requests are retried after retry-after."""
+        responses = [
+            httpx.Response(status, headers={"retry-after": "1.5"}),
+            httpx.Response(200, json=_response_body("ok")),
+        ]
+        
+        assert await self._call(self._api(), responses) == _response_body("ok")
+        assert responses == []
+        assert sleeps == [1.5]
+    
+    @pytest.mark.asyncio
+    async def test_backoff_without_retry_after(self, sleeps):
+        """Test that retries back off exponentially when the server gives no delay."""
+        responses = [httpx.Response(529), httpx.Response(529), httpx.Response(200, json=_response_body("ok"))]
+        
+        assert await self._call(self._api(), responses) == _response_body("ok")
+        assert 1 <= sleeps[0] < 2
+        assert 2 <= sleeps[1] < 3
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, sleeps):
+        """Test that the last retryable failure is returned as an error."""
+        responses = [httpx.Response(529, headers={"retry-after": "0"}) for _ in range(3)]
+        
+        assert await self._call(self._api(max_retries=2), responses) == {}
+        assert responses == []
+        assert len(sleeps) == 2
+    
+    @pytest.mark.asyncio
+    async def test_client_error_not_retried(self, sleeps):
+        """Test that other errors fail without a retry."""
+        responses = [httpx.Response(400), httpx.Response(200, json=_response_body("ok"))]
+        
+        assert await self._call(self._api(), responses) == {}
+        assert len(responses) == 1
+        assert sleeps == []
+    
+    @pytest.mark.asyncio
+    async def test_transport_error_retried(self, sleeps):
+        """Test that connection errors are retried."""
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        responses = [httpx.ConnectError("refused", request=request), httpx.Response(200, json=_response_body("ok"))]
+        
+        assert await self._call(self._api(), responses) == _response_body("ok")
+        assert len(sleeps) == 1
+    
+    @pytest.mark.asyncio
+    async def test_transport_error_reraised_when_retries_run_out(self, sleeps, caplog):
+        """Test that the last connection error propagates to the request's error handling."""
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        responses = [httpx.ConnectError(f"refused {i}", request=request) for i in range(3)]
+        
+        assert await self._call(self._api(max_retries=2), responses) == {}
+        assert responses == []
+        assert len(sleeps) == 2
+        assert "refused 2" in caplog.text
+    
+    @pytest.mark.asyncio
+    async def test_stream_retried_before_first_delta(self, sleeps):
+        """Test that a stream is retried while nothing has been yielded yet."""
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        responses = [
+            httpx.Response(529, headers={"retry-after": "0.5"}),
+            httpx.ConnectError("refused", request=request),
+            httpx.Response(200, content=_sse(_text_delta("Hel"), _text_delta("lo"), {"type": "message_stop"})),
+        ]
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+        
+        api = self._api()
+        _use_transport(api, handler)
+        try:
+            chunks = [text async for text in api._call_claude_api_stream("prompt")]
+        finally:
+            await api.aclose()
+        
+        assert chunks == ["Hel", "lo"]
+        assert responses == []
+        assert len(sleeps) == 2 and sleeps[0] == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_stream_not_retried_after_first_delta(self, sleeps):
+        """Test that a stream that fails after yielding text is not restarted."""
+        requests = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, stream=_BrokenStream(_sse(_text_delta("Hel"))))
+        
+        api = self._api()
+        _use_transport(api, handler)
+        try:
+            chunks = [text async for text in api._call_claude_api_stream("prompt")]
+        finally:
+            await api.aclose()
+        
+        assert chunks == ["Hel"]
+        assert len(requests) == 1
+        assert sleeps == []
+
+
+@pytest.mark.skipif(not HAS_CLAUDE_API, reason="Claude API not available")
+class TestChunkedAnalysis:
+    """Test suite for analyzing large Python files in chunks."""
+    
+    CODE = """import os
+
+@decorator
+def a():
+    pass
+
+
+class B:
+    x = 1
+"""
+    
+    def test_split_keeps_small_code_whole(self):
+        """Test that code within the limit stays one chunk."""
+        assert _split_python_code(self.CODE, 1000) == [(1, self.CODE)]
+    
+    def test_split_per_statement(self):
+        """Test that chunks start at top-level statements, with their decorators."""
+        chunks = _split_python_code(self.CODE, 1)
+        
+        assert chunks == [
+            (1, "import os\n\n"),
+            (3, "@decorator\ndef a():\n    pass\n\n\n"),
+            (8, "class B:\n    x = 1\n"),
+        ]
+        assert "".join(chunk for _, chunk in chunks) == self.CODE
+    
+    def test_split_groups_statements(self):
+        """Test that consecutive statements share a chunk until it would exceed max_chars."""
+        code = "def f():\n    return 1\n" * 3
+        
+        assert _split_python_code(code, 45) == [
+            (1, "def f():\n    return 1\n" * 2),
+            (5, "def f():\n    return 1\n"),
+        ]
+    
+    def test_split_invalid_code(self):
+        """Test that code that doesn't parse is kept whole."""
+        code = "def broken(:\n" * 10
+        
+        assert _split_python_code(code, 5) == [(1, code)]
+    
+    @pytest.mark.asyncio
+    async def test_chunk_results_merged(self):
+        """Test that issues are renumbered by file line and partial failures keep the rest."""
+        api = ClaudeAPI(LLMConfig(api_key="test-key"))
+        calls = []
+        
+        async def fake_analyze_single(code, language, specific_concerns=None):
+            calls.append(specific_concerns)
+            if code == "second":
+                return AnalysisResult(error="boom")
+            line = 2 if code == "first" else 3
+            return AnalysisResult(
+                issues=[{"title": code, "line_numbers": [line, "n/a"]}],
+                suggestions=[RefactorSuggestion(original_code=code)],
+                explanation=f"{code} ok"
+            )
+        
+        api._analyze_single = fake_analyze_single
+        result = await api._analyze_chunks([(1, "first"), (10, "second"), (20, "third")], "python")
+        
+        assert result.error is None
+        assert result.issues == [
+            {"title": "first", "line_numbers": [2, "n/a"]},
+            {"title": "third", "line_numbers": [22, "n/a"]},
+        ]
+        assert [s.original_code for s in result.suggestions] == ["first", "third"]
+        assert result.explanation == "first ok\n\nthird ok"
+        # Every chunk is told that it is only part of the file
+        assert len(calls) == 3 and all(len(concerns) == 1 for concerns in calls)
+    
+    @pytest.mark.asyncio
+    async def test_all_chunks_failing(self):
+        """Test that the result is an error only when every chunk failed."""
+        api = ClaudeAPI(LLMConfig(api_key="test-key"))
+        
+        async def fake_analyze_single(code, language, specific_concerns=None):
+            return AnalysisResult(error=f"{code} failed")
+        
+        api._analyze_single = fake_analyze_single
+        result = await api._analyze_chunks([(1, "first"), (10, "second")], "python")
+        
+        assert result.error == "lines 1+: first failed; lines 10+: second failed"
+        assert result.issues == []
+    
+    @pytest.mark.asyncio
+    async def test_large_python_code_chunked(self):
+        """Test that analyze_code splits Python code longer than chunk_size."""
+        api = ClaudeAPI(LLMConfig(api_key="test-key", chunk_size=20))
+        analyzed = []
+        
+        async def fake_analyze_single(code, language, specific_concerns=None):
+            analyzed.append(code)
+            return AnalysisResult()
+        
+        api._analyze_single = fake_analyze_single
+        
+        await api.analyze_code(self.CODE, "python")
+        assert analyzed == [chunk for _, chunk in _split_python_code(self.CODE, 20)]
+        assert len(analyzed) > 1
+        
+        analyzed.clear()
+        await api.analyze_code(self.CODE, "javascript")
+        assert analyzed == [self.CODE]
+
+
 # Fixture for sample code
 @pytest.fixture
 def sample_python_code() -> str:
@@ -3,11 +3,14 @@ Tests for the Web technologies fixer (HTML, CSS, JavaScript/TypeScript).
 """
 import os
 import sys
+import copy
+import pickle
 import pytest
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
-from coderefactor.fixers.web_fixer import WebTechFixer
+from coderefactor.fixers.web_fixer import WebTechFixer, WebFixer
 from coderefactor.analyzers.web_analyzer import WebTechAnalyzer
 from coderefactor.analyzers.utils.models import AnalysisResult, AnalysisIssue, IssueSeverity, IssueCategory
 from coderefactor.fixers.base import FixResult, FixStatus
@@ -403,6 +406,159 @@ h1 {
 
 # Fixtures for the tests
 
+class TestWebFixerParallel:
+    """Test suite for fixing web code across worker processes."""
+
+    SOURCES = {
+        "page.html": '<html>\n<head><title>T</title></head>\n<body>\n<IMG SRC="a.png">\n<div>\n</body>\n</html>\n',
+        "style.css": "a {\n  color: #12;\n}\nb {\n}\n",
+        "script.js": "var unused = 1\nconsole.log(2)\n",
+        "empty.js": "",
+    }
+
+    HTML_ISSUES = [
+        {"rule_id": "doctype-first", "message": "Doctype must be declared first.", "line": 1, "column": 1,
+         "fixable": True},
+        {"rule_id": "attr-lowercase", "message": "The attribute name of [ SRC ] must be in lowercase.",
+         "line": 4, "column": 6, "fixable": True},
+        {"rule_id": "alt-require", "message": "An alt attribute must be present on <img> elements.",
+         "line": 4, "column": 1, "fixable": True},
+    ]
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def fixer(cls):
+        """A rule-based fixer that doesn't depend on external formatters (tests set max_workers)."""
+        return WebFixer({"autoformat": False, "use_llm": False})
+
+    @staticmethod
+    def _summary(result: FixResult) -> tuple:
+        """The parts of a fix result that don't vary between runs (change ids are random)."""
+        return (
+            result.file_path, result.success, result.error, result.fixed_code, result.warnings,
+            [(c.description, c.start_line, c.start_column, c.end_line, c.end_column, c.replacement_text)
+             for c in result.changes],
+        )
+
+    @pytest.fixture
+    def source_files(self, tmp_path):
+        """Web files to fix, in a fixed order."""
+        paths = []
+        for name, code in self.SOURCES.items():
+            path = tmp_path / name
+            path.write_text(code, encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    @pytest.fixture
+    def broken_pool(self, monkeypatch):
+        """Make every attempt to start a process pool fail."""
+        def broken_pool(*args, **kwargs):
+            raise OSError("no processes available")
+        
+        monkeypatch.setattr(sys.modules[WebFixer.__module__], "ProcessPoolExecutor", broken_pool)
+
+    def test_fixer_pickles_without_llm(self, fixer):
+        """Test that the LLM client and its cache are left out when the fixer is sent to workers."""
+        fixer = copy.copy(fixer)
+        fixer.max_workers = 2
+        fixer.llm = object()
+        fixer._llm_cache = OrderedDict(key="suggestion")
+        
+        restored = pickle.loads(pickle.dumps(fixer))
+        
+        assert restored.llm is None
+        assert len(restored._llm_cache) == 0
+        assert restored.max_workers == 2
+        # The original keeps its client and cache
+        assert fixer.llm is not None
+        assert fixer._llm_cache["key"] == "suggestion"
+
+    @pytest.mark.asyncio
+    async def test_fix_files_matches_sequential(self, fixer, source_files):
+        """Test that files fixed in worker processes match sequential fixing, in input order."""
+        issues = {source_files[0]: self.HTML_ISSUES}
+        
+        fixer.max_workers = 2
+        parallel = await fixer.fix_files(source_files, issues)
+        fixer.max_workers = 1
+        sequential = await fixer.fix_files(source_files, issues)
+        
+        assert [r.file_path for r in parallel] == source_files
+        assert [self._summary(r) for r in parallel] == [self._summary(r) for r in sequential]
+        assert parallel[0].fixed_code.startswith("<!DOCTYPE html>")
+
+    @pytest.mark.asyncio
+    async def test_fix_files_falls_back_to_sequential(self, fixer, source_files, broken_pool):
+        """Test that files are still fixed, in order, when the process pool can't be used."""
+        fixer.max_workers = 2
+        fallback = await fixer.fix_files(source_files)
+        fixer.max_workers = 1
+        sequential = await fixer.fix_files(source_files)
+        
+        assert [r.file_path for r in fallback] == source_files
+        assert [self._summary(r) for r in fallback] == [self._summary(r) for r in sequential]
+
+    @pytest.mark.asyncio
+    async def test_fix_issues_in_parallel_matches_sequential(self, fixer):
+        """Test that issues fixed in worker processes match sequential fixing, in issue order."""
+        code = self.SOURCES["page.html"]
+        
+        fixer.max_workers = 2
+        parallel = await fixer.fix_code(code, "page.html", self.HTML_ISSUES)
+        fixer.max_workers = 1
+        sequential = await fixer.fix_code(code, "page.html", self.HTML_ISSUES)
+        
+        assert self._summary(parallel) == self._summary(sequential)
+        assert parallel.fixed_code != code
+
+    @pytest.mark.asyncio
+    async def test_fix_issues_falls_back_to_sequential(self, fixer, broken_pool):
+        """Test that issues are still fixed when the process pool can't be used."""
+        code = self.SOURCES["page.html"]
+        
+        fixer.max_workers = 2
+        fallback = await fixer.fix_code(code, "page.html", self.HTML_ISSUES)
+        fixer.max_workers = 1
+        sequential = await fixer.fix_code(code, "page.html", self.HTML_ISSUES)
+        
+        assert self._summary(fallback) == self._summary(sequential)
+
+class TestWebFixerRules:
+    """Test suite for the rule-based fixes on raw web code."""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def fixer(cls):
+        """A rule-based fixer that doesn't depend on external formatters."""
+        return WebFixer({"autoformat": False, "use_llm": False})
+
+    def test_fix_malformed_html_tags_any_case(self, fixer):
+        """Test that empty void element pairs are made self-closing whatever their case."""
+        code = '<p>\n<BR></BR>\n<Img src=x></img>\n<hr></HR>\n<br></hr>\n</p>\n'
+        
+        changes = fixer._fix_malformed_html_tags(code)
+        
+        assert [(c.start_line, c.original_text, c.replacement_text) for c in changes] == [
+            (2, "<BR></BR>", "<BR/>"),
+            (3, "<Img src=x></img>", "<Img src=x/>"),
+            (4, "<hr></HR>", "<hr/>"),
+        ]
+
+    def test_fix_trailing_whitespace(self, fixer):
+        """Test that all trailing whitespace is removed, keeping every kind of line ending."""
+        code = 'a \xa0\nb\t\r\nc \rd\x0c\ne  '
+        
+        changes = fixer._fix_trailing_whitespace(code)
+        
+        assert [(c.start_line, c.original_text, c.replacement_text) for c in changes] == [
+            (1, "a \xa0\n", "a\n"),
+            (2, "b\t\r\n", "b\r\n"),
+            (3, "c \r", "c\r"),
+            (4, "d\x0c", "d"),
+            (6, "e  ", "e"),
+        ]
+
 @pytest.fixture
 def web_fixer():
     """Create a WebTechFixer instance for testing."""